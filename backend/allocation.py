@@ -0,0 +1,134 @@
+"""
+Splitting a lot's tonnage across several winning bids.
+
+Bids are filled best price first, each up to the quantity it asked for
+(a bid without one asks for the whole lot), until the lot is used up.
+Only a buyer's best bid counts. When the bids at one price ask for more
+than is left, that price level shares the rest pro rata to the
+quantities requested; the kilograms lost to rounding go to the earliest
+bids at that price.
+
+allocate() is a single pass over bids already sorted by the
+auction_id_bid_amount_created_at index (four fields are read per bid),
+and it stops reading as soon as the lot is gone. allocate_lot() only
+reads: once the caller has claimed the auction, record_allocations()
+gives every winning bid its allocated_quantity in one bulk_write, so the
+writes scale with the number of winners rather than the number of bids.
+"""
+
+import logging
+import math
+from dataclasses import dataclass
+from typing import Iterable
+
+from pymongo import UpdateOne
+
+from backend.database import bids_collection
+
+logger = logging.getLogger(__name__)
+
+ALLOCATION_SORT = [("bid_amount", -1), ("created_at", 1)]
+ALLOCATION_PROJECTION = {"_id": 0, "id": 1, "user_id": 1, "bid_amount": 1, "quantity": 1}
+ALLOCATION_BATCH_SIZE = 500
+# Tonnes are allocated in whole kilograms
+QUANTITY_DECIMALS = 3
+_UNIT = 10 ** QUANTITY_DECIMALS
+
+
+@dataclass(slots=True)
+class Allocation:
+    bid_id: str
+    user_id: str
+    bid_amount: float
+    requested_quantity: float
+    allocated_quantity: float
+
+
+class Allocator:
+    """Fed bids one at a time, sorted by bid_amount desc, created_at asc"""
+
+    def __init__(self, lot_quantity: float):
+        self.lot_quantity = lot_quantity
+        self.remaining = lot_quantity
+        self.allocations: list[Allocation] = []
+        self._seen_users = set()
+        self._level: list[dict] = []
+        self._level_price = None
+
+    def add(self, bid: dict) -> bool:
+        """Take the next bid; False once the lot is gone and later bids cannot win"""
+        if bid["bid_amount"] != self._level_price:
+            self.remaining = _fill_level(self._level, self.remaining, self.lot_quantity, self.allocations)
+            self._level = []
+            self._level_price = bid["bid_amount"]
+            if self.remaining <= 0:
+                return False
+        if bid["user_id"] not in self._seen_users:
+            self._seen_users.add(bid["user_id"])
+            self._level.append(bid)
+        return True
+
+    def finish(self) -> list[Allocation]:
+        self.remaining = _fill_level(self._level, self.remaining, self.lot_quantity, self.allocations)
+        self._level = []
+        return self.allocations
+
+
+def allocate(lot_quantity: float, bids: Iterable[dict]) -> list[Allocation]:
+    """Allocate the lot over bids sorted by bid_amount desc, created_at asc"""
+    allocator = Allocator(lot_quantity)
+    for bid in bids:
+        if not allocator.add(bid):
+            break
+    return allocator.finish()
+
+
+def _fill_level(level: list[dict], remaining: float, lot_quantity: float, allocations: list[Allocation]) -> float:
+    """Allocate to the bids of one price level (in time order); returns what is left of the lot"""
+    if not level:
+        return remaining
+    requested = [min(bid.get("quantity") or lot_quantity, lot_quantity) for bid in level]
+    total = sum(requested)
+    if total <= remaining:
+        shares = requested
+        remaining = round(remaining - total, QUANTITY_DECIMALS)
+    else:
+        # Work in kilograms so the shares add up exactly to what is left
+        left = round(remaining * _UNIT)
+        shares_kg = [math.floor(left * wanted / total) for wanted in requested]
+        dust = left - sum(shares_kg)
+        for i, wanted in enumerate(requested):
+            if dust <= 0:
+                break
+            extra = min(dust, round(wanted * _UNIT) - shares_kg[i])
+            shares_kg[i] += extra
+            dust -= extra
+        shares = [share / _UNIT for share in shares_kg]
+        remaining = 0
+    for bid, wanted, share in zip(level, requested, shares):
+        if share > 0:
+            allocations.append(Allocation(bid["id"], bid["user_id"], bid["bid_amount"], wanted, share))
+    return remaining
+
+
+async def allocate_lot(auction: dict, bids=bids_collection) -> list[Allocation]:
+    """Allocate an auction's quantity over its bids; nothing is written"""
+    allocator = Allocator(auction["quantity"])
+    cursor = bids.find({"auction_id": auction["id"]}, ALLOCATION_PROJECTION).sort(ALLOCATION_SORT)
+    async for bid in cursor.batch_size(ALLOCATION_BATCH_SIZE):
+        if not allocator.add(bid):
+            break
+    await cursor.close()
+    return allocator.finish()
+
+
+async def record_allocations(allocations: list[Allocation], bids=bids_collection):
+    """Store each winning bid's share; writing the same allocations again changes nothing"""
+    if allocations:
+        await bids.bulk_write(
+            [
+                UpdateOne({"id": allocation.bid_id}, {"$set": {"allocated_quantity": allocation.allocated_quantity}})
+                for allocation in allocations
+            ],
+            ordered=False
+        )
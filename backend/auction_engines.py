@@ -0,0 +1,295 @@
+"""
+Auction engines: how bids are accepted and how the price is set, per auction_type.
+
+- "english" (default): ascending, every bid must beat the current one by
+  1% (backend/bidding.py); the high bid is public while the auction runs,
+  and an optional soft close extends end_date after last-second bids
+- "sealed_first_price" / "sealed_second_price": bids only need to reach
+  the starting price and stay hidden until the auction completes. At
+  close the highest bid is recorded, and clearing_price is that bid
+  (first price) or the best bid of any other buyer, else the starting
+  price (second price)
+- "dutch": the price starts at starting_price and drops by price_decrement
+  every decrement_interval_seconds down to reserve_price. The first buyer
+  whose bid reaches the current price takes the lot at that price and the
+  auction completes immediately
+
+Every engine keeps the bid summary fields (highest_bid_amount,
+highest_bid_id, bid_count) meaningful, so the listing, select-winner and
+the exports work unchanged. Pricing terms never change after an auction
+is created, so engine_terms() caches them per worker.
+"""
+
+import logging
+import os
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+
+from fastapi import HTTPException
+from pymongo import ReturnDocument, UpdateOne
+
+from backend.auction_log import auction_log
+from backend.auction_models import AuctionCreate, Bid
+from backend.bidding import accept_bid, end_date_after, raise_rejection
+from backend.database import auctions_collection, bids_collection
+from backend.metrics import BIDS
+
+logger = logging.getLogger(__name__)
+
+AUCTION_TERMS_CACHE_SIZE = int(os.environ.get("AUCTION_TERMS_CACHE_SIZE", 10000))
+TERMS_PROJECTION = {
+    "_id": 0, "auction_type": 1, "quantity": 1, "starting_price": 1, "start_date": 1,
+    "price_decrement": 1, "decrement_interval_seconds": 1, "reserve_price": 1,
+    "soft_close_seconds": 1, "soft_close_extension_seconds": 1, "soft_close_until": 1,
+}
+# Equal bids: the earliest wins (auction_id_bid_amount_created_at index)
+BID_SORT = [("bid_amount", -1), ("created_at", 1)]
+
+
+@dataclass
+class BidOutcome:
+    engine: object
+    auction: dict  # as it was just before the bid
+    end_date: datetime  # after the bid, possibly extended by a soft close
+    at: datetime  # when the bid was accepted
+
+    @property
+    def extended(self) -> bool:
+        return self.end_date != self.auction["end_date"]
+
+
+class EnglishEngine:
+    sealed = False
+    closes_on_bid = False
+
+    def validate(self, auction_data: AuctionCreate) -> str | None:
+        if auction_data.soft_close_seconds is None:
+            return None
+        if auction_data.soft_close_seconds <= 0:
+            return "soft_close_seconds must be positive"
+        if not auction_data.soft_close_extension_seconds or auction_data.soft_close_extension_seconds <= 0:
+            return "soft_close_extension_seconds must be positive"
+        # Without a cap, bidders could keep the lot open indefinitely
+        if not auction_data.soft_close_max_extension_seconds or auction_data.soft_close_max_extension_seconds <= 0:
+            return "soft_close_max_extension_seconds must be positive"
+        return None
+
+    async def place_bid(self, bid: Bid, terms: dict, now: datetime, auctions, bids) -> dict:
+        return await accept_bid(bid, now, auctions, bids, terms)
+
+    async def settle(self, auction_ids: list[str], auctions, bids):
+        """The high bid is maintained live, so there is nothing to do at close"""
+
+
+class SealedBidEngine:
+    sealed = True
+    closes_on_bid = False
+
+    def __init__(self, second_price: bool):
+        self.second_price = second_price
+
+    def validate(self, auction_data: AuctionCreate) -> str | None:
+        return _no_soft_close(auction_data)
+
+    async def place_bid(self, bid: Bid, terms: dict, now: datetime, auctions, bids) -> dict:
+        # Only counted: the amounts stay in the bids collection until close
+        auction = await auctions.find_one_and_update(
+            {
+                "id": bid.auction_id,
+                "status": "active",
+                "end_date": {"$gt": now},
+                "starting_price": {"$lte": bid.bid_amount},
+            },
+            {"$inc": {"bid_count": 1, "log_seq": 1}},
+            projection={"_id": 0},
+            return_document=ReturnDocument.BEFORE
+        )
+        if auction is None:
+            await raise_rejection(bid, now, auctions, _starting_price_minimum)
+
+        await bids.insert_one(bid.dict())
+        BIDS.labels("accepted").inc()
+        return auction
+
+    async def settle(self, auction_ids: list[str], auctions, bids):
+        """Record the highest bid and the price it pays, once bidding is over.
+
+        Derived from the bids alone, so running it again (another worker,
+        a retry) writes the same values.
+        """
+        ops = []
+        for auction_id in auction_ids:
+            terms = await engine_terms(auction_id, auctions)
+            top = None
+            runner_up = None
+            async for bid in bids.find({"auction_id": auction_id}, {"_id": 0, "id": 1, "bid_amount": 1, "user_id": 1}).sort(BID_SORT):
+                if top is None:
+                    top = bid
+                    if not self.second_price:
+                        break
+                elif bid["user_id"] != top["user_id"]:
+                    runner_up = bid
+                    break
+            if top is None:
+                continue
+            if not self.second_price:
+                price = top["bid_amount"]
+            else:
+                price = runner_up["bid_amount"] if runner_up else terms["starting_price"]
+            ops.append(UpdateOne(
+                {"id": auction_id, "status": "completed"},
+                {"$set": {"highest_bid_amount": top["bid_amount"], "highest_bid_id": top["id"], "clearing_price": price}}
+            ))
+        if ops:
+            await auctions.bulk_write(ops, ordered=False)
+
+
+class DutchEngine:
+    sealed = False
+    closes_on_bid = True
+
+    def validate(self, auction_data: AuctionCreate) -> str | None:
+        if not auction_data.price_decrement or auction_data.price_decrement <= 0:
+            return "price_decrement must be positive for a dutch auction"
+        if not auction_data.decrement_interval_seconds or auction_data.decrement_interval_seconds <= 0:
+            return "decrement_interval_seconds must be positive for a dutch auction"
+        if auction_data.reserve_price is not None and not 0 <= auction_data.reserve_price <= auction_data.starting_price:
+            return "reserve_price must be between 0 and starting_price"
+        return _no_soft_close(auction_data)
+
+    async def place_bid(self, bid: Bid, terms: dict, now: datetime, auctions, bids) -> dict:
+        # The buyer takes the lot at the clock price, whatever they offered above it
+        price = dutch_price(terms, now)
+        if bid.bid_amount < price:
+            await raise_rejection(bid, now, auctions, _dutch_minimum)
+        bid.bid_amount = price
+        auction = await auctions.find_one_and_update(
+            {
+                "id": bid.auction_id,
+                "status": "active",
+                "end_date": {"$gt": now},
+                "highest_bid_id": None,
+            },
+            {
+                "$set": {
+                    "highest_bid_amount": price,
+                    "highest_bid_id": bid.id,
+                    "clearing_price": price,
+                    "status": "completed",
+                },
+                # The bid, then the completion
+                "$inc": {"bid_count": 1, "log_seq": 2},
+            },
+            projection={"_id": 0},
+            return_document=ReturnDocument.BEFORE
+        )
+        if auction is None:
+            await raise_rejection(bid, now, auctions, _dutch_minimum)
+
+        await bids.insert_one(bid.dict())
+        BIDS.labels("accepted").inc()
+        return auction
+
+    async def settle(self, auction_ids: list[str], auctions, bids):
+        """Settled by the first accepted bid; a lot nobody took simply completes unsold"""
+
+
+ENGINES = {
+    "english": EnglishEngine(),
+    "sealed_first_price": SealedBidEngine(second_price=False),
+    "sealed_second_price": SealedBidEngine(second_price=True),
+    "dutch": DutchEngine(),
+}
+
+_terms_cache: OrderedDict[str, dict] = OrderedDict()
+
+
+async def engine_terms(auction_id: str, auctions=auctions_collection) -> dict | None:
+    """The auction's type and pricing terms, cached since they never change"""
+    terms = _terms_cache.get(auction_id)
+    if terms is not None:
+        _terms_cache.move_to_end(auction_id)
+        return terms
+    terms = await auctions.find_one({"id": auction_id}, TERMS_PROJECTION)
+    if terms is not None:
+        _terms_cache[auction_id] = terms
+        if len(_terms_cache) > AUCTION_TERMS_CACHE_SIZE:
+            _terms_cache.popitem(last=False)
+    return terms
+
+
+def engine_named(auction_type: str | None):
+    return ENGINES[auction_type or "english"]
+
+
+async def place_bid(bid: Bid, now: datetime | None = None, auctions=auctions_collection, bids=bids_collection) -> BidOutcome:
+    """Accept a bid through its auction's engine"""
+    now = now or datetime.utcnow()
+    terms = await engine_terms(bid.auction_id, auctions)
+    if terms is None:
+        BIDS.labels("rejected_not_found").inc()
+        raise HTTPException(status_code=404, detail="Auction not found")
+    if bid.quantity is not None and bid.quantity > terms["quantity"]:
+        raise HTTPException(status_code=400, detail=f"Bid quantity exceeds the lot: {terms['quantity']} t")
+    engine = engine_named(terms.get("auction_type"))
+    auction = await engine.place_bid(bid, terms, now, auctions, bids)
+    return BidOutcome(engine, auction, end_date_after(auction, terms, now), now)
+
+
+async def log_bid(bid: Bid, outcome: BidOutcome, log=auction_log) -> bool:
+    """Record what an accepted bid changed, once its follow-up steps are done.
+
+    The engine's update allocated the log seqs (log_seq on the auction), so
+    the entries are numbered in the order Mongo accepted the bids.
+    """
+    events = [("bid_accepted", {
+        "bid_id": bid.id, "bid_amount": bid.bid_amount, "quantity": bid.quantity,
+        "user_id": bid.user_id, "created_at": bid.created_at,
+    })]
+    if outcome.extended:
+        events.append(("auction_extended", {"end_date": outcome.end_date, "bid_id": bid.id}))
+    if outcome.engine.closes_on_bid:
+        events.append(("status_changed", {"status": "completed"}))
+    return await log.record(bid.auction_id, (outcome.auction.get("log_seq") or 0) + 1, events, at=outcome.at)
+
+
+async def settle_auctions(auctions_closed: list[dict], auctions=auctions_collection, bids=bids_collection):
+    """Let each engine settle the auctions that just completed (documents with id and auction_type)"""
+    by_type: dict[str, list[str]] = {}
+    for auction in auctions_closed:
+        by_type.setdefault(auction.get("auction_type") or "english", []).append(auction["id"])
+    for auction_type, auction_ids in by_type.items():
+        await engine_named(auction_type).settle(auction_ids, auctions, bids)
+
+
+def dutch_price(terms: dict, now: datetime) -> float:
+    """Clock price of a dutch auction at `now`"""
+    elapsed = max(0.0, (now - terms["start_date"]).total_seconds())
+    steps = int(elapsed // terms["decrement_interval_seconds"])
+    price = terms["starting_price"] - steps * terms["price_decrement"]
+    return round(max(price, terms.get("reserve_price") or 0.0), 2)
+
+
+def winning_price(auction: dict, bid: dict) -> float:
+    """What the winner pays: the engine's clearing price for its top bid, else the bid itself"""
+    if auction.get("clearing_price") is not None and bid["id"] == auction.get("highest_bid_id"):
+        return auction["clearing_price"]
+    return bid["bid_amount"]
+
+
+def _no_soft_close(auction_data: AuctionCreate) -> str | None:
+    if auction_data.soft_close_seconds is not None:
+        # Sealed bids cannot be sniped, and a dutch lot goes to the first taker
+        return "soft close is only available for english auctions"
+    return None
+
+
+def _starting_price_minimum(auction: dict, now: datetime) -> tuple[float, str]:
+    min_bid = auction["starting_price"]
+    return min_bid, f"Ставка не може бути нижчою за стартову ціну: {min_bid:.2f} грн"
+
+
+def _dutch_minimum(auction: dict, now: datetime) -> tuple[float, str]:
+    min_bid = dutch_price(auction, now)
+    return min_bid, f"Поточна ціна лота: {min_bid:.2f} грн"
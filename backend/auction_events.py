@@ -0,0 +1,67 @@
+"""
+Pub/sub for auction events (bid accepted, status changed).
+
+Publishers (place_bid, select_winner, the auction scheduler) call
+event_bus.publish(); the SSE endpoint subscribes and streams events to the
+dashboards. Events travel over the "auction_events" channel of
+shared_state, so with SHARED_STATE_BACKEND=mongo a bid accepted by one
+worker reaches the dashboards connected to every other worker. The
+durable record of the same changes is the auction log
+(backend/auction_log.py), written by the code that makes them.
+"""
+
+import asyncio
+import logging
+
+from backend.shared_state import shared_state
+
+logger = logging.getLogger(__name__)
+
+EVENTS_CHANNEL = "auction_events"
+SUBSCRIBER_QUEUE_SIZE = 256
+
+# Fields of an event every client may see; the rest is admin-only.
+# These mirror what GET /auctions/list already shows publicly.
+PUBLIC_FIELDS = {"type", "auction_id", "status", "current_highest_bid", "total_bids", "end_date", "created_at"}
+
+
+class AuctionEventBus:
+    def __init__(self, state=shared_state):
+        self._state = state
+        self._subscribers: set[asyncio.Queue] = set()
+        state.subscribe(EVENTS_CHANNEL, self._deliver)
+
+    async def publish(self, event_type: str, auction_id: str, **fields):
+        event = {"type": event_type, "auction_id": auction_id, **fields}
+        try:
+            await self._state.publish(EVENTS_CHANNEL, event)
+        except Exception as e:
+            # Push is best-effort: dashboards still converge through /auctions/list
+            logger.error(f"Failed to publish {event_type} for auction {auction_id}: {e}")
+
+    def subscribe(self) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self._subscribers.discard(queue)
+
+    def _deliver(self, event: dict):
+        for queue in self._subscribers:
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # A stalled client must not slow down bidding; it misses events
+                # and catches up from /auctions/list on reconnect
+                pass
+
+
+def redact_event(event: dict, is_admin: bool) -> dict:
+    """Strip bid details (amounts, bidders) for non-admin subscribers"""
+    if is_admin:
+        return event
+    return {key: value for key, value in event.items() if key in PUBLIC_FIELDS}
+
+
+event_bus = AuctionEventBus()
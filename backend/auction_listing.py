@@ -0,0 +1,58 @@
+from datetime import datetime
+import logging
+
+from backend.auction_models import AuctionResponse
+from backend.database import auctions_read_collection
+from backend.pagination import DEFAULT_PAGE_SIZE, fetch_page
+from backend.serialization import projection_for
+
+logger = logging.getLogger(__name__)
+
+# Newest first; id breaks ties so the cursor is unique
+AUCTION_SORT = [("created_at", -1), ("id", -1)]
+# Only what AuctionResponse renders; current_highest_bid/total_bids are derived
+AUCTION_PROJECTION = projection_for(AuctionResponse)
+
+
+def with_bid_summary(auction: dict) -> dict:
+    """Expose the denormalized bid summary under the response field names"""
+    auction["current_highest_bid"] = auction.get("highest_bid_amount")
+    auction["total_bids"] = auction.get("bid_count", 0)
+    return auction
+
+
+def auction_filter(
+    status: str | None = None,
+    grain_id: str | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+) -> dict:
+    query = {}
+    if status:
+        query["status"] = status
+    if grain_id:
+        query["grain_id"] = grain_id
+    if created_from or created_to:
+        query["created_at"] = {}
+        if created_from:
+            query["created_at"]["$gte"] = created_from
+        if created_to:
+            query["created_at"]["$lt"] = created_to
+    return query
+
+
+async def fetch_auction_listing(
+    query: dict | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: str | None = None,
+    collection=auctions_read_collection,
+) -> tuple[list[dict], str | None]:
+    """Load one page of auctions with their bid summary in one round trip.
+
+    The max bid and bid count live on the auction document itself, so the
+    listing no longer touches the bids collection at all.
+    """
+    auctions, next_cursor = await fetch_page(
+        collection, query or {}, AUCTION_SORT, limit, cursor, projection=AUCTION_PROJECTION
+    )
+    return [with_bid_summary(auction) for auction in auctions], next_cursor
@@ -0,0 +1,336 @@
+"""
+Append-only, hash-chained event log per auction, with snapshots.
+
+Every change to an auction is logged by the code path that makes it:
+created, bid_accepted, auction_extended and status_changed (which carries
+the winner when the status is winner_selected). Entries look like
+
+    {auction_id, seq, type, data, at, prev_hash, hash}
+
+seq counts 1, 2, 3... per auction and is allocated by the change itself:
+the same Mongo update that accepts a bid, flips a status or awards the
+auction also $incs the auction's log_seq. The log therefore orders
+events exactly as Mongo applied them, and an event whose entry was never
+written leaves a gap that verify() reports. The writer records the entry
+once everything else its change triggers (settling, re-arming the
+scheduler, awarding, notifying) is done, so a failed append costs only
+the entry: record() counts it in auction_log_append_failures_total and
+logs it, and verify() reports the gap.
+
+A gap left by a writer that died between its update and its append never
+closes by itself, and sealing cannot get past it. Once the writer is known
+to be gone, an admin closes it with mark_lost()
+(POST /api/auctions/{auction_id}/log/lost): a "lost" entry naming who
+marked it and why takes the missing seq, is chained like any other
+entry, and sealing and snapshots resume. verify() then reports the
+auction valid and lists the lost seqs. A writer that was only slow finds
+its seq taken, and its entry stays lost.
+
+data is stored in its JSON form, datetimes as ISO strings. hash is the
+sha256 of the canonical JSON of the entry (without hash), so it covers
+prev_hash, the previous entry's hash. Two workers can write consecutive
+entries in either order, so an entry is written unchained when its
+predecessor's hash is not known yet; seal() then chains every entry after
+the last chained one, in seq order, up to the first gap. Chaining is
+deterministic, so concurrent sealers write the same hashes. Editing,
+removing or reordering any entry breaks every hash after it.
+
+Every SNAPSHOT_EVERY events the state folded so far is written to
+auction_log_snapshots. load_state() rebuilds an auction's state, current
+or as of any instant, from the latest snapshot at or before that point
+plus the events after it, so the cost is bounded by SNAPSHOT_EVERY
+rather than the length of the log.
+"""
+
+import hashlib
+import logging
+import os
+from collections import OrderedDict
+from datetime import datetime
+
+import orjson
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+from backend.database import auctions_collection, db
+from backend.metrics import AUCTION_LOG_FAILURES
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_EVERY = int(os.environ.get("AUCTION_LOG_SNAPSHOT_EVERY", 1000))
+HEAD_CACHE_SIZE = int(os.environ.get("AUCTION_LOG_HEAD_CACHE_SIZE", 10000))
+GENESIS_HASH = "0" * 64
+DUPLICATE_KEY = 11000
+# Terms recorded by the created event and carried in the state
+CREATED_FIELDS = (
+    "auction_type", "status", "grain_id", "quantity", "starting_price", "start_date", "end_date", "auto_award",
+)
+
+auction_log_collection = db.auction_log
+auction_snapshots_collection = db.auction_log_snapshots
+
+
+def _to_json(value) -> bytes:
+    return orjson.dumps(value, option=orjson.OPT_SORT_KEYS | orjson.OPT_NAIVE_UTC)
+
+
+def _millis(moment: datetime) -> datetime:
+    # Mongo keeps milliseconds; hash exactly what is stored
+    return moment.replace(microsecond=moment.microsecond // 1000 * 1000)
+
+
+def log_entry(auction_id: str, seq: int, event_type: str, data: dict, at: datetime) -> dict:
+    """A log entry, not chained yet"""
+    return {
+        "auction_id": auction_id,
+        "seq": seq,
+        "type": event_type,
+        "data": orjson.loads(_to_json(data)),
+        "at": _millis(at),
+        "prev_hash": None,
+        "hash": None,
+    }
+
+
+def chained(entry: dict, prev_hash: str) -> dict:
+    """The entry, hashed onto prev_hash"""
+    entry = {**entry, "prev_hash": prev_hash}
+    entry["hash"] = entry_hash(entry)
+    return entry
+
+
+def chain_entry(auction_id: str, seq: int, event_type: str, data: dict, at: datetime, prev_hash: str) -> dict:
+    return chained(log_entry(auction_id, seq, event_type, data, at), prev_hash)
+
+
+def entry_hash(entry: dict) -> str:
+    return hashlib.sha256(_to_json({
+        "auction_id": entry["auction_id"],
+        "seq": entry["seq"],
+        "type": entry["type"],
+        "data": entry["data"],
+        "at": entry["at"],
+        "prev_hash": entry["prev_hash"],
+    })).hexdigest()
+
+
+def created_data(auction: dict) -> dict:
+    return {field: auction.get(field) for field in CREATED_FIELDS}
+
+
+def initial_state(auction_id: str) -> dict:
+    return {
+        "auction_id": auction_id,
+        "seq": 0,
+        "hash": GENESIS_HASH,
+        "at": None,
+        **{field: None for field in CREATED_FIELDS},
+        "bid_count": 0,
+        "highest_bid_amount": None,
+        "highest_bid_id": None,
+        "winner_id": None,
+        "winner_bid_id": None,
+    }
+
+
+def apply_event(state: dict, entry: dict) -> dict:
+    """Fold one log entry into the state, in place"""
+    data = entry["data"]
+    event_type = entry["type"]
+    if event_type == "created":
+        for field in CREATED_FIELDS:
+            state[field] = data.get(field)
+    elif event_type == "bid_accepted":
+        state["bid_count"] += 1
+        amount = data.get("bid_amount")
+        if amount is not None and (state["highest_bid_amount"] is None or amount > state["highest_bid_amount"]):
+            state["highest_bid_amount"] = amount
+            state["highest_bid_id"] = data.get("bid_id")
+    elif event_type == "status_changed":
+        state["status"] = data["status"]
+        if data.get("winner_id"):
+            state["winner_id"] = data["winner_id"]
+            state["winner_bid_id"] = data.get("winner_bid_id")
+    elif event_type == "auction_extended":
+        state["end_date"] = data["end_date"]
+    state["seq"] = entry["seq"]
+    state["hash"] = entry["hash"]
+    state["at"] = entry["at"]
+    return state
+
+
+class AuctionLog:
+    def __init__(
+        self,
+        collection=auction_log_collection,
+        snapshots=auction_snapshots_collection,
+        auctions=auctions_collection,
+        snapshot_every: int = SNAPSHOT_EVERY,
+    ):
+        self._collection = collection
+        self._snapshots = snapshots
+        self._auctions = auctions
+        self._snapshot_every = snapshot_every
+        # Last chained (seq, hash) per auction
+        self._heads: OrderedDict[str, tuple[int, str]] = OrderedDict()
+
+    async def append(self, auction_id: str, seq: int, event_type: str, data: dict, at: datetime | None = None) -> dict:
+        """Write the event whose seq the caller's update allocated"""
+        [entry] = await self.append_many(auction_id, seq, [(event_type, data)], at)
+        return entry
+
+    async def append_many(
+        self, auction_id: str, first_seq: int, events: list[tuple[str, dict]], at: datetime | None = None
+    ) -> list[dict]:
+        """Write consecutive events from first_seq on, then chain what can be chained"""
+        at = at or datetime.utcnow()
+        entries = [log_entry(auction_id, first_seq + i, event_type, data, at) for i, (event_type, data) in enumerate(events)]
+        head = self._heads.get(auction_id)
+        if head is not None and head[0] == first_seq - 1:
+            # The predecessor is chained already, so these can be right away
+            prev_hash = head[1]
+            for i, entry in enumerate(entries):
+                entries[i] = chained(entry, prev_hash)
+                prev_hash = entries[i]["hash"]
+        try:
+            await self._collection.insert_many([dict(entry) for entry in entries], ordered=False)
+        except BulkWriteError as e:
+            # Already written by an earlier attempt of the same write path
+            if any(error["code"] != DUPLICATE_KEY for error in e.details["writeErrors"]):
+                raise
+        await self.seal(auction_id)
+        return entries
+
+    async def record(
+        self, auction_id: str, first_seq: int, events: list[tuple[str, dict]], at: datetime | None = None
+    ) -> bool:
+        """append_many() as the last step of a write path: a failure is reported, not raised"""
+        try:
+            await self.append_many(auction_id, first_seq, events, at)
+            return True
+        except Exception as e:
+            AUCTION_LOG_FAILURES.inc()
+            logger.error(f"Failed to log seq {first_seq} of auction {auction_id} ({events[0][0]}): {e}")
+            return False
+
+    async def mark_lost(self, auction_id: str, seq: int, marked_by: str, reason: str) -> str | None:
+        """Fill a gap whose entry will never be written; returns why it could not, if so"""
+        auction = await self._auctions.find_one({"id": auction_id}, {"_id": 0, "id": 1, "log_seq": 1})
+        if not auction:
+            return "Auction not found"
+        if not 1 <= seq <= (auction.get("log_seq") or 0):
+            return f"Auction has no event with seq {seq}"
+        entry = log_entry(auction_id, seq, "lost", {"marked_by": marked_by, "reason": reason}, datetime.utcnow())
+        try:
+            await self._collection.insert_one(entry)
+        except DuplicateKeyError:
+            return f"Seq {seq} is already logged"
+        logger.warning(f"Auction {auction_id} log seq {seq} marked lost by {marked_by}: {reason}")
+        await self.seal(auction_id)
+        return None
+
+    async def append_created(self, auctions: list[dict]):
+        """Log the creation of new auctions, stored with log_seq 1, with one insert"""
+        entries = [
+            chain_entry(auction["id"], 1, "created", created_data(auction), auction["created_at"], GENESIS_HASH)
+            for auction in auctions
+        ]
+        if entries:
+            await self._collection.insert_many([dict(entry) for entry in entries])
+            for entry in entries:
+                self._remember_head(entry["auction_id"], (entry["seq"], entry["hash"]))
+
+    async def seal(self, auction_id: str) -> tuple[int, str]:
+        """Chain the entries after the last chained one, in seq order, up to the first gap"""
+        seq, prev_hash = self._heads.get(auction_id) or await self._load_head(auction_id)
+        cursor = self._collection.find({"auction_id": auction_id, "seq": {"$gt": seq}}, {"_id": 0}).sort("seq", 1)
+        async for entry in cursor:
+            if entry["seq"] != seq + 1:
+                # Still being written; its writer seals on from here
+                break
+            if entry["hash"] is None:
+                entry = chained(entry, prev_hash)
+                await self._collection.update_one(
+                    {"auction_id": auction_id, "seq": entry["seq"], "hash": None},
+                    {"$set": {"prev_hash": prev_hash, "hash": entry["hash"]}}
+                )
+            seq, prev_hash = entry["seq"], entry["hash"]
+            if seq % self._snapshot_every == 0:
+                await self.snapshot(auction_id, seq)
+        self._remember_head(auction_id, (seq, prev_hash))
+        return seq, prev_hash
+
+    async def snapshot(self, auction_id: str, seq: int) -> dict:
+        """Store the state as of seq so later loads can start from it"""
+        state = await self._fold(auction_id, seq=seq)
+        await self._snapshots.update_one(
+            {"auction_id": auction_id, "seq": state["seq"]},
+            {"$setOnInsert": state},
+            upsert=True
+        )
+        return state
+
+    async def load_state(self, auction_id: str, at: datetime | None = None) -> dict:
+        """State as of `at` (default: now) from the latest snapshot plus the events after it"""
+        return await self._fold(auction_id, at=at)
+
+    async def history(self, auction_id: str, after_seq: int = 0, limit: int = 100) -> list[dict]:
+        cursor = self._collection.find(
+            {"auction_id": auction_id, "seq": {"$gt": after_seq}}, {"_id": 0}
+        ).sort("seq", 1).limit(limit)
+        return await cursor.to_list(limit)
+
+    async def verify(self, auction_id: str) -> dict:
+        """Walk the whole chain; reports the first entry missing, unlinked or modified"""
+        await self.seal(auction_id)
+        expected_seq, prev_hash = 1, GENESIS_HASH
+        lost = []
+        async for entry in self._collection.find({"auction_id": auction_id}, {"_id": 0}).sort("seq", 1):
+            if entry["seq"] != expected_seq:
+                return {"valid": False, "seq": expected_seq, "error": "missing entry"}
+            if entry["hash"] is None:
+                return {"valid": False, "seq": entry["seq"], "error": "entry not chained yet"}
+            if entry["prev_hash"] != prev_hash:
+                return {"valid": False, "seq": entry["seq"], "error": "broken link to the previous entry"}
+            if entry_hash(entry) != entry["hash"]:
+                return {"valid": False, "seq": entry["seq"], "error": "entry was modified"}
+            if entry["type"] == "lost":
+                lost.append(entry["seq"])
+            expected_seq, prev_hash = expected_seq + 1, entry["hash"]
+
+        # Events the auction counted but whose entries never arrived
+        auction = await self._auctions.find_one({"id": auction_id}, {"_id": 0, "log_seq": 1})
+        if auction and (auction.get("log_seq") or 0) >= expected_seq:
+            return {"valid": False, "seq": expected_seq, "error": "missing entry"}
+        return {"valid": True, "events": expected_seq - 1, "head": prev_hash, "lost": lost}
+
+    async def _fold(self, auction_id: str, at: datetime | None = None, seq: int | None = None) -> dict:
+        snapshot_query = {"auction_id": auction_id}
+        tail_query = {"auction_id": auction_id}
+        if at is not None:
+            snapshot_query["at"] = tail_query["at"] = {"$lte": at}
+        if seq is not None:
+            snapshot_query["seq"] = {"$lte": seq}
+        snapshot = await self._snapshots.find_one(snapshot_query, {"_id": 0}, sort=[("seq", -1)])
+        state = snapshot or initial_state(auction_id)
+
+        tail_query["seq"] = {"$gt": state["seq"]}
+        if seq is not None:
+            tail_query["seq"]["$lte"] = seq
+        async for entry in self._collection.find(tail_query, {"_id": 0}).sort("seq", 1):
+            apply_event(state, entry)
+        return state
+
+    async def _load_head(self, auction_id: str) -> tuple[int, str]:
+        last = await self._collection.find_one(
+            {"auction_id": auction_id, "hash": {"$ne": None}}, {"_id": 0, "seq": 1, "hash": 1}, sort=[("seq", -1)]
+        )
+        return (last["seq"], last["hash"]) if last else (0, GENESIS_HASH)
+
+    def _remember_head(self, auction_id: str, head: tuple[int, str]):
+        self._heads[auction_id] = head
+        self._heads.move_to_end(auction_id)
+        if len(self._heads) > HEAD_CACHE_SIZE:
+            self._heads.popitem(last=False)
+
+
+auction_log = AuctionLog()
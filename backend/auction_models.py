@@ -16,13 +16,38 @@ class AuctionCreate(BaseModel):
     starting_price: float
     start_date: datetime
     end_date: datetime
+    auction_type: str = "english"  # english, sealed_first_price, sealed_second_price, dutch
+    # English auctions only: a bid placed when the auction ends within
+    # soft_close_seconds pushes end_date to soft_close_extension_seconds
+    # after the bid, by at most soft_close_max_extension_seconds in total
+    # (all three are required to enable it)
+    soft_close_seconds: Optional[int] = None
+    soft_close_extension_seconds: Optional[int] = None
+    soft_close_max_extension_seconds: Optional[int] = None
+    # Award the best bid automatically at close instead of via select-winner
+    auto_award: bool = False
+    # Dutch auctions only: the price drops by price_decrement every
+    # decrement_interval_seconds, but never below reserve_price
+    price_decrement: Optional[float] = None
+    decrement_interval_seconds: Optional[int] = None
+    reserve_price: Optional[float] = None
 
 class Auction(AuctionCreate):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     status: str = "pending"  # pending, active, completed, winner_selected
     winner_id: Optional[str] = None
+    winner_bid_id: Optional[str] = None
     created_by: str  # admin user id
     created_at: datetime = Field(default_factory=datetime.utcnow)
+    # Bid summary, maintained atomically by place_bid (see repair_bid_summary.py)
+    highest_bid_amount: Optional[float] = None
+    highest_bid_id: Optional[str] = None
+    bid_count: int = 0
+    soft_close_until: Optional[datetime] = None  # cap on soft-close extensions
+    # Tonnage split across the winning bids by POST /auctions/{id}/allocate
+    allocated_quantity: Optional[float] = None
+    # Price the top bid pays when the engine sets it (sealed, dutch)
+    clearing_price: Optional[float] = None
 
 class AuctionResponse(Auction):
     current_highest_bid: Optional[float] = None
@@ -34,6 +59,7 @@ class BidCreate(BaseModel):
     bid_amount: float
     payment_type: str  # cashless or cash
     delivery_location: str
+    quantity: Optional[float] = Field(None, gt=0)  # tonnes wanted; None means the whole lot
 
 class Bid(BidCreate):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
@@ -41,11 +67,14 @@ class Bid(BidCreate):
     user_name: str
     user_company: str
     created_at: datetime = Field(default_factory=datetime.utcnow)
+    allocated_quantity: Optional[float] = None
 
 class BidResponse(BaseModel):
     id: str
     auction_id: str
     bid_amount: float
+    quantity: Optional[float] = None
+    allocated_quantity: Optional[float] = None
     user_name: str
     user_company: str
     created_at: datetime
@@ -53,3 +82,57 @@ class BidResponse(BaseModel):
 class WinnerSelect(BaseModel):
     auction_id: str
     winner_bid_id: str
+
+class LostLogEntry(BaseModel):
+    seq: int
+    reason: str
+
+class AllocationItem(BaseModel):
+    bid_id: str
+    user_id: str
+    bid_amount: float
+    requested_quantity: float
+    allocated_quantity: float
+
+class AllocationResult(BaseModel):
+    auction_id: str
+    quantity: float
+    allocated_quantity: float
+    allocations: List[AllocationItem]
+
+class BulkItemResult(BaseModel):
+    index: int
+    success: bool
+    auction_id: Optional[str] = None
+    error: Optional[str] = None
+
+class BulkResult(BaseModel):
+    succeeded: int
+    failed: int
+    results: List[BulkItemResult]
+
+# Order Book Models
+class OrderCreate(BaseModel):
+    side: str  # buy or sell
+    price: float  # per tonne
+    quantity: float  # tonnes
+
+class FillResponse(BaseModel):
+    buy_order_id: str
+    sell_order_id: str
+    price: float
+    quantity: float
+
+class OrderResponse(BaseModel):
+    id: str
+    book_id: str
+    remaining: float
+    fills: List[FillResponse]
+
+class OrderBookDepth(BaseModel):
+    book_id: str
+    seq: int
+    best_bid: Optional[float] = None
+    best_ask: Optional[float] = None
+    bids: List[List[float]]  # [price, tonnes], best first
+    asks: List[List[float]]
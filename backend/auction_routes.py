@@ -1,4 +1,5 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi.responses import StreamingResponse
 from backend.auction_models import (
     AuctionCreate,
     Auction,
@@ -6,17 +7,51 @@ from backend.auction_models import (
     BidCreate,
     Bid,
     BidResponse,
-    WinnerSelect
+    WinnerSelect,
+    LostLogEntry,
+    AllocationItem,
+    AllocationResult,
+    BulkItemResult,
+    BulkResult
 )
-from backend.auth import get_current_admin, get_approved_buyer, get_current_user
-from backend.database import auctions_collection, bids_collection, users_collection
-from backend.email_service import send_auction_winner_email
+from backend.auth import get_current_admin, get_approved_buyer, get_current_user, decode_token
+from backend.database import auctions_collection, bids_collection, bids_read_collection, users_collection
+from backend.email_service import (
+    allocation_winner_details, auction_winner_details, send_auction_winner_email, send_auction_winner_emails
+)
+from backend.auction_listing import AUCTION_PROJECTION, auction_filter, fetch_auction_listing, with_bid_summary
+from backend.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, NEXT_CURSOR_HEADER, fetch_page
+from backend.serialization import projection_for, validated_response
+from pydantic import TypeAdapter
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError
+from backend.auction_scheduler import scheduler
+from backend.auction_events import event_bus, redact_event
+from backend.auction_log import auction_log
+from backend.allocation import allocate_lot, record_allocations
+from backend.auction_engines import ENGINES, log_bid, place_bid as engine_place_bid
+from backend.auto_award import award_auctions
+from backend.bidding import soft_close_until
+from backend.user_cache import user_cache
+from dataclasses import asdict
 from datetime import datetime
+import asyncio
+import json
 import logging
+import uuid
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/auctions", tags=["auctions"])
 
+SSE_HEARTBEAT_SECONDS = 15
+MAX_BULK_ITEMS = 500
+BID_SORT = [("bid_amount", -1), ("id", -1)]
+BID_PROJECTION = projection_for(BidResponse)
+
+auction_adapter = TypeAdapter(AuctionResponse)
+auction_list_adapter = TypeAdapter(list[AuctionResponse])
+bid_list_adapter = TypeAdapter(list[BidResponse])
+
 
 @router.post("/create", response_model=AuctionResponse)
 async def create_auction(
@@ -24,78 +59,157 @@ async def create_auction(
     current_user: dict = Depends(get_current_admin)
 ):
     """Create new auction (Admin only)"""
+    error = _auction_error(auction_data)
+    if error:
+        raise HTTPException(status_code=400, detail=error)
+    
     auction = Auction(
         **auction_data.dict(),
-        created_by=current_user["sub"]
+        created_by=current_user["sub"],
+        soft_close_until=soft_close_until(auction_data)
     )
     
-    await auctions_collection.insert_one(auction.dict())
+    # log_seq 1 is the created entry; every later change $incs it
+    await auctions_collection.insert_one({**auction.dict(), "log_seq": 1})
+    await auction_log.append_created([auction.dict()])
+    scheduler.schedule(auction.dict())
     logger.info(f"Auction created: {auction.id} by {current_user['email']}")
     
-    return AuctionResponse(**auction.dict(), current_highest_bid=None, total_bids=0)
+    return AuctionResponse(**with_bid_summary(auction.dict()))
 
 
-@router.get("/list", response_model=list[AuctionResponse])
-async def list_auctions():
-    """Get all auctions with their current status"""
-    auctions = await auctions_collection.find().to_list(100)
-    
-    result = []
-    for auction in auctions:
-        # Get highest bid
-        highest_bid = await bids_collection.find_one(
-            {"auction_id": auction["id"]},
-            sort=[("bid_amount", -1)]
+@router.post("/bulk-create", response_model=BulkResult)
+async def bulk_create_auctions(
+    auctions_data: list[AuctionCreate],
+    current_user: dict = Depends(get_current_admin)
+):
+    """Create a batch of auctions with one insert (Admin only)"""
+    if len(auctions_data) > MAX_BULK_ITEMS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BULK_ITEMS} auctions per request")
+    
+    # Validate everything first; only valid items are written
+    results = []
+    docs = []
+    for index, auction_data in enumerate(auctions_data):
+        error = _auction_error(auction_data)
+        if error:
+            results.append(BulkItemResult(index=index, success=False, error=error))
+            continue
+        auction = Auction(
+            **auction_data.dict(), created_by=current_user["sub"], soft_close_until=soft_close_until(auction_data)
         )
-        
-        # Count total bids
-        total_bids = await bids_collection.count_documents({"auction_id": auction["id"]})
-        
-        # Update auction status based on dates
-        now = datetime.utcnow()
-        if auction["status"] == "pending" and now >= auction["start_date"]:
-            auction["status"] = "active"
-            await auctions_collection.update_one(
-                {"id": auction["id"]},
-                {"$set": {"status": "active"}}
-            )
-        elif auction["status"] == "active" and now >= auction["end_date"]:
-            auction["status"] = "completed"
-            await auctions_collection.update_one(
-                {"id": auction["id"]},
-                {"$set": {"status": "completed"}}
-            )
-        
-        result.append(AuctionResponse(
-            **auction,
-            current_highest_bid=highest_bid["bid_amount"] if highest_bid else None,
-            total_bids=total_bids
-        ))
+        results.append(BulkItemResult(index=index, success=True, auction_id=auction.id))
+        docs.append((index, auction.dict()))
+    
+    if docs:
+        try:
+            await auctions_collection.insert_many([{**doc, "log_seq": 1} for _, doc in docs], ordered=False)
+        except BulkWriteError as e:
+            for write_error in e.details["writeErrors"]:
+                index, _ = docs[write_error["index"]]
+                results[index] = BulkItemResult(index=index, success=False, error=write_error["errmsg"])
+        inserted = {result.auction_id for result in results if result.success}
+        await auction_log.append_created([doc for _, doc in docs if doc["id"] in inserted])
+        for _, doc in docs:
+            if doc["id"] in inserted:
+                scheduler.schedule(doc)
     
-    return result
+    logger.info(f"Bulk auction create by {current_user['email']}: {len(docs)} of {len(auctions_data)} valid")
+    return _bulk_result(results)
+
+
+def _auction_error(auction_data: AuctionCreate) -> str | None:
+    if auction_data.end_date <= auction_data.start_date:
+        return "end_date must be after start_date"
+    if auction_data.starting_price <= 0:
+        return "starting_price must be positive"
+    if auction_data.quantity <= 0:
+        return "quantity must be positive"
+    engine = ENGINES.get(auction_data.auction_type)
+    if engine is None:
+        return f"auction_type must be one of: {', '.join(ENGINES)}"
+    return engine.validate(auction_data)
+
+
+def _bulk_result(results: list[BulkItemResult]) -> BulkResult:
+    succeeded = sum(1 for result in results if result.success)
+    return BulkResult(succeeded=succeeded, failed=len(results) - succeeded, results=results)
+
+
+@router.get("/list", response_model=list[AuctionResponse])
+async def list_auctions(
+    status: str | None = None,
+    grain_id: str | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+    cursor: str | None = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)
+):
+    """Get auctions with their current status, newest first.
+
+    Paginated by cursor: when more auctions exist, the X-Next-Cursor header
+    holds the value to pass as ?cursor= for the next page.
+    """
+    auctions, next_cursor = await fetch_auction_listing(
+        auction_filter(status, grain_id, created_from, created_to), limit, cursor
+    )
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+    return validated_response(auction_list_adapter, auctions, headers)
+
+
+@router.get("/events")
+async def stream_auction_events(
+    auction_id: str | None = None,
+    token: str | None = None
+):
+    """Server-Sent Events stream of bid and status changes.
+
+    EventSource cannot send headers, so the JWT is passed as ?token=.
+    Anonymous and non-admin subscribers get the public fields only.
+    """
+    is_admin = False
+    if token:
+        is_admin = decode_token(token).get("role") == "admin"
+
+    async def event_stream():
+        queue = event_bus.subscribe()
+        try:
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=SSE_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    # Keeps proxies from closing an idle connection
+                    yield ": heartbeat\n\n"
+                    continue
+                if auction_id and event["auction_id"] != auction_id:
+                    continue
+                payload = json.dumps(redact_event(event, is_admin), default=_json_default)
+                yield f"event: {event['type']}\ndata: {payload}\n\n"
+        finally:
+            # Starlette cancels the generator when the client disconnects
+            event_bus.unsubscribe(queue)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
 
 
 @router.get("/{auction_id}", response_model=AuctionResponse)
 async def get_auction(auction_id: str):
     """Get auction details"""
-    auction = await auctions_collection.find_one({"id": auction_id})
+    auction = await auctions_collection.find_one({"id": auction_id}, AUCTION_PROJECTION)
     if not auction:
         raise HTTPException(status_code=404, detail="Auction not found")
     
-    # Get highest bid
-    highest_bid = await bids_collection.find_one(
-        {"auction_id": auction_id},
-        sort=[("bid_amount", -1)]
-    )
-    
-    # Count total bids
-    total_bids = await bids_collection.count_documents({"auction_id": auction_id})
-    
-    return AuctionResponse(
-        **auction,
-        current_highest_bid=highest_bid["bid_amount"] if highest_bid else None,
-        total_bids=total_bids
-    )
+    return validated_response(auction_adapter, with_bid_summary(auction))
 
 
 @router.post("/bid", response_model=BidResponse)
@@ -104,36 +218,8 @@ async def place_bid(
     current_user: dict = Depends(get_approved_buyer)
 ):
     """Place bid on auction (Approved buyers only)"""
-    # Check auction exists and is active
-    auction = await auctions_collection.find_one({"id": bid_data.auction_id})
-    if not auction:
-        raise HTTPException(status_code=404, detail="Auction not found")
-    
-    if auction["status"] != "active":
-        raise HTTPException(status_code=400, detail="Auction is not active")
-    
-    # Check if auction has ended
-    if datetime.utcnow() >= auction["end_date"]:
-        raise HTTPException(status_code=400, detail="Auction has ended")
-    
-    # Get highest bid
-    highest_bid = await bids_collection.find_one(
-        {"auction_id": bid_data.auction_id},
-        sort=[("bid_amount", -1)]
-    )
-    
-    # Check if bid is higher than current highest with minimum 1% increase
-    current_price = highest_bid["bid_amount"] if highest_bid else auction["starting_price"]
-    min_bid = current_price * 1.01  # 1% increase
-    
-    if bid_data.bid_amount < min_bid:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Ставка має бути мінімум на 1% вище поточної ціни. Мінімальна ставка: {min_bid:.2f} грн"
-        )
-    
     # Get user info
-    user = await users_collection.find_one({"id": current_user["sub"]})
+    user = await user_cache.get(current_user["sub"])
     
     # Create bid
     bid = Bid(
@@ -143,23 +229,99 @@ async def place_bid(
         user_company=user["company_name"]
     )
     
-    await bids_collection.insert_one(bid.dict())
+    # The auction's engine enforces status, end date and its price rule atomically
+    outcome = await engine_place_bid(bid)
+    engine, auction = outcome.engine, outcome.auction
     logger.info(f"Bid placed: {bid.id} on auction {bid_data.auction_id} by {user['email']}")
     
+    await event_bus.publish(
+        "bid_accepted",
+        bid.auction_id,
+        # Sealed bids stay hidden from the public stream until close
+        current_highest_bid=None if engine.sealed else bid.bid_amount,
+        total_bids=auction.get("bid_count", 0) + 1,
+        bid_id=bid.id,
+        bid_amount=bid.bid_amount,
+        user_id=bid.user_id,
+        user_name=bid.user_name,
+        user_company=bid.user_company,
+        created_at=bid.created_at,
+        end_date=outcome.end_date
+    )
+    if outcome.extended:
+        # Soft close: every worker's scheduler re-arms for the new end
+        await scheduler.extend(bid.auction_id, outcome.end_date)
+        await event_bus.publish("auction_extended", bid.auction_id, end_date=outcome.end_date, bid_id=bid.id)
+    if engine.closes_on_bid:
+        # Completed here rather than by the scheduler, so auto_award is applied here too
+        await event_bus.publish("status_changed", bid.auction_id, status="completed")
+        await award_auctions([bid.auction_id])
+    # Last, so a failed append cannot skip the steps above
+    await log_bid(bid, outcome)
+    
     return BidResponse(**bid.dict())
 
 
 @router.get("/{auction_id}/bids", response_model=list[BidResponse])
 async def get_auction_bids(
     auction_id: str,
+    cursor: str | None = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
     current_user: dict = Depends(get_current_admin)
 ):
-    """Get all bids for an auction (Admin only - bids are confidential)"""
-    bids = await bids_collection.find(
-        {"auction_id": auction_id}
-    ).sort("bid_amount", -1).to_list(100)
+    """Get bids for an auction, highest first (Admin only - bids are confidential)"""
+    bids, next_cursor = await fetch_page(
+        bids_read_collection, {"auction_id": auction_id}, BID_SORT, limit, cursor,
+        projection=BID_PROJECTION
+    )
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
     
-    return [BidResponse(**bid) for bid in bids]
+    return validated_response(bid_list_adapter, bids, headers)
+
+
+@router.get("/{auction_id}/log")
+async def get_auction_log(
+    auction_id: str,
+    after_seq: int = Query(0, ge=0),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    current_user: dict = Depends(get_current_admin)
+):
+    """Entries of the auction's event log after after_seq, oldest first (Admin only)"""
+    return await auction_log.history(auction_id, after_seq, limit)
+
+
+@router.get("/{auction_id}/log/state")
+async def get_auction_log_state(
+    auction_id: str,
+    at: datetime | None = None,
+    current_user: dict = Depends(get_current_admin)
+):
+    """Auction state rebuilt from its log, now or as of `at` (Admin only)"""
+    return await auction_log.load_state(auction_id, at)
+
+
+@router.get("/{auction_id}/log/verify")
+async def verify_auction_log(
+    auction_id: str,
+    current_user: dict = Depends(get_current_admin)
+):
+    """Check the hash chain of the auction's log end to end (Admin only)"""
+    return await auction_log.verify(auction_id)
+
+
+@router.post("/{auction_id}/log/lost")
+async def mark_auction_log_lost(
+    auction_id: str,
+    lost: LostLogEntry,
+    current_user: dict = Depends(get_current_admin)
+):
+    """Close a log gap whose writer died before logging its event (Admin only)"""
+    error = await auction_log.mark_lost(auction_id, lost.seq, current_user["email"], lost.reason)
+    if error == "Auction not found":
+        raise HTTPException(status_code=404, detail=error)
+    if error:
+        raise HTTPException(status_code=409, detail=error)
+    return await auction_log.verify(auction_id)
 
 
 @router.post("/select-winner")
@@ -181,25 +343,218 @@ async def select_winner(
     if not bid or bid["auction_id"] != winner_data.auction_id:
         raise HTTPException(status_code=404, detail="Bid not found")
     
-    # Update auction with winner
-    await auctions_collection.update_one(
-        {"id": winner_data.auction_id},
-        {"$set": {
-            "winner_id": bid["user_id"],
-            "status": "winner_selected"
-        }}
+    # Update auction with winner, unless auto-award or an allocation got there first
+    previous = await auctions_collection.find_one_and_update(
+        {"id": winner_data.auction_id, "status": "completed"},
+        {
+            "$set": {
+                "winner_id": bid["user_id"],
+                "winner_bid_id": bid["id"],
+                "status": "winner_selected"
+            },
+            "$inc": {"log_seq": 1}
+        },
+        projection={"_id": 0, "id": 1, "log_seq": 1},
+        return_document=ReturnDocument.BEFORE
+    )
+    if previous is None:
+        raise HTTPException(status_code=409, detail="Auction was awarded meanwhile")
+    
+    await event_bus.publish(
+        "status_changed", winner_data.auction_id, status="winner_selected",
+        winner_id=bid["user_id"], winner_bid_id=bid["id"]
     )
     
     # Send email to winner
     user = await users_collection.find_one({"id": bid["user_id"]})
-    auction_details = {
-        "grain_type": auction["grain_type"],
-        "quality": auction["quality"],
-        "quantity": auction["quantity"],
-        "winning_bid": bid["bid_amount"]
-    }
-    send_auction_winner_email(user["email"], user["full_name"], auction_details)
+    await send_auction_winner_email(user["email"], user["full_name"], auction_winner_details(auction, bid))
+    await auction_log.record(
+        winner_data.auction_id, (previous.get("log_seq") or 0) + 1,
+        [("status_changed", {"status": "winner_selected", "winner_id": bid["user_id"], "winner_bid_id": bid["id"]})]
+    )
     
     logger.info(f"Winner selected for auction {winner_data.auction_id}: {user['email']}")
     
     return {"success": True, "message": "Winner selected and notified"}
+
+
+@router.post("/{auction_id}/allocate", response_model=AllocationResult)
+async def allocate_auction(
+    auction_id: str,
+    current_user: dict = Depends(get_current_admin)
+):
+    """Split a completed auction's tonnage across its best bids (Admin only)"""
+    auction = await auctions_collection.find_one({"id": auction_id}, {"_id": 0})
+    if not auction:
+        raise HTTPException(status_code=404, detail="Auction not found")
+    
+    if auction["status"] != "completed":
+        raise HTTPException(status_code=400, detail="Auction is not completed yet")
+    
+    allocations = await allocate_lot(auction)
+    if not allocations:
+        raise HTTPException(status_code=400, detail="Auction has no bids")
+    
+    allocated = round(sum(allocation.allocated_quantity for allocation in allocations), 3)
+    top = allocations[0]
+    previous = await auctions_collection.find_one_and_update(
+        {"id": auction_id, "status": "completed"},
+        {
+            "$set": {
+                "winner_id": top.user_id,
+                "winner_bid_id": top.bid_id,
+                "allocated_quantity": allocated,
+                "status": "winner_selected"
+            },
+            "$inc": {"log_seq": 1}
+        },
+        projection={"_id": 0, "id": 1, "log_seq": 1},
+        return_document=ReturnDocument.BEFORE
+    )
+    if previous is None:
+        raise HTTPException(status_code=409, detail="Auction was awarded meanwhile")
+    # Only once the auction is ours: a lost claim must leave the bids untouched
+    await record_allocations(allocations)
+    
+    await event_bus.publish(
+        "status_changed", auction_id, status="winner_selected",
+        winner_id=top.user_id, winner_bid_id=top.bid_id
+    )
+    
+    users = {
+        user["id"]: user
+        async for user in users_collection.find(
+            {"id": {"$in": [allocation.user_id for allocation in allocations]}},
+            {"_id": 0, "id": 1, "email": 1, "full_name": 1}
+        )
+    }
+    notifications = []
+    for allocation in allocations:
+        user = users.get(allocation.user_id)
+        if user:
+            notifications.append((user["email"], user["full_name"], allocation_winner_details(auction, allocation)))
+    await send_auction_winner_emails(notifications)
+    await auction_log.record(
+        auction_id, (previous.get("log_seq") or 0) + 1,
+        [("status_changed", {"status": "winner_selected", "winner_id": top.user_id, "winner_bid_id": top.bid_id})]
+    )
+    
+    logger.info(f"Auction {auction_id} allocated by {current_user['email']}: {allocated} t to {len(allocations)} bids")
+    return AllocationResult(
+        auction_id=auction_id,
+        quantity=auction["quantity"],
+        allocated_quantity=allocated,
+        allocations=[AllocationItem(**asdict(allocation)) for allocation in allocations]
+    )
+
+
+@router.post("/bulk-select-winner", response_model=BulkResult)
+async def bulk_select_winners(
+    winners_data: list[WinnerSelect],
+    current_user: dict = Depends(get_current_admin)
+):
+    """Select winners for a batch of completed auctions (Admin only)"""
+    if len(winners_data) > MAX_BULK_ITEMS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BULK_ITEMS} winners per request")
+    
+    # One query per collection for the whole batch
+    auctions = {
+        auction["id"]: auction
+        async for auction in auctions_collection.find(
+            {"id": {"$in": [w.auction_id for w in winners_data]}}, {"_id": 0}
+        )
+    }
+    bids = {
+        bid["id"]: bid
+        async for bid in bids_collection.find(
+            {"id": {"$in": [w.winner_bid_id for w in winners_data]}}, {"_id": 0}
+        )
+    }
+    
+    # Tags this request's awards, to tell them from a concurrent award
+    run = str(uuid.uuid4())
+    results = []
+    ops = []
+    candidates = []
+    seen = set()
+    for index, winner_data in enumerate(winners_data):
+        auction = auctions.get(winner_data.auction_id)
+        bid = bids.get(winner_data.winner_bid_id)
+        if winner_data.auction_id in seen:
+            error = "Auction appears more than once in the batch"
+        elif not auction:
+            error = "Auction not found"
+        elif auction["status"] != "completed":
+            error = "Auction is not completed yet"
+        elif not bid or bid["auction_id"] != winner_data.auction_id:
+            error = "Bid not found"
+        else:
+            error = None
+        seen.add(winner_data.auction_id)
+        
+        if error:
+            results.append(BulkItemResult(index=index, success=False, auction_id=winner_data.auction_id, error=error))
+            continue
+        results.append(BulkItemResult(index=index, success=True, auction_id=winner_data.auction_id))
+        ops.append(UpdateOne(
+            {"id": winner_data.auction_id, "status": "completed"},
+            {
+                "$set": {
+                    "winner_id": bid["user_id"],
+                    "winner_bid_id": bid["id"],
+                    "status": "winner_selected",
+                    "award_run": run
+                },
+                "$inc": {"log_seq": 1}
+            }
+        ))
+        candidates.append((index, auction, bid))
+    
+    log_seqs = {}
+    if ops:
+        await auctions_collection.bulk_write(ops, ordered=False)
+        # An auto-award, allocation or parallel select may have got there first.
+        # winner_selected is final, so log_seq is still the one this award took.
+        log_seqs = {
+            auction["id"]: auction["log_seq"]
+            async for auction in auctions_collection.find(
+                {"id": {"$in": [auction["id"] for _, auction, _ in candidates]}, "award_run": run},
+                {"_id": 0, "id": 1, "log_seq": 1}
+            )
+        }
+    awarded = []
+    for index, auction, bid in candidates:
+        if auction["id"] in log_seqs:
+            awarded.append((auction, bid))
+        else:
+            results[index] = BulkItemResult(
+                index=index, success=False, auction_id=auction["id"], error="Auction was awarded meanwhile"
+            )
+    
+    users = {
+        user["id"]: user
+        async for user in users_collection.find(
+            {"id": {"$in": [bid["user_id"] for _, bid in awarded]}},
+            {"_id": 0, "id": 1, "email": 1, "full_name": 1}
+        )
+    }
+    notifications = []
+    for auction, bid in awarded:
+        await event_bus.publish(
+            "status_changed", auction["id"], status="winner_selected",
+            winner_id=bid["user_id"], winner_bid_id=bid["id"]
+        )
+        user = users.get(bid["user_id"])
+        if user:
+            notifications.append((user["email"], user["full_name"], auction_winner_details(auction, bid)))
+    await send_auction_winner_emails(notifications)
+    await asyncio.gather(*(
+        auction_log.record(
+            auction["id"], log_seqs[auction["id"]],
+            [("status_changed", {"status": "winner_selected", "winner_id": bid["user_id"], "winner_bid_id": bid["id"]})]
+        )
+        for auction, bid in awarded
+    ))
+    
+    logger.info(f"Bulk winner selection by {current_user['email']}: {len(awarded)} of {len(winners_data)} awarded")
+    return _bulk_result(results)
@@ -0,0 +1,189 @@
+import asyncio
+import heapq
+import logging
+from datetime import datetime
+
+from pymongo import ReturnDocument
+
+from backend.database import auctions_collection
+from backend.auction_engines import settle_auctions
+from backend.auction_events import event_bus
+from backend.auction_log import auction_log
+from backend.auto_award import award_auctions
+from backend.shared_state import shared_state
+
+logger = logging.getLogger(__name__)
+
+# Delay before retrying after a failed transition (Mongo unavailable, etc.)
+RETRY_DELAY_SECONDS = 5.0
+DEADLINES_CHANNEL = "auction_deadlines"
+
+
+class AuctionScheduler:
+    """Flips auction statuses (pending -> active -> completed) when they are due.
+
+    Upcoming start_date/end_date deadlines are kept in a min-heap and the
+    background task sleeps until the earliest one. When it wakes, the due
+    auctions are found with one read per status and each is flipped with its
+    own conditional find_one_and_update, all sent at once, so a burst of lots
+    closing at the same minute costs one round trip per status. The date
+    filters in those updates are the source of truth: heap entries are only
+    wake-up hints, which keeps the scheduler idempotent across restarts.
+    Every worker holds the same deadlines and wakes with the others; only the
+    one whose update flipped an auction logs, publishes and settles the change.
+    """
+
+    def __init__(self, collection=auctions_collection, clock=datetime.utcnow, state=shared_state, log=auction_log):
+        self._collection = collection
+        self._clock = clock
+        self._state = state
+        self._log = log
+        self._heap: list[tuple[datetime, str]] = []
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        state.subscribe(DEADLINES_CHANNEL, self._on_deadline_moved)
+
+    async def start(self):
+        """Reload deadlines from Mongo, catch up on missed transitions and start the loop"""
+        await self.reload()
+        await self.run_due()
+        # Auto-award auctions left completed (or unnotified) by a crash
+        await award_auctions(auctions=self._collection)
+        # A fresh event each start: an asyncio.Event is bound to the loop it first waited on
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run(), name="auction-scheduler")
+        logger.info(f"Auction scheduler started with {len(self._heap)} pending deadlines")
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def reload(self):
+        """Rebuild the heap from auctions that still have a transition ahead of them"""
+        cursor = self._collection.find(
+            {"status": {"$in": ["pending", "active"]}},
+            {"_id": 0, "id": 1, "status": 1, "start_date": 1, "end_date": 1}
+        )
+        heap = []
+        async for auction in cursor:
+            heap.extend(self._deadlines(auction))
+        heapq.heapify(heap)
+        self._heap = heap
+        self._wakeup.set()
+
+    def schedule(self, auction: dict):
+        """Register a new or changed auction; the loop re-arms its timer if needed"""
+        for entry in self._deadlines(auction):
+            heapq.heappush(self._heap, entry)
+        self._wakeup.set()
+
+    async def extend(self, auction_id: str, end_date: datetime):
+        """Tell every worker's scheduler that an active auction now ends at end_date.
+
+        The earlier wake-up stays in the heap; when it fires, the end_date
+        filter in run_due no longer matches, so it is a no-op.
+        """
+        message = {"id": auction_id, "end_date": end_date}
+        try:
+            await self._state.publish(DEADLINES_CHANNEL, message)
+        except Exception as e:
+            # Other workers still close it at the latest on their next reload
+            logger.error(f"Failed to announce the new end of auction {auction_id}: {e}")
+            self._on_deadline_moved(message)
+
+    def _on_deadline_moved(self, message: dict):
+        self.schedule({"id": message["id"], "status": "active", "end_date": message["end_date"]})
+
+    def next_deadline(self) -> datetime | None:
+        return self._heap[0][0] if self._heap else None
+
+    async def run_due(self) -> tuple[int, int]:
+        """Apply every transition that is due now; returns (activated, completed)"""
+        now = self._clock()
+        activated = await self._transition(
+            {"status": "pending", "start_date": {"$lte": now}}, "active", now
+        )
+        completed = await self._transition(
+            {"status": "active", "end_date": {"$lte": now}}, "completed", now
+        )
+        # Only drop the wake-ups once the writes went through, so a failure is retried
+        while self._heap and self._heap[0][0] <= now:
+            heapq.heappop(self._heap)
+
+        if activated or completed:
+            logger.info(f"Auction statuses updated: {activated} activated, {completed} completed")
+        return activated, completed
+
+    async def _transition(self, query: dict, status: str, now: datetime) -> int:
+        """Move every auction matching `query` to `status`; log and publish the changes this worker made"""
+        due = [auction["id"] async for auction in self._collection.find(query, {"_id": 0, "id": 1})]
+        if not due:
+            return 0
+        flipped = await asyncio.gather(*(
+            self._collection.find_one_and_update(
+                {**query, "id": auction_id},
+                {"$set": {"status": status}, "$inc": {"log_seq": 1}},
+                projection={"_id": 0, "id": 1, "auction_type": 1, "log_seq": 1},
+                return_document=ReturnDocument.BEFORE
+            )
+            for auction_id in due
+        ))
+        # None: another worker got there first
+        auctions = [auction for auction in flipped if auction is not None]
+        if not auctions:
+            return 0
+        auction_ids = [auction["id"] for auction in auctions]
+        if status == "completed":
+            # Sealed auctions reveal their result only now
+            await settle_auctions(auctions, self._collection)
+        for auction_id in auction_ids:
+            await event_bus.publish("status_changed", auction_id, status=status)
+        if status == "completed":
+            await award_auctions(auction_ids, self._collection)
+        # Last: the find above no longer matches these auctions, so nothing
+        # before this may be skipped by a failed append
+        await asyncio.gather(*(
+            self._log.record(
+                auction["id"], (auction.get("log_seq") or 0) + 1, [("status_changed", {"status": status})], at=now
+            )
+            for auction in auctions
+        ))
+        return len(auctions)
+
+    async def _run(self):
+        while True:
+            self._wakeup.clear()
+            deadline = self.next_deadline()
+            timeout = None
+            if deadline is not None:
+                timeout = max(0.0, (deadline - self._clock()).total_seconds())
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+                # Woken by schedule()/reload(): recompute the sleep time
+                continue
+            except asyncio.TimeoutError:
+                pass
+
+            try:
+                await self.run_due()
+            except Exception as e:
+                logger.error(f"Auction scheduler failed to apply transitions: {e}")
+                await asyncio.sleep(RETRY_DELAY_SECONDS)
+
+    @staticmethod
+    def _deadlines(auction: dict) -> list[tuple[datetime, str]]:
+        entries = []
+        if auction.get("status", "pending") == "pending":
+            entries.append((auction["start_date"], auction["id"]))
+        if auction.get("status", "pending") in ("pending", "active"):
+            entries.append((auction["end_date"], auction["id"]))
+        return entries
+
+
+scheduler = AuctionScheduler()
@@ -1,18 +1,29 @@
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+import logging
 import os
+import time
+
+from backend.shared_state import shared_state
+from backend.user_cache import user_cache
+
+logger = logging.getLogger(__name__)
 
 # Security configuration
 SECRET_KEY = os.environ.get("SECRET_KEY", "your-secret-key-change-in-production")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 43200  # 30 days
+TOKEN_CACHE_SIZE = int(os.environ.get("TOKEN_CACHE_SIZE", 10000))
+USER_INVALIDATION_CHANNEL = "user_invalidated"
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 security = HTTPBearer()  # ✅ додано
+_token_cache: OrderedDict[str, dict] = OrderedDict()  # token -> verified claims, LRU
 
 def hash_password(password: str) -> str:
     trimmed = password[:72]  # обрізаємо до 72 символів
@@ -33,14 +44,46 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     return encoded_jwt
 
 def decode_token(token: str) -> dict:
+    # Verified claims are cached per token until they expire
+    payload = _token_cache.get(token)
+    if payload is not None:
+        if payload["exp"] > time.time():
+            _token_cache.move_to_end(token)
+            return payload
+        del _token_cache[token]
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
     except JWTError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
         )
+    if "exp" in payload:
+        _token_cache[token] = payload
+        if len(_token_cache) > TOKEN_CACHE_SIZE:
+            _token_cache.popitem(last=False)
+    return payload
+
+def invalidate_user_tokens(user_id: str):
+    """Drop cached claims of a user so their next request re-verifies the token"""
+    for token in [t for t, payload in _token_cache.items() if payload.get("sub") == user_id]:
+        del _token_cache[token]
+
+def _drop_user(message: dict):
+    user_cache.invalidate(message["user_id"])
+    invalidate_user_tokens(message["user_id"])
+
+shared_state.subscribe(USER_INVALIDATION_CHANNEL, _drop_user)
+
+async def invalidate_user(user_id: str):
+    """Drop a changed user's cached document and token claims in every worker"""
+    _drop_user({"user_id": user_id})
+    try:
+        await shared_state.publish(USER_INVALIDATION_CHANNEL, {"user_id": user_id})
+    except Exception as e:
+        # Other workers still pick the change up once their USER_CACHE_TTL runs out
+        logger.error(f"Failed to announce invalidation of user {user_id}: {e}")
 
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
     token = credentials.credentials
@@ -62,7 +105,10 @@ async def get_current_admin(current_user: dict = Depends(get_current_user)):
     return current_user
 
 async def get_approved_buyer(current_user: dict = Depends(get_current_user)):
-    if current_user.get("accreditation_status") != "approved":
+    # Checked against the stored user, not the token claim, so a revoked
+    # accreditation applies immediately instead of when the token expires
+    user = await user_cache.get(current_user["sub"])
+    if not user or user.get("accreditation_status") != "approved":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Accreditation not approved"
@@ -1,8 +1,13 @@
 import logging
 import os
-from fastapi import APIRouter, HTTPException, Depends, Header, status, Body
-from backend.auth import pwd_context, create_access_token, get_current_user, get_current_admin
+from fastapi import APIRouter, HTTPException, Depends, Header, Query, Request, Response, status, Body
+from pymongo.errors import DuplicateKeyError
+from backend.auth import create_access_token, get_current_user, get_current_admin, invalidate_user
+from backend.user_cache import user_cache
+from backend.password_pool import password_pool
+from backend.shared_state import shared_state
 from backend.database import users_collection
+from backend.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, NEXT_CURSOR_HEADER, fetch_page
 from backend.email_service import (
     send_accreditation_approved_email,
     send_accreditation_rejected_email
@@ -19,17 +24,10 @@ from backend.auth_models import (
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/auth", tags=["auth"])
 
-
-# ==========================================================
-# PASSWORD HELPERS
-# ==========================================================
-def get_password_hash(password: str) -> str:
-    trimmed = password[:72]
-    return pwd_context.hash(trimmed)
-
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    trimmed = plain_password[:72]
-    return pwd_context.verify(trimmed, hashed_password)
+# Failed logins per email and client address, counted across all workers
+# through shared_state; successful logins are never limited
+LOGIN_ATTEMPTS_LIMIT = int(os.environ.get("LOGIN_ATTEMPTS_LIMIT", 10))
+LOGIN_WINDOW_SECONDS = int(os.environ.get("LOGIN_WINDOW_SECONDS", 300))
 
 
 # ==========================================================
@@ -51,27 +49,63 @@ async def admin_reset_password(
     if not new_password:
         raise HTTPException(status_code=400, detail="Missing new_password")
 
-    hashed_password = get_password_hash(new_password)
+    hashed_password = await password_pool.hash(new_password)
 
-    result = await users_collection.update_one(
+    admin = await users_collection.find_one_and_update(
         {"email": "admin@graincompany.ua"},
-        {"$set": {"hashed_password": hashed_password}}
+        {"$set": {"hashed_password": hashed_password}},
+        projection={"_id": 0, "id": 1}
     )
 
-    if result.modified_count > 0:
+    if admin:
+        await invalidate_user(admin["id"])
         return {"status": "ok", "message": "Admin password updated"}
     else:
         return {"status": "error", "message": "Admin not found or unchanged"}
 
 
+# ==========================================================
+# REGISTRATION
+# ==========================================================
+@router.post("/register", response_model=UserResponse)
+async def register(user_data: UserRegister):
+    if await users_collection.find_one({"email": user_data.email}, {"_id": 1}):
+        raise HTTPException(status_code=400, detail="Email already registered")
+
+    user = User(
+        **user_data.dict(exclude={"password"}),
+        hashed_password=await password_pool.hash(user_data.password)
+    )
+    try:
+        await users_collection.insert_one(user.dict())
+    except DuplicateKeyError:
+        # Lost a race with a concurrent registration (unique email index)
+        raise HTTPException(status_code=400, detail="Email already registered")
+
+    logger.info(f"User registered: {user.email}")
+    return UserResponse(**user.dict())
+
+
 # ==========================================================
 # LOGIN
 # ==========================================================
 @router.post("/login", response_model=Token)
-async def login(login_data: UserLogin):
+async def login(login_data: UserLogin, request: Request):
+    # Checked before bcrypt, so a password-guessing flood costs no CPU. Keyed
+    # on the client too, so guessing from elsewhere cannot lock a buyer out
+    client_host = request.client.host if request.client else "unknown"
+    failures_key = f"login_failures:{login_data.email.lower()}:{client_host}"
+    if await shared_state.count(failures_key, LOGIN_WINDOW_SECONDS) >= LOGIN_ATTEMPTS_LIMIT:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many login attempts, try again later",
+            headers={"Retry-After": str(LOGIN_WINDOW_SECONDS)}
+        )
+
     user_doc = await users_collection.find_one({"email": login_data.email})
 
-    if not user_doc or not verify_password(login_data.password, user_doc["hashed_password"]):
+    if not user_doc or not await password_pool.verify(login_data.password, user_doc["hashed_password"]):
+        await shared_state.incr(failures_key, LOGIN_WINDOW_SECONDS)
         raise HTTPException(status_code=401, detail="Incorrect email or password")
 
     user = User(**user_doc)
@@ -95,18 +129,39 @@ async def login(login_data: UserLogin):
 # ==========================================================
 @router.get("/me", response_model=UserResponse)
 async def get_current_user_info(current_user: dict = Depends(get_current_user)):
-    user_doc = await users_collection.find_one({"id": current_user["sub"]})
+    user_doc = await user_cache.get(current_user["sub"])
     if not user_doc:
         raise HTTPException(status_code=404, detail="User not found")
     return UserResponse(**user_doc)
 
 
+@router.get("/password-pool")
+async def get_password_pool_stats(current_user: dict = Depends(get_current_admin)):
+    """bcrypt worker pool utilisation (Admin only)"""
+    return password_pool.stats()
+
+
 # ==========================================================
 # ACCREDITATION LOGIC
 # ==========================================================
 @router.get("/pending-accreditations", response_model=list[UserResponse])
-async def get_pending_accreditations(current_user: dict = Depends(get_current_admin)):
-    users = await users_collection.find({"accreditation_status": "pending"}).to_list(100)
+async def get_pending_accreditations(
+    response: Response,
+    cursor: str | None = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    current_user: dict = Depends(get_current_admin)
+):
+    # Oldest applications first; the next page's cursor is in X-Next-Cursor
+    users, next_cursor = await fetch_page(
+        users_collection,
+        {"accreditation_status": "pending"},
+        [("created_at", 1), ("id", 1)],
+        limit,
+        cursor,
+        projection={"_id": 0, "hashed_password": 0}
+    )
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     return [UserResponse(**user) for user in users]
 
 
@@ -126,10 +181,11 @@ async def update_accreditation(
         {"id": data.user_id},
         {"$set": {"accreditation_status": data.status}}
     )
+    await invalidate_user(data.user_id)
 
     if data.status == "approved":
-        send_accreditation_approved_email(user_doc["email"], user_doc["full_name"])
+        await send_accreditation_approved_email(user_doc["email"], user_doc["full_name"])
     else:
-        send_accreditation_rejected_email(user_doc["email"], user_doc["full_name"])
+        await send_accreditation_rejected_email(user_doc["email"], user_doc["full_name"])
 
     return {"success": True, "message": f"Accreditation {data.status}"}
@@ -0,0 +1,177 @@
+"""
+Automatic winner selection for auctions created with auto_award.
+
+When auctions complete (closed by the scheduler, or a dutch lot taken
+by a bid), award_auctions() takes the auto_award ones and awards each to
+its best bid, found for the whole batch with one aggregation over the
+auction_id_bid_amount_created_at index (equal bids go to the earliest).
+When any bid on a lot asked for only part of it, the lot is split with
+allocate_lot() instead, as POST /{auction_id}/allocate does: the best
+bid is still the recorded winner, and every winning bid gets its
+allocated_quantity and an email for its own share. The auctions are then
+updated with one bulk_write, the winners looked up with one $in query
+and their emails queued with one insert.
+
+Safe to run twice, concurrently or after a crash:
+
+- every award is a conditional update on status "completed" and carries
+  this run's award_run token, so only one run can claim an auction (an
+  admin's manual select-winner wins the same way)
+- awarded auctions stay winner_notified: False until their emails are
+  queued. Any later run records the same shares and queues those emails
+  again under per-auction (per-share for split lots) dedupe_keys, and
+  the outbox skips keys it already holds
+- the award is logged last, with the seq its update allocated, so
+  logging it again is a no-op and a failure leaves only a log gap
+- the scheduler sweeps for leftovers at startup, so auctions completed
+  just before a crash are still awarded
+"""
+
+import asyncio
+import logging
+import uuid
+
+from pymongo import UpdateOne
+
+from backend.allocation import allocate_lot, record_allocations
+from backend.auction_events import event_bus
+from backend.auction_log import auction_log
+from backend.database import auctions_collection, bids_collection, users_collection
+from backend.email_service import allocation_winner_details, auction_winner_details, send_auction_winner_emails
+
+logger = logging.getLogger(__name__)
+
+WINNING_BID_PIPELINE = [
+    {"$sort": {"auction_id": 1, "bid_amount": -1, "created_at": 1}},
+    {"$group": {
+        "_id": "$auction_id",
+        "id": {"$first": "$id"},
+        "user_id": {"$first": "$user_id"},
+        "bid_amount": {"$first": "$bid_amount"},
+    }},
+]
+
+
+async def award_auctions(
+    auction_ids: list[str] | None = None,
+    auctions=auctions_collection,
+    bids=bids_collection,
+    users=users_collection,
+    log=auction_log,
+) -> int:
+    """Award completed auto_award auctions (all of them, or among auction_ids); returns how many this run claimed"""
+    query = {"status": "completed", "auto_award": True, "award_run": None}
+    if auction_ids is not None:
+        query["id"] = {"$in": auction_ids}
+    candidates = {
+        auction["id"]: auction async for auction in auctions.find(query, {"_id": 0, "id": 1, "quantity": 1})
+    }
+
+    run = str(uuid.uuid4())
+    if candidates:
+        winning_bids = {
+            bid["_id"]: bid
+            async for bid in bids.aggregate([{"$match": {"auction_id": {"$in": list(candidates)}}}, *WINNING_BID_PIPELINE])
+        }
+        # Lots that some bid wants only part of are split, as POST /{auction_id}/allocate does
+        split = await bids.distinct("auction_id", {"auction_id": {"$in": list(candidates)}, "quantity": {"$ne": None}})
+        allocations = dict(zip(split, await asyncio.gather(*(allocate_lot(candidates[auction_id], bids) for auction_id in split))))
+        ops = []
+        for auction_id in candidates:
+            bid = winning_bids.get(auction_id)
+            if bid is None:
+                # Nothing to award; marked so later sweeps skip it
+                update = {"$set": {"award_run": run}}
+            else:
+                update = {
+                    "$set": {
+                        "winner_id": bid["user_id"],
+                        "winner_bid_id": bid["id"],
+                        "status": "winner_selected",
+                        "award_run": run,
+                        "winner_notified": False,
+                    },
+                    "$inc": {"log_seq": 1},
+                }
+                if auction_id in allocations:
+                    update["$set"]["allocated_quantity"] = round(
+                        sum(allocation.allocated_quantity for allocation in allocations[auction_id]), 3
+                    )
+            ops.append(UpdateOne({"id": auction_id, "status": "completed", "award_run": None}, update))
+        await auctions.bulk_write(ops, ordered=False)
+
+    claimed = await notify_winners(run, auction_ids, auctions, bids, users, log)
+    if claimed:
+        logger.info(f"Auto-award run {run}: {claimed} auctions awarded")
+    return claimed
+
+
+async def notify_winners(run: str, auction_ids: list[str] | None, auctions, bids, users, log=auction_log) -> int:
+    """Log and queue the emails of every awarded auction not yet notified; returns how many `run` awarded"""
+    query = {"status": "winner_selected", "auto_award": True, "winner_notified": False}
+    if auction_ids is not None:
+        query["id"] = {"$in": auction_ids}
+    awarded = [auction async for auction in auctions.find(query, {"_id": 0})]
+    if not awarded:
+        return 0
+
+    # Split lots: the shares are derived from the closed auction's bids, so
+    # a later run recomputes and records the same ones
+    split = [auction for auction in awarded if auction.get("allocated_quantity") is not None]
+    allocations = dict(zip(
+        [auction["id"] for auction in split],
+        await asyncio.gather(*(allocate_lot(auction, bids) for auction in split))
+    ))
+    await record_allocations([allocation for shares in allocations.values() for allocation in shares], bids)
+
+    winning_bids = {
+        bid["id"]: bid
+        async for bid in bids.find(
+            {"id": {"$in": [auction["winner_bid_id"] for auction in awarded]}},
+            {"_id": 0, "id": 1, "bid_amount": 1}
+        )
+    }
+    winners = {
+        user["id"]: user
+        async for user in users.find(
+            {"id": {"$in": [auction["winner_id"] for auction in awarded] + [
+                allocation.user_id for shares in allocations.values() for allocation in shares
+            ]}},
+            {"_id": 0, "id": 1, "email": 1, "full_name": 1}
+        )
+    }
+    notifications = []
+    dedupe_keys = []
+    for auction in awarded:
+        if auction["id"] in allocations:
+            for allocation in allocations[auction["id"]]:
+                user = winners.get(allocation.user_id)
+                if user:
+                    notifications.append((user["email"], user["full_name"], allocation_winner_details(auction, allocation)))
+                    dedupe_keys.append(f"auction_winner:{auction['id']}:{allocation.bid_id}")
+            continue
+        user = winners.get(auction["winner_id"])
+        bid = winning_bids.get(auction["winner_bid_id"])
+        if user and bid:
+            notifications.append((user["email"], user["full_name"], auction_winner_details(auction, bid)))
+            dedupe_keys.append(f"auction_winner:{auction['id']}")
+    await send_auction_winner_emails(notifications, dedupe_keys)
+    await auctions.update_many(
+        {"id": {"$in": [auction["id"] for auction in awarded]}},
+        {"$set": {"winner_notified": True}}
+    )
+
+    claimed = [auction for auction in awarded if auction["award_run"] == run]
+    for auction in claimed:
+        await event_bus.publish(
+            "status_changed", auction["id"], status="winner_selected",
+            winner_id=auction["winner_id"], winner_bid_id=auction["winner_bid_id"]
+        )
+    # Last, like every log write; winner_selected is final, so log_seq is still the award's seq
+    await asyncio.gather(*(
+        log.record(auction["id"], auction["log_seq"], [("status_changed", {
+            "status": "winner_selected", "winner_id": auction["winner_id"], "winner_bid_id": auction["winner_bid_id"],
+        })])
+        for auction in awarded if auction.get("log_seq")
+    ))
+    return len(claimed)
@@ -0,0 +1,143 @@
+from datetime import datetime, timedelta
+import logging
+
+from fastapi import HTTPException
+from pymongo import ReturnDocument
+
+from backend.auction_models import Bid
+from backend.database import auctions_collection, bids_collection
+from backend.metrics import BIDS
+
+logger = logging.getLogger(__name__)
+
+MIN_INCREMENT = 1.01  # every bid must beat the current price by at least 1%
+
+
+def acceptance_filter(bid: Bid, now: datetime) -> dict:
+    """Conditions under which `bid` may become the auction's new high bid"""
+    return {
+        "id": bid.auction_id,
+        "status": "active",
+        "end_date": {"$gt": now},
+        "$expr": {"$gte": [
+            bid.bid_amount,
+            {"$multiply": [
+                {"$ifNull": ["$highest_bid_amount", "$starting_price"]},
+                MIN_INCREMENT,
+            ]},
+        ]},
+    }
+
+
+def soft_close_until(auction_data) -> datetime | None:
+    """Latest end_date soft-close extensions may reach, fixed when the auction is created"""
+    if not auction_data.soft_close_seconds:
+        return None
+    return auction_data.end_date + timedelta(seconds=auction_data.soft_close_max_extension_seconds)
+
+
+def soft_close_window(terms: dict, now: datetime) -> tuple[datetime, datetime] | None:
+    """For a bid at `now`: (end dates it extends, end date it extends them to).
+
+    A bid placed when the auction ends within soft_close_seconds pushes
+    end_date out to soft_close_extension_seconds after the bid, but never
+    past soft_close_until. None when the auction has no soft close, or no
+    cap on it (created before the cap was required): never extend unbounded.
+    """
+    if not terms.get("soft_close_seconds") or terms.get("soft_close_until") is None:
+        return None
+    extended = min(now + timedelta(seconds=terms["soft_close_extension_seconds"]), terms["soft_close_until"])
+    return now + timedelta(seconds=terms["soft_close_seconds"]), extended
+
+
+def acceptance_update(bid: Bid, now: datetime, terms: dict | None = None) -> dict | list[dict]:
+    """The write that makes `bid` the auction's high bid, extending a soft close"""
+    window = soft_close_window(terms or {}, now)
+    if window is None:
+        return {
+            "$set": {"highest_bid_amount": bid.bid_amount, "highest_bid_id": bid.id},
+            "$inc": {"bid_count": 1, "log_seq": 1},
+        }
+    # Pipeline update: the extension depends on the end_date being replaced.
+    # The dates are computed here, so Mongo only has to compare them. An
+    # extension is an event of its own, so it takes a second log seq.
+    window_end, extended = window
+    extends = {"$and": [{"$lte": ["$end_date", window_end]}, {"$lt": ["$end_date", extended]}]}
+    return [{"$set": {
+        "highest_bid_amount": bid.bid_amount,
+        "highest_bid_id": bid.id,
+        "bid_count": {"$add": [{"$ifNull": ["$bid_count", 0]}, 1]},
+        "log_seq": {"$add": [{"$ifNull": ["$log_seq", 0]}, {"$cond": [extends, 2, 1]}]},
+        "end_date": {"$cond": [extends, extended, "$end_date"]},
+    }}]
+
+
+def end_date_after(auction: dict, terms: dict, now: datetime) -> datetime:
+    """end_date once acceptance_update has been applied to `auction` (as it was before the bid)"""
+    window = soft_close_window(terms, now)
+    if window is None or auction["end_date"] > window[0]:
+        return auction["end_date"]
+    return max(auction["end_date"], window[1])
+
+
+async def accept_bid(
+    bid: Bid,
+    now: datetime | None = None,
+    auctions=auctions_collection,
+    bids=bids_collection,
+    terms: dict | None = None,
+) -> dict:
+    """Accept a bid atomically, then store it.
+
+    The status, end_date and minimum-increment rules are all evaluated by
+    Mongo inside one conditional find_one_and_update on the auction document,
+    so two concurrent bidders can never both pass the check against the same
+    high bid. With a soft close in `terms`, the same update extends end_date.
+    Rejections cost one extra read to report the reason.
+    Returns the auction as it was just before this bid.
+    """
+    now = now or datetime.utcnow()
+    auction = await auctions.find_one_and_update(
+        acceptance_filter(bid, now),
+        acceptance_update(bid, now, terms),
+        projection={"_id": 0},
+        return_document=ReturnDocument.BEFORE
+    )
+    if auction is None:
+        await raise_rejection(bid, now, auctions)
+
+    await bids.insert_one(bid.dict())
+    BIDS.labels("accepted").inc()
+    return auction
+
+
+def english_minimum(auction: dict, now: datetime) -> tuple[float, str]:
+    """Lowest acceptable bid in an ascending auction, and the message when a bid is below it"""
+    current_price = auction.get("highest_bid_amount") or auction["starting_price"]
+    min_bid = current_price * MIN_INCREMENT
+    return min_bid, f"Ставка має бути мінімум на 1% вище поточної ціни. Мінімальна ставка: {min_bid:.2f} грн"
+
+
+async def raise_rejection(bid: Bid, now: datetime, auctions=auctions_collection, minimum=english_minimum):
+    """Explain why the conditional update in accept_bid (or an engine's) matched nothing"""
+    auction = await auctions.find_one({"id": bid.auction_id}, {"_id": 0})
+    if not auction:
+        BIDS.labels("rejected_not_found").inc()
+        raise HTTPException(status_code=404, detail="Auction not found")
+
+    if auction["status"] != "active":
+        BIDS.labels("rejected_not_active").inc()
+        raise HTTPException(status_code=400, detail="Auction is not active")
+
+    if now >= auction["end_date"]:
+        BIDS.labels("rejected_ended").inc()
+        raise HTTPException(status_code=400, detail="Auction has ended")
+
+    min_bid, detail = minimum(auction, now)
+    if bid.bid_amount < min_bid:
+        BIDS.labels("rejected_too_low").inc()
+        raise HTTPException(status_code=400, detail=detail)
+
+    # The auction changed between the update and this read
+    BIDS.labels("rejected_outbid").inc()
+    raise HTTPException(status_code=409, detail="Auction was outbid, refresh and try again")
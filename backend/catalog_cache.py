@@ -0,0 +1,112 @@
+"""
+In-process cache of the serialized grain catalog.
+
+The JSON body of GET /api/grains is built once and kept as bytes together
+with its ETag. Entries live CATALOG_CACHE_TTL seconds; after that a single
+find_one on a version counter in Mongo decides whether the cached bytes are
+still good. Writers call invalidate(), which bumps the counter and
+announces it on shared_state's "cache_invalidated" channel; workers that
+hear it recheck on their next request, the rest notice within one TTL.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass
+
+from backend.database import db, grains_collection
+from backend.shared_state import shared_state
+from backend.models import GrainResponse
+
+logger = logging.getLogger(__name__)
+
+CATALOG_CACHE_TTL = float(os.environ.get("CATALOG_CACHE_TTL", 30))
+INVALIDATION_CHANNEL = "cache_invalidated"
+
+cache_versions_collection = db.cache_versions
+
+
+@dataclass
+class CachedBody:
+    body: bytes
+    etag: str
+    version: int
+    expires_at: float
+
+
+class VersionedCache:
+    """Caches one serialized payload, keyed by a Mongo version counter"""
+
+    def __init__(self, key: str, loader, ttl: float = CATALOG_CACHE_TTL):
+        self.key = key
+        self._loader = loader
+        self._ttl = ttl
+        self._entry: CachedBody | None = None
+        self._lock = asyncio.Lock()
+        shared_state.subscribe(INVALIDATION_CHANNEL, self._on_invalidated)
+
+    async def get(self) -> CachedBody:
+        entry = self._entry
+        if entry and time.monotonic() < entry.expires_at:
+            return entry
+
+        # One request refreshes, concurrent ones wait for its result
+        async with self._lock:
+            entry = self._entry
+            if entry and time.monotonic() < entry.expires_at:
+                return entry
+
+            version = await self._current_version()
+            if entry and entry.version == version:
+                entry.expires_at = time.monotonic() + self._ttl
+                return entry
+
+            body = await self._loader()
+            entry = CachedBody(
+                body=body,
+                etag=f'"{hashlib.sha1(body).hexdigest()}"',
+                version=version,
+                expires_at=time.monotonic() + self._ttl,
+            )
+            self._entry = entry
+            logger.info(f"Cache {self.key} rebuilt at version {version}")
+            return entry
+
+    async def invalidate(self):
+        """Bump the shared version and tell every worker to recheck it"""
+        await cache_versions_collection.update_one(
+            {"_id": self.key},
+            {"$inc": {"version": 1}},
+            upsert=True
+        )
+        self._entry = None
+        try:
+            await shared_state.publish(INVALIDATION_CHANNEL, {"key": self.key})
+        except Exception as e:
+            # The version bump already happened; other workers catch up within one TTL
+            logger.error(f"Failed to announce invalidation of {self.key}: {e}")
+
+    def _on_invalidated(self, message: dict):
+        if message["key"] == self.key:
+            self._expire()
+
+    def _expire(self):
+        # Keeps the entry, so an unchanged version still avoids a rebuild
+        if self._entry:
+            self._entry.expires_at = 0
+
+    async def _current_version(self) -> int:
+        doc = await cache_versions_collection.find_one({"_id": self.key})
+        return doc["version"] if doc else 0
+
+
+async def load_catalog() -> bytes:
+    grains = await grains_collection.find({"active": True}, {"_id": 0}).to_list(100)
+    payload = [GrainResponse(**grain).dict() for grain in grains]
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+catalog_cache = VersionedCache("grains_catalog", load_catalog)
@@ -1,16 +1,197 @@
-from motor.motor_asyncio import AsyncIOMotorClient
-import os
+"""
+The MongoDB client and collections.
+
+The Motor client is created on first use (or by open() in the app
+lifespan) and closed by close() on shutdown. Modules import the
+collections below as usual. They are thin proxies that resolve to the
+current client's collection, so importing this module never connects and
+a client reopened after close() is picked up everywhere.
+
+Connection pool and wire settings come from the environment:
+
+- MONGO_MAX_POOL_SIZE / MONGO_MIN_POOL_SIZE: connections per server (default 100 / 0)
+- MONGO_WAIT_QUEUE_TIMEOUT_MS: how long a request waits for a free
+  connection before failing (default: wait indefinitely)
+- MONGO_READ_PREFERENCE: read preference of the *_read collections used by
+  read-only routes, e.g. secondaryPreferred (default primary)
+- MONGO_COMPRESSORS: wire compression, e.g. zstd,snappy,zlib (zstd needs
+  the zstandard package, snappy needs python-snappy)
+"""
+
 import asyncio
+import logging
+import os
+
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from pymongo import monitoring
+from pymongo.read_preferences import make_read_preference, read_pref_mode_from_name
+
+from backend.metrics import command_metrics, register_stats
+
+logger = logging.getLogger(__name__)
+
+MONGO_MAX_POOL_SIZE = int(os.environ.get("MONGO_MAX_POOL_SIZE", 100))
+MONGO_MIN_POOL_SIZE = int(os.environ.get("MONGO_MIN_POOL_SIZE", 0))
+MONGO_WAIT_QUEUE_TIMEOUT_MS = os.environ.get("MONGO_WAIT_QUEUE_TIMEOUT_MS")
+MONGO_READ_PREFERENCE = os.environ.get("MONGO_READ_PREFERENCE", "primary")
+MONGO_COMPRESSORS = os.environ.get("MONGO_COMPRESSORS")
+
+
+class PoolStats(monitoring.ConnectionPoolListener):
+    """Connection pool counters across all servers, fed by pymongo's pool events"""
+
+    def __init__(self):
+        self.open = 0
+        self.checked_out = 0
+        self.checkouts = 0
+        self.checkout_failures = 0
+        self.pool_clears = 0
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        self.pool_clears += 1
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        self.open += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self.open -= 1
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_check_out_failed(self, event):
+        # Includes requests that gave up after MONGO_WAIT_QUEUE_TIMEOUT_MS
+        self.checkout_failures += 1
+
+    def connection_checked_out(self, event):
+        self.checked_out += 1
+        self.checkouts += 1
+
+    def connection_checked_in(self, event):
+        self.checked_out -= 1
+
+    def stats(self) -> dict:
+        return {
+            "max_pool_size": MONGO_MAX_POOL_SIZE,
+            "min_pool_size": MONGO_MIN_POOL_SIZE,
+            "wait_queue_timeout_ms": int(MONGO_WAIT_QUEUE_TIMEOUT_MS) if MONGO_WAIT_QUEUE_TIMEOUT_MS else None,
+            "read_preference": MONGO_READ_PREFERENCE,
+            "compressors": MONGO_COMPRESSORS,
+            "open": self.open,
+            "checked_out": self.checked_out,
+            "idle": self.open - self.checked_out,
+            "checkouts": self.checkouts,
+            "checkout_failures": self.checkout_failures,
+            "pool_clears": self.pool_clears,
+        }
 
-mongo_url = os.environ["MONGO_URL"]
-db_name = os.environ.get("DB_NAME", "grain_app")
 
-print("Connecting to DB:", db_name)
-print("MONGO_URL:", os.environ.get("MONGO_URL"))
-print("DB_NAME:", os.environ.get("DB_NAME"))
+pool_stats = PoolStats()
+register_stats("mongo_pool", pool_stats.stats)
 
-client = AsyncIOMotorClient(mongo_url)
-db = client[db_name]
+
+class Database:
+    """Owns the Motor client; collections resolve through it"""
+
+    def __init__(self):
+        self.client: AsyncIOMotorClient | None = None
+        self.db: AsyncIOMotorDatabase | None = None
+        # Bumped on every open() so proxies know their cached collection is stale
+        self.generation = 0
+
+    def open(self) -> AsyncIOMotorDatabase:
+        if self.db is None:
+            options = {
+                "maxPoolSize": MONGO_MAX_POOL_SIZE,
+                "minPoolSize": MONGO_MIN_POOL_SIZE,
+                "event_listeners": [command_metrics, pool_stats],
+            }
+            if MONGO_WAIT_QUEUE_TIMEOUT_MS:
+                options["waitQueueTimeoutMS"] = int(MONGO_WAIT_QUEUE_TIMEOUT_MS)
+            if MONGO_COMPRESSORS:
+                options["compressors"] = MONGO_COMPRESSORS
+            db_name = os.environ.get("DB_NAME", "grain_app")
+            self.client = AsyncIOMotorClient(os.environ["MONGO_URL"], **options)
+            self.db = self.client[db_name]
+            self.generation += 1
+            logger.info(f"MongoDB client opened for database {db_name} (max pool size {MONGO_MAX_POOL_SIZE})")
+        return self.db
+
+    def close(self):
+        if self.client is None:
+            return
+        self.client.close()
+        self.client = None
+        self.db = None
+        logger.info("MongoDB client closed")
+
+
+database = Database()
+
+
+class LazyCollection:
+    """Stands in for a Motor collection until the client is open"""
+
+    def __init__(self, name: str, read_preference: str | None = None):
+        self._name = name
+        self._read_preference = read_preference
+        self._collection = None
+        self._generation = 0
+
+    def _resolve(self):
+        if self._collection is None or self._generation != database.generation:
+            collection = database.open()[self._name]
+            if self._read_preference and self._read_preference != "primary":
+                collection = collection.with_options(
+                    read_preference=make_read_preference(read_pref_mode_from_name(self._read_preference), None)
+                )
+            self._collection = collection
+            self._generation = database.generation
+        return self._collection
+
+    def __getattr__(self, attr):
+        return getattr(self._resolve(), attr)
+
+    def __repr__(self):
+        return f"LazyCollection({self._name!r})"
+
+
+class LazyDatabase:
+    """db.<name> and db[<name>] give lazy collections; everything else goes to the open database"""
+
+    def __getattr__(self, attr):
+        if attr.startswith("_") or hasattr(AsyncIOMotorDatabase, attr):
+            return getattr(database.open(), attr)
+        return LazyCollection(attr)
+
+    def __getitem__(self, name: str):
+        return LazyCollection(name)
+
+
+class LazyClient:
+    def __getattr__(self, attr):
+        database.open()
+        return getattr(database.client, attr)
+
+    def __getitem__(self, name: str):
+        database.open()
+        return database.client[name]
+
+
+client = LazyClient()
+db = LazyDatabase()
 
 # Collections
 grains_collection = db.grains
@@ -20,15 +201,24 @@ users_collection = db.users
 auctions_collection = db.auctions
 bids_collection = db.bids
 
-# --- TEMP: quick async test ---
+# Copies for read-only routes (listings, catalog, exports) that may be served
+# by secondaries; never use these on paths that read-modify-write
+grains_read_collection = LazyCollection("grains", MONGO_READ_PREFERENCE)
+orders_read_collection = LazyCollection("orders", MONGO_READ_PREFERENCE)
+contacts_read_collection = LazyCollection("contacts", MONGO_READ_PREFERENCE)
+auctions_read_collection = LazyCollection("auctions", MONGO_READ_PREFERENCE)
+bids_read_collection = LazyCollection("bids", MONGO_READ_PREFERENCE)
+
+
 async def test_connection():
     try:
-        # Список колекцій
         collections = await db.list_collection_names()
         print("MongoDB connected! Collections:", collections)
     except Exception as e:
         print("MongoDB connection failed:", e)
+    finally:
+        database.close()
+
 
-# Запускаємо тест, якщо файл виконується напряму
 if __name__ == "__main__":
     asyncio.run(test_connection())
@@ -0,0 +1,287 @@
+"""
+Persistent email outbox with a background dispatcher.
+
+Request handlers only insert into the email_outbox collection. The
+dispatcher started from the server startup hook claims pending messages in
+batches, sends them over one long-lived connection and retries failures
+with exponential backoff. Claims are made with a per-batch token, so
+several workers can run dispatchers against the same outbox.
+
+EMAIL_BACKEND selects the sender: "logging" (default, writes to the log) or
+"smtp" (SMTP_HOST, SMTP_PORT, SMTP_USERNAME, SMTP_PASSWORD, SMTP_STARTTLS,
+EMAIL_FROM). `python -m backend.smtp_stub` runs a local SMTP sink for testing.
+"""
+
+import asyncio
+import logging
+import os
+import smtplib
+import uuid
+from datetime import datetime, timedelta
+from email.message import EmailMessage
+
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from backend.database import db
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = int(os.environ.get("EMAIL_BATCH_SIZE", 50))
+POLL_INTERVAL_SECONDS = float(os.environ.get("EMAIL_POLL_INTERVAL", 5))
+MAX_ATTEMPTS = int(os.environ.get("EMAIL_MAX_ATTEMPTS", 8))
+BACKOFF_BASE_SECONDS = 30
+BACKOFF_MAX_SECONDS = 3600
+# Messages stuck in "sending" this long belong to a dispatcher that died
+CLAIM_TIMEOUT = timedelta(minutes=10)
+DUPLICATE_KEY = 11000
+
+email_outbox_collection = db.email_outbox
+
+
+def _outbox_message(to_email: str, subject: str, body: str, dedupe_key: str | None = None) -> dict:
+    now = datetime.utcnow()
+    message = {
+        "id": str(uuid.uuid4()),
+        "to": to_email,
+        "subject": subject,
+        "body": body,
+        "status": "pending",  # pending, sending, sent, failed
+        "attempts": 0,
+        "next_attempt_at": now,
+        "created_at": now,
+        "sent_at": None,
+        "last_error": None,
+        "claim": None,
+    }
+    if dedupe_key is not None:
+        # Unique (see backend/indexes.py): queueing the same message twice is a no-op
+        message["dedupe_key"] = dedupe_key
+    return message
+
+
+async def enqueue_email(to_email: str, subject: str, body: str):
+    """Store a message for the dispatcher and return immediately"""
+    await email_outbox_collection.insert_one(_outbox_message(to_email, subject, body))
+    dispatcher.wake()
+
+
+async def enqueue_emails(messages: list[tuple[str, str, str]], dedupe_keys: list[str] | None = None):
+    """Store several (to, subject, body) messages with one insert.
+
+    With dedupe_keys (one per message), messages already queued under the
+    same key are skipped, so a retried batch is not sent twice.
+    """
+    if not messages:
+        return
+    keys = dedupe_keys or [None] * len(messages)
+    try:
+        await email_outbox_collection.insert_many(
+            [_outbox_message(*message, dedupe_key=key) for message, key in zip(messages, keys)], ordered=False
+        )
+    except BulkWriteError as e:
+        if not dedupe_keys or any(error["code"] != DUPLICATE_KEY for error in e.details["writeErrors"]):
+            raise
+    dispatcher.wake()
+
+
+class LoggingEmailSender:
+    """Test sender - logs every message to the console"""
+
+    async def send_batch(self, messages: list[dict]) -> list[Exception | None]:
+        for message in messages:
+            logger.info(f"""
+    ==================== EMAIL ====================
+    To: {message['to']}
+    Subject: {message['subject']}
+    Time: {datetime.utcnow().isoformat()}
+
+    {message['body']}
+    ===============================================
+    """)
+        return [None] * len(messages)
+
+    async def close(self):
+        pass
+
+
+class SMTPEmailSender:
+    """Sends over one SMTP connection that is kept open between batches"""
+
+    def __init__(self):
+        self.host = os.environ.get("SMTP_HOST", "localhost")
+        self.port = int(os.environ.get("SMTP_PORT", 1025))
+        self.username = os.environ.get("SMTP_USERNAME")
+        self.password = os.environ.get("SMTP_PASSWORD")
+        self.starttls = os.environ.get("SMTP_STARTTLS", "false").lower() == "true"
+        self.from_addr = os.environ.get("EMAIL_FROM", "noreply@graincompany.ua")
+        self._smtp: smtplib.SMTP | None = None
+
+    async def send_batch(self, messages: list[dict]) -> list[Exception | None]:
+        # smtplib is blocking; the whole batch runs on one thread
+        return await asyncio.to_thread(self._send_batch, messages)
+
+    async def close(self):
+        await asyncio.to_thread(self._disconnect)
+
+    def _send_batch(self, messages: list[dict]) -> list[Exception | None]:
+        results = []
+        for message in messages:
+            try:
+                self._connection().send_message(self._build(message))
+                results.append(None)
+            except smtplib.SMTPRecipientsRefused as e:
+                results.append(e)
+            except (smtplib.SMTPException, OSError) as e:
+                # Connection-level failure: reconnect for the next message
+                self._disconnect()
+                results.append(e)
+        return results
+
+    def _connection(self) -> smtplib.SMTP:
+        if self._smtp is not None:
+            try:
+                self._smtp.noop()
+                return self._smtp
+            except (smtplib.SMTPException, OSError):
+                self._disconnect()
+        smtp = smtplib.SMTP(self.host, self.port, timeout=30)
+        if self.starttls:
+            smtp.starttls()
+        if self.username:
+            smtp.login(self.username, self.password)
+        self._smtp = smtp
+        return smtp
+
+    def _disconnect(self):
+        if self._smtp is None:
+            return
+        try:
+            self._smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            pass
+        self._smtp = None
+
+    def _build(self, message: dict) -> EmailMessage:
+        email = EmailMessage()
+        email["From"] = self.from_addr
+        email["To"] = message["to"]
+        email["Subject"] = message["subject"]
+        email.set_content(message["body"])
+        return email
+
+
+def backoff_delay(attempts: int) -> timedelta:
+    return timedelta(seconds=min(BACKOFF_BASE_SECONDS * 2 ** (attempts - 1), BACKOFF_MAX_SECONDS))
+
+
+class EmailDispatcher:
+    def __init__(self, sender, collection=email_outbox_collection):
+        self.sender = sender
+        self._collection = collection
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    async def start(self):
+        # A fresh event each start: an asyncio.Event is bound to the loop it first waited on
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run(), name="email-dispatcher")
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        await self.sender.close()
+
+    def wake(self):
+        self._wakeup.set()
+
+    async def dispatch_once(self) -> int:
+        """Claim and send one batch; returns the number of messages handled"""
+        now = datetime.utcnow()
+        await self._release_stale_claims(now)
+
+        pending = await self._collection.find(
+            {"status": "pending", "next_attempt_at": {"$lte": now}},
+            {"_id": 0, "id": 1}
+        ).sort("next_attempt_at", 1).limit(BATCH_SIZE).to_list(BATCH_SIZE)
+        if not pending:
+            return 0
+
+        claim = str(uuid.uuid4())
+        await self._collection.update_many(
+            {"id": {"$in": [m["id"] for m in pending]}, "status": "pending"},
+            {"$set": {"status": "sending", "claim": claim, "claimed_at": now}}
+        )
+        # Only what this dispatcher actually won; another worker may have claimed the rest
+        messages = await self._collection.find({"claim": claim}, {"_id": 0}).to_list(BATCH_SIZE)
+        if not messages:
+            return 0
+
+        try:
+            results = await self.sender.send_batch(messages)
+        except Exception as e:
+            results = [e] * len(messages)
+
+        ops = []
+        sent_at = datetime.utcnow()
+        for message, error in zip(messages, results):
+            if error is None:
+                ops.append(UpdateOne(
+                    {"id": message["id"]},
+                    {"$set": {"status": "sent", "sent_at": sent_at, "claim": None}}
+                ))
+                continue
+            attempts = message["attempts"] + 1
+            exhausted = attempts >= MAX_ATTEMPTS
+            ops.append(UpdateOne(
+                {"id": message["id"]},
+                {"$set": {
+                    "status": "failed" if exhausted else "pending",
+                    "attempts": attempts,
+                    "next_attempt_at": sent_at + backoff_delay(attempts),
+                    "last_error": str(error),
+                    "claim": None,
+                }}
+            ))
+            log = logger.error if exhausted else logger.warning
+            log(f"Email {message['id']} to {message['to']} failed (attempt {attempts}): {error}")
+
+        await self._collection.bulk_write(ops, ordered=False)
+        return len(messages)
+
+    async def _release_stale_claims(self, now: datetime):
+        await self._collection.update_many(
+            {"status": "sending", "claimed_at": {"$lt": now - CLAIM_TIMEOUT}},
+            {"$set": {"status": "pending", "claim": None}}
+        )
+
+    async def _run(self):
+        while True:
+            self._wakeup.clear()
+            try:
+                handled = await self.dispatch_once()
+            except Exception as e:
+                logger.error(f"Email dispatcher failed: {e}")
+                handled = 0
+            if handled >= BATCH_SIZE:
+                continue  # more may be waiting
+            try:
+                # Local enqueues wake us at once; the poll covers other workers and retries
+                await asyncio.wait_for(self._wakeup.wait(), timeout=POLL_INTERVAL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+
+
+def _create_sender():
+    if os.environ.get("EMAIL_BACKEND", "logging") == "smtp":
+        return SMTPEmailSender()
+    return LoggingEmailSender()
+
+
+dispatcher = EmailDispatcher(_create_sender())
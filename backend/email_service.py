@@ -1,22 +1,13 @@
 import logging
-from datetime import datetime
+
+from backend.auction_engines import winning_price
+from backend.email_outbox import enqueue_email, enqueue_emails
 
 logger = logging.getLogger(__name__)
 
-def send_email(to_email: str, subject: str, body: str):
-    """Test email service - logs to console"""
-    logger.info(f"""
-    ==================== EMAIL ====================
-    To: {to_email}
-    Subject: {subject}
-    Time: {datetime.utcnow().isoformat()}
-    
-    {body}
-    ===============================================
-    """)
-    return True
+# Helpers only queue the message in the outbox; backend.email_outbox delivers it
 
-def send_accreditation_approved_email(user_email: str, user_name: str):
+async def send_accreditation_approved_email(user_email: str, user_name: str):
     subject = "Акредитація схвалена - GrainCompany"
     body = f"""
     Вітаємо, {user_name}!
@@ -27,9 +18,9 @@ def send_accreditation_approved_email(user_email: str, user_name: str):
     З повагою,
     Команда GrainCompany
     """
-    send_email(user_email, subject, body)
+    await enqueue_email(user_email, subject, body)
 
-def send_accreditation_rejected_email(user_email: str, user_name: str):
+async def send_accreditation_rejected_email(user_email: str, user_name: str):
     subject = "Акредитація відхилена - GrainCompany"
     body = f"""
     Шановний {user_name},
@@ -40,9 +31,9 @@ def send_accreditation_rejected_email(user_email: str, user_name: str):
     З повагою,
     Команда GrainCompany
     """
-    send_email(user_email, subject, body)
+    await enqueue_email(user_email, subject, body)
 
-def send_auction_winner_email(user_email: str, user_name: str, auction_details: dict):
+def auction_winner_email(user_email: str, user_name: str, auction_details: dict) -> tuple[str, str, str]:
     subject = "Ви перемогли в аукціоні! - GrainCompany"
     body = f"""
     Вітаємо, {user_name}!
@@ -59,4 +50,27 @@ def send_auction_winner_email(user_email: str, user_name: str, auction_details:
     З повагою,
     Команда GrainCompany
     """
-    send_email(user_email, subject, body)
+    return user_email, subject, body
+
+async def send_auction_winner_email(user_email: str, user_name: str, auction_details: dict):
+    await enqueue_email(*auction_winner_email(user_email, user_name, auction_details))
+
+async def send_auction_winner_emails(winners: list[tuple[str, str, dict]], dedupe_keys: list[str] | None = None):
+    """Queue (email, name, auction_details) winner notifications with one insert"""
+    await enqueue_emails([auction_winner_email(*winner) for winner in winners], dedupe_keys)
+
+def auction_winner_details(auction: dict, bid: dict) -> dict:
+    return {
+        "grain_type": auction["grain_type"],
+        # Auctions carry a category rather than a quality grade
+        "quality": auction.get("quality") or auction.get("category"),
+        "quantity": auction["quantity"],
+        "winning_bid": winning_price(auction, bid)
+    }
+
+def allocation_winner_details(auction: dict, allocation) -> dict:
+    """auction_winner_details for one winning share of a split lot"""
+    return {
+        **auction_winner_details(auction, {"id": allocation.bid_id, "bid_amount": allocation.bid_amount}),
+        "quantity": allocation.allocated_quantity
+    }
@@ -0,0 +1,141 @@
+"""
+Back-office exports of orders, bids and contacts.
+
+Rows are streamed straight from a Motor cursor as NDJSON or CSV (optionally
+gzipped on the fly), so memory use stays flat however many rows match.
+"""
+
+import csv
+import io
+import json
+import logging
+import zlib
+from datetime import datetime
+from enum import Enum
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+
+from backend.auth import get_current_admin
+from backend.database import bids_read_collection, contacts_read_collection, orders_read_collection
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/admin/export", tags=["export"])
+
+CURSOR_BATCH_SIZE = 1000
+CHUNK_SIZE = 64 * 1024  # bytes buffered before a chunk is sent
+
+EXPORTS = {
+    "orders": (orders_read_collection, [
+        "id", "created_at", "grain_type", "grain_id", "quantity",
+        "customer_name", "customer_phone", "customer_email", "comment",
+    ]),
+    "bids": (bids_read_collection, [
+        "id", "created_at", "auction_id", "bid_amount", "payment_type",
+        "delivery_location", "user_id", "user_name", "user_company",
+    ]),
+    "contacts": (contacts_read_collection, [
+        "id", "created_at", "name", "email", "phone", "message",
+    ]),
+}
+
+
+class ExportFormat(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+def _serialize(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+async def encode_rows(cursor, columns: list[str], fmt: ExportFormat):
+    """Yield text chunks of roughly CHUNK_SIZE from a cursor of documents"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer) if fmt == ExportFormat.csv else None
+    if writer:
+        writer.writerow(columns)
+
+    async for doc in cursor:
+        row = [_serialize(doc.get(column)) for column in columns]
+        if writer:
+            writer.writerow(row)
+        else:
+            buffer.write(json.dumps(dict(zip(columns, row)), ensure_ascii=False))
+            buffer.write("\n")
+        if buffer.tell() >= CHUNK_SIZE:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+async def encode_bytes(chunks, gzip: bool):
+    """Encode text chunks as UTF-8, gzip-compressing them on the fly if asked"""
+    compressor = zlib.compressobj(wbits=31) if gzip else None  # wbits=31: gzip container
+    async for chunk in chunks:
+        data = chunk.encode("utf-8")
+        if compressor:
+            data = compressor.compress(data)
+        if data:
+            yield data
+    if compressor:
+        yield compressor.flush()
+
+
+def export_cursor(
+    dataset: str,
+    date_from: datetime | None = None,
+    date_to: datetime | None = None,
+    auction_id: str | None = None,
+):
+    collection, columns = EXPORTS[dataset]
+    query = {}
+    if date_from or date_to:
+        query["created_at"] = {}
+        if date_from:
+            query["created_at"]["$gte"] = date_from
+        if date_to:
+            query["created_at"]["$lt"] = date_to
+    if auction_id:
+        query["auction_id"] = auction_id
+    projection = {"_id": 0, **{column: 1 for column in columns}}
+    return collection.find(query, projection).sort("created_at", 1).batch_size(CURSOR_BATCH_SIZE)
+
+
+@router.get("/{dataset}")
+async def export_dataset(
+    dataset: str,
+    format: ExportFormat = ExportFormat.ndjson,
+    gzip: bool = False,
+    date_from: datetime | None = None,
+    date_to: datetime | None = None,
+    auction_id: str | None = None,
+    current_user: dict = Depends(get_current_admin)
+):
+    """Stream orders, bids or contacts as NDJSON or CSV (Admin only)"""
+    if dataset not in EXPORTS:
+        raise HTTPException(status_code=404, detail="Unknown export")
+    if auction_id and dataset != "bids":
+        raise HTTPException(status_code=400, detail="auction_id filter applies to bids only")
+
+    _, columns = EXPORTS[dataset]
+    cursor = export_cursor(dataset, date_from, date_to, auction_id)
+    body = encode_bytes(encode_rows(cursor, columns, format), gzip)
+
+    filename = f"{dataset}-{datetime.utcnow():%Y%m%d-%H%M%S}.{format.value}"
+    media_type = "text/csv" if format == ExportFormat.csv else "application/x-ndjson"
+    if gzip:
+        filename += ".gz"
+        media_type = "application/gzip"
+
+    logger.info(f"Export of {dataset} ({format.value}) started by {current_user['email']}")
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
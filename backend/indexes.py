@@ -0,0 +1,204 @@
+"""
+Index definitions for every query shape used by the routes.
+
+ensure_indexes() runs from the startup migrations whenever INDEXES changes
+(see backend/migrations.py); create_indexes is a no-op for indexes that
+already exist, so it is always safe to call again.
+
+Check that no route query falls back to a collection scan:
+
+    python -m backend.indexes --check
+
+tests/test_indexes.py runs the same check whenever the tests are pointed
+at a real mongod.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import sys
+from datetime import datetime
+
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import OperationFailure
+
+from backend.database import db
+
+logger = logging.getLogger(__name__)
+
+INDEXES = {
+    "users": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("email", ASCENDING)], name="email_unique", unique=True),
+        IndexModel(
+            [("accreditation_status", ASCENDING), ("created_at", ASCENDING), ("id", ASCENDING)],
+            name="accreditation_status_created_at_id"
+        ),
+    ],
+    "auctions": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("status", ASCENDING), ("start_date", ASCENDING)], name="status_start_date"),
+        IndexModel([("status", ASCENDING), ("end_date", ASCENDING)], name="status_end_date"),
+        # Keyset pagination of the listing, unfiltered and per filter
+        IndexModel([("created_at", DESCENDING), ("id", DESCENDING)], name="created_at_id"),
+        IndexModel(
+            [("status", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)],
+            name="status_created_at_id"
+        ),
+        IndexModel(
+            [("grain_id", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)],
+            name="grain_id_created_at_id"
+        ),
+    ],
+    "bids": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel(
+            [("auction_id", ASCENDING), ("bid_amount", DESCENDING), ("id", DESCENDING)],
+            name="auction_id_bid_amount_id"
+        ),
+        # Lot allocation: price, then time
+        IndexModel(
+            [("auction_id", ASCENDING), ("bid_amount", DESCENDING), ("created_at", ASCENDING)],
+            name="auction_id_bid_amount_created_at"
+        ),
+        # Exports, by date and per auction
+        IndexModel([("created_at", ASCENDING)], name="created_at"),
+        IndexModel([("auction_id", ASCENDING), ("created_at", ASCENDING)], name="auction_id_created_at"),
+    ],
+    "grains": [
+        IndexModel([("active", ASCENDING)], name="active"),
+    ],
+    "orders": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("created_at", ASCENDING)], name="created_at"),
+    ],
+    "contacts": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("created_at", ASCENDING)], name="created_at"),
+    ],
+    "email_outbox": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        IndexModel([("status", ASCENDING), ("next_attempt_at", ASCENDING)], name="status_next_attempt_at"),
+        IndexModel([("claim", ASCENDING)], name="claim"),
+        IndexModel(
+            [("dedupe_key", ASCENDING)], name="dedupe_key_unique", unique=True,
+            partialFilterExpression={"dedupe_key": {"$exists": True}}
+        ),
+    ],
+    "auction_log": [
+        IndexModel([("auction_id", ASCENDING), ("seq", ASCENDING)], name="auction_id_seq_unique", unique=True),
+    ],
+    "auction_log_snapshots": [
+        IndexModel([("auction_id", ASCENDING), ("seq", ASCENDING)], name="auction_id_seq_unique", unique=True),
+    ],
+    # Also what lets only one worker store each seq of an order book
+    "order_book_events": [
+        IndexModel([("book_id", ASCENDING), ("seq", ASCENDING)], name="book_id_seq_unique", unique=True),
+    ],
+    # Shared state (SHARED_STATE_BACKEND=mongo): messages are only needed
+    # while workers tail them, counters until their window closes
+    "shared_messages": [
+        IndexModel([("created_at", ASCENDING)], name="created_at_ttl", expireAfterSeconds=3600),
+    ],
+    "shared_counters": [
+        IndexModel([("expires_at", ASCENDING)], name="expires_at_ttl", expireAfterSeconds=0),
+    ],
+}
+
+# (collection, filter, sort) for each indexed query the routes and background tasks run.
+_SAMPLE_DATE = datetime(2025, 1, 1)
+QUERY_SHAPES = [
+    ("grains", {"active": True}, None),
+    ("users", {"email": "buyer@example.com"}, None),
+    ("users", {"id": "user-id"}, None),
+    ("users", {"accreditation_status": "pending"}, {"created_at": 1, "id": 1}),
+    ("auctions", {"id": "auction-id"}, None),
+    ("auctions", {}, {"created_at": -1, "id": -1}),
+    ("auctions", {"status": "active"}, {"created_at": -1, "id": -1}),
+    ("auctions", {"grain_id": "1", "created_at": {"$gte": _SAMPLE_DATE}}, {"created_at": -1, "id": -1}),
+    ("auctions", {"status": {"$in": ["pending", "active"]}}, None),
+    ("auctions", {"status": "pending", "start_date": {"$lte": _SAMPLE_DATE}}, None),
+    ("auctions", {"status": "active", "end_date": {"$lte": _SAMPLE_DATE}}, None),
+    ("bids", {"auction_id": "auction-id"}, {"bid_amount": -1, "id": -1}),
+    ("bids", {"auction_id": "auction-id"}, {"bid_amount": -1, "created_at": 1}),
+    ("bids", {"id": "bid-id"}, None),
+    ("bids", {"created_at": {"$gte": _SAMPLE_DATE}}, {"created_at": 1}),
+    ("bids", {"auction_id": "auction-id"}, {"created_at": 1}),
+    ("orders", {"created_at": {"$gte": _SAMPLE_DATE}}, {"created_at": 1}),
+    ("contacts", {"created_at": {"$gte": _SAMPLE_DATE}}, {"created_at": 1}),
+    ("email_outbox", {"status": "pending", "next_attempt_at": {"$lte": _SAMPLE_DATE}}, {"next_attempt_at": 1}),
+    ("email_outbox", {"claim": "claim-id"}, None),
+    ("auction_log", {"auction_id": "auction-id", "seq": {"$gt": 0}}, {"seq": 1}),
+    ("auction_log_snapshots", {"auction_id": "auction-id", "at": {"$lte": _SAMPLE_DATE}}, {"seq": -1}),
+    ("order_book_events", {"book_id": "book-id", "seq": {"$gt": 0}}, {"seq": 1}),
+]
+
+
+async def ensure_indexes(database=db) -> bool:
+    """Create every declared index; existing ones are left untouched.
+
+    Returns False if any collection's indexes could not be created.
+    """
+    ok = True
+    for collection_name, models in INDEXES.items():
+        try:
+            await database[collection_name].create_indexes(models)
+        except OperationFailure as e:
+            # e.g. duplicate emails blocking a unique index: log and keep serving
+            logger.error(f"Failed to create indexes on {collection_name}: {e}")
+            ok = False
+    logger.info("Indexes ensured")
+    return ok
+
+
+def indexes_fingerprint() -> str:
+    """Hash of the declared indexes, to tell when they need ensuring again"""
+    declared = {name: [model.document for model in models] for name, models in INDEXES.items()}
+    return hashlib.sha1(json.dumps(declared, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def _plan_stages(plan: dict) -> list[str]:
+    stages = [plan.get("stage")]
+    for key in ("inputStage", "queryPlan"):
+        if key in plan:
+            stages += _plan_stages(plan[key])
+    for child in plan.get("inputStages", []):
+        stages += _plan_stages(child)
+    return stages
+
+
+async def explain_stages(collection_name: str, query: dict, sort: dict | None = None, database=db) -> list[str]:
+    """Stages of the winning plan for a find, e.g. ['FETCH', 'IXSCAN']"""
+    find = {"find": collection_name, "filter": query}
+    if sort:
+        find["sort"] = sort
+    explained = await database.command({"explain": find, "verbosity": "queryPlanner"})
+    return _plan_stages(explained["queryPlanner"]["winningPlan"])
+
+
+async def find_collection_scans(database=db) -> list[str]:
+    """Describe every query shape whose winning plan contains a COLLSCAN"""
+    offenders = []
+    for collection_name, query, sort in QUERY_SHAPES:
+        stages = await explain_stages(collection_name, query, sort, database)
+        if "COLLSCAN" in stages:
+            offenders.append(f"{collection_name}.find({query}, sort={sort}): {' -> '.join(stages)}")
+    return offenders
+
+
+async def _main(check: bool) -> int:
+    await ensure_indexes()
+    if not check:
+        return 0
+    offenders = await find_collection_scans()
+    for offender in offenders:
+        print(f"❌ COLLSCAN: {offender}")
+    if not offenders:
+        print(f"✅ All {len(QUERY_SHAPES)} query shapes use an index")
+    return 1 if offenders else 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(asyncio.run(_main("--check" in sys.argv)))
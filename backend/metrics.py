@@ -0,0 +1,171 @@
+"""
+Prometheus metrics for the API.
+
+- HTTP: per-route latency histograms, request counts by status and
+  in-flight gauges, labelled with the route template (/api/auctions/{auction_id})
+  so ids never become label values
+- Mongo: command latency per collection and command, fed by a pymongo
+  CommandListener registered on the Motor client
+- Bids: accepted and rejected counts, by rejection reason
+- Auction log: failed appends, each a gap that verify() reports
+- Event loop: lag between when a timer was due and when it ran
+- Anything with a stats() dict, e.g. the password pool, as gauges
+
+Served by GET /metrics in server.py.
+"""
+
+import asyncio
+import logging
+import os
+import time
+
+from prometheus_client import Counter, Gauge, Histogram, REGISTRY
+from prometheus_client.core import GaugeMetricFamily
+from pymongo import monitoring
+from starlette.routing import Match
+
+logger = logging.getLogger(__name__)
+
+LOOP_LAG_INTERVAL_SECONDS = float(os.environ.get("LOOP_LAG_INTERVAL_SECONDS", 0.5))
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "HTTP request latency", ["method", "route"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+REQUESTS = Counter("http_requests_total", "HTTP requests by response status", ["method", "route", "status"])
+REQUESTS_IN_FLIGHT = Gauge("http_requests_in_flight", "HTTP requests being handled", ["method", "route"])
+
+MONGO_COMMAND_LATENCY = Histogram(
+    "mongo_command_duration_seconds", "MongoDB command latency", ["collection", "command"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1),
+)
+MONGO_COMMAND_FAILURES = Counter("mongo_command_failures_total", "Failed MongoDB commands", ["collection", "command"])
+
+BIDS = Counter("auction_bids_total", "Bids by outcome", ["outcome"])
+AUCTION_LOG_FAILURES = Counter("auction_log_append_failures_total", "Auction log entries that failed to be written")
+
+EVENT_LOOP_LAG = Histogram(
+    "event_loop_lag_seconds", "Delay of a timer callback behind its deadline",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1),
+)
+
+
+def route_template(scope) -> str:
+    """Path template of the route that will handle this request"""
+    partial = None
+    for route in scope["app"].router.routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.path
+        if match == Match.PARTIAL and partial is None:
+            # Path matches but the method does not (a 405), unless a later route takes it
+            partial = route.path
+    return partial or "unmatched"
+
+
+class MetricsMiddleware:
+    """Times every HTTP request, streaming responses until their last chunk"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = route_template(scope)
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        in_flight = REQUESTS_IN_FLIGHT.labels(method, route)
+        in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            in_flight.dec()
+            REQUEST_LATENCY.labels(method, route).observe(time.perf_counter() - started)
+            REQUESTS.labels(method, route, str(status)).inc()
+
+
+class CommandMetrics(monitoring.CommandListener):
+    """Records every command Motor sends, per collection and command name.
+
+    pymongo calls these from its own threads; the collection name is only
+    on the started event, so it is held until the matching reply.
+    """
+
+    def __init__(self):
+        self._collections = {}
+
+    def started(self, event):
+        if event.command_name == "getMore":
+            collection = event.command.get("collection")
+        else:
+            collection = event.command.get(event.command_name)
+        self._collections[(event.connection_id, event.request_id)] = collection if isinstance(collection, str) else ""
+
+    def succeeded(self, event):
+        collection = self._collections.pop((event.connection_id, event.request_id), "")
+        MONGO_COMMAND_LATENCY.labels(collection, event.command_name).observe(event.duration_micros / 1e6)
+
+    def failed(self, event):
+        collection = self._collections.pop((event.connection_id, event.request_id), "")
+        MONGO_COMMAND_LATENCY.labels(collection, event.command_name).observe(event.duration_micros / 1e6)
+        MONGO_COMMAND_FAILURES.labels(collection, event.command_name).inc()
+
+
+class StatsCollector:
+    """Exposes the numeric values of stats() as <prefix>_<key> gauges at scrape time"""
+
+    def __init__(self, prefix: str, stats):
+        self.prefix = prefix
+        self.stats = stats
+
+    def collect(self):
+        for key, value in self.stats().items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                yield GaugeMetricFamily(f"{self.prefix}_{key}", f"{self.prefix} {key}", value=value)
+
+
+def register_stats(prefix: str, stats):
+    REGISTRY.register(StatsCollector(prefix, stats))
+
+
+class LoopLagMonitor:
+    """Sleeps for a fixed interval and records how late it wakes up"""
+
+    def __init__(self, interval: float = LOOP_LAG_INTERVAL_SECONDS):
+        self.interval = interval
+        self._task: asyncio.Task | None = None
+
+    async def start(self):
+        self._task = asyncio.create_task(self._run(), name="loop-lag-monitor")
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            due = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            EVENT_LOOP_LAG.observe(max(0.0, loop.time() - due))
+
+
+command_metrics = CommandMetrics()
+loop_lag_monitor = LoopLagMonitor()
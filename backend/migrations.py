@@ -0,0 +1,113 @@
+"""
+One-shot startup migrations: indexes, seed grains and the default admin.
+
+The applied schema version and the fingerprint of the declared indexes live
+in one document of the migrations collection. A worker that finds it up to
+date does nothing beyond that single read. Otherwise it takes a lease on the
+same document, applies what is missing and releases it. Workers that find
+the lease held skip the work and carry on starting up, so a fleet scaling
+out runs the seeding (and its bcrypt hash) once, not once per worker.
+
+Each migration must be idempotent: a worker that dies halfway leaves the
+lease to expire and the next one to run the migration again.
+"""
+
+import logging
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta
+
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from backend.catalog_cache import catalog_cache
+from backend.database import db, grains_collection, users_collection
+from backend.indexes import ensure_indexes, indexes_fingerprint
+from backend.password_pool import password_pool
+from backend.seed_data import INITIAL_GRAINS
+
+logger = logging.getLogger(__name__)
+
+MIGRATION_LEASE_SECONDS = int(os.environ.get("MIGRATION_LEASE_SECONDS", 300))
+STATE_ID = "schema"
+
+migrations_collection = db.migrations
+
+
+async def seed_grains():
+    if await grains_collection.count_documents({}) == 0:
+        logger.info("Seeding grains database...")
+        await grains_collection.insert_many(INITIAL_GRAINS)
+        logger.info(f"Seeded {len(INITIAL_GRAINS)} grains")
+        await catalog_cache.invalidate()
+
+
+async def create_default_admin():
+    admin_exists = await users_collection.find_one({"email": "admin@graincompany.ua"}, {"_id": 1})
+    if not admin_exists:
+        logger.info("Creating default admin user...")
+        from backend.auth_models import User
+        admin = User(
+            email="admin@graincompany.ua",
+            hashed_password=await password_pool.hash("admin123"),
+            full_name="Administrator",
+            company_name="GrainCompany",
+            edrpou="00000000",
+            phone="+380441234567",
+            role="admin",
+            accreditation_status="approved"
+        )
+        await users_collection.insert_one(admin.dict())
+        logger.info("Admin user created: admin@graincompany.ua / admin123")
+
+
+# Append only; never renumber or remove an applied migration
+MIGRATIONS = [
+    (1, seed_grains),
+    (2, create_default_admin),
+]
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+async def migrations_applied() -> bool:
+    """Whether every migration has been applied, by any worker"""
+    state = await migrations_collection.find_one({"_id": STATE_ID}, {"version": 1})
+    return bool(state) and state.get("version", 0) >= LATEST_VERSION
+
+
+async def run_migrations():
+    """Bring the database up to date unless it already is or another worker is on it"""
+    state = await migrations_collection.find_one({"_id": STATE_ID})
+    if state and state.get("version", 0) >= LATEST_VERSION and state.get("indexes") == indexes_fingerprint():
+        return
+
+    owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+    now = datetime.utcnow()
+    try:
+        # Matches only a free or expired lease; a held one makes the upsert hit the _id index
+        state = await migrations_collection.find_one_and_update(
+            {"_id": STATE_ID, "$or": [{"lease_until": None}, {"lease_until": {"$lt": now}}]},
+            {"$set": {"leased_by": owner, "lease_until": now + timedelta(seconds=MIGRATION_LEASE_SECONDS)}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+    except DuplicateKeyError:
+        logger.info("Migrations are being applied by another worker")
+        return
+
+    lease = {"_id": STATE_ID, "leased_by": owner}
+    try:
+        fingerprint = indexes_fingerprint()
+        if state.get("indexes") != fingerprint and await ensure_indexes():
+            await migrations_collection.update_one(lease, {"$set": {"indexes": fingerprint}})
+
+        for version, migration in MIGRATIONS:
+            if version > state.get("version", 0):
+                logger.info(f"Applying migration {version}: {migration.__name__}")
+                await migration()
+                await migrations_collection.update_one(
+                    lease, {"$set": {"version": version, "applied_at": datetime.utcnow()}}
+                )
+    finally:
+        await migrations_collection.update_one(lease, {"$set": {"leased_by": None, "lease_until": None}})
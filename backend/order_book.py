@@ -0,0 +1,279 @@
+"""
+Continuous double-sided order book for trading grain by tonnage.
+
+Buy and sell orders rest in two heaps with price-time priority: the best
+price first, and among equal prices the order sequenced first. An
+incoming order trades against the opposite side for as long as prices
+cross, at the resting order's price, and may fill partially against
+several resting orders; whatever is left rests in the book.
+
+OrderBook is the matching itself: in memory, synchronous, deterministic.
+Its input is a sequence of order and cancel events, and the same
+sequence always produces the same fills and the same resting orders.
+
+SharedOrderBook makes that sequence durable and shared by every worker.
+Each event is stored in order_book_events under (book_id, seq), which
+is unique. A worker claims the next seq by inserting the event there: a
+duplicate key means another worker claimed it first. The worker then
+catches up on the events it missed and tries again with the next seq.
+Until then it writes without reading first: the unique index is what
+tells it that it is behind.
+Each worker holds its own replica of the book and applies every stored
+event in seq order, so all replicas agree. The worker that stored an
+event applies it at once and returns its fills. Fills are not stored
+separately because replaying the events reproduces them.
+
+Within a worker, orders queued while a write is in flight go out
+together in the next insert_many (group commit). A burst of orders
+therefore costs one round trip, not one per order.
+"""
+
+import asyncio
+import heapq
+import logging
+import os
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+
+from pymongo.errors import BulkWriteError
+
+from backend.database import db
+
+logger = logging.getLogger(__name__)
+
+BUY = "buy"
+SELL = "sell"
+# Quantities are tonnes; rounding to kilograms keeps repeated partial
+# fills from leaving float dust in the book
+QUANTITY_DECIMALS = 3
+DUPLICATE_KEY = 11000
+ORDER_BATCH_SIZE = int(os.environ.get("ORDER_BOOK_BATCH_SIZE", 1000))
+
+order_book_events_collection = db.order_book_events
+
+
+@dataclass(slots=True)
+class Order:
+    id: str
+    side: str
+    price: float
+    quantity: float
+    owner: str
+    seq: int
+    remaining: float
+
+
+@dataclass(slots=True)
+class Fill:
+    buy_order_id: str
+    sell_order_id: str
+    price: float
+    quantity: float
+    seq: int  # of the order that traded
+
+
+def order_error(side: str, price: float, quantity: float) -> str | None:
+    if side not in (BUY, SELL):
+        return f"side must be {BUY!r} or {SELL!r}"
+    if price <= 0 or quantity <= 0:
+        return "price and quantity must be positive"
+    return None
+
+
+class OrderBook:
+    def __init__(self, book_id: str):
+        self.book_id = book_id
+        self.seq = 0  # last event applied
+        self._bids: list[tuple[float, int, Order]] = []  # (-price, seq, order)
+        self._asks: list[tuple[float, int, Order]] = []  # (price, seq, order)
+        self._orders: dict[str, Order] = {}
+
+    def submit(self, side: str, price: float, quantity: float, owner: str, order_id: str | None = None) -> list[Fill]:
+        """Match a limit order against the book; returns its fills, the rest rests"""
+        error = order_error(side, price, quantity)
+        if error:
+            raise ValueError(error)
+        self.seq += 1
+        order = Order(order_id or str(uuid.uuid4()), side, price, quantity, owner, self.seq, quantity)
+
+        if side == BUY:
+            fills = self._match(order, self._asks, lambda resting: resting.price <= price)
+            if order.remaining > 0:
+                heapq.heappush(self._bids, (-price, order.seq, order))
+        else:
+            fills = self._match(order, self._bids, lambda resting: resting.price >= price)
+            if order.remaining > 0:
+                heapq.heappush(self._asks, (price, order.seq, order))
+        if order.remaining > 0:
+            self._orders[order.id] = order
+        return fills
+
+    def cancel(self, order_id: str) -> bool:
+        """Withdraw what is left of a resting order"""
+        self.seq += 1
+        order = self._orders.pop(order_id, None)
+        if order is None:
+            return False
+        # Left in its heap and skipped once it reaches the top
+        order.remaining = 0
+        return True
+
+    def apply(self, event: dict) -> list[Fill] | bool:
+        """Apply a stored event: submit()'s fills for an order, cancel()'s result for a cancel"""
+        if event["seq"] != self.seq + 1:
+            raise ValueError(f"Order book {self.book_id} is at seq {self.seq}, cannot apply seq {event['seq']}")
+        if event["type"] == "order":
+            return self.submit(event["side"], event["price"], event["quantity"], event["owner"], event["order_id"])
+        return self.cancel(event["order_id"])
+
+    def best_bid(self) -> float | None:
+        return self._best(self._bids, -1)
+
+    def best_ask(self) -> float | None:
+        return self._best(self._asks, 1)
+
+    def depth(self, side: str, levels: int = 10) -> list[tuple[float, float]]:
+        """Resting tonnage per price on one side, best price first"""
+        by_price: dict[float, float] = {}
+        for order in self._orders.values():
+            if order.side == side:
+                by_price[order.price] = by_price.get(order.price, 0) + order.remaining
+        prices = sorted(by_price, reverse=side == BUY)[:levels]
+        return [(price, round(by_price[price], QUANTITY_DECIMALS)) for price in prices]
+
+    def order(self, order_id: str) -> Order | None:
+        return self._orders.get(order_id)
+
+    def _match(self, order: Order, opposite: list, crosses) -> list[Fill]:
+        fills = []
+        while order.remaining > 0 and opposite:
+            resting = opposite[0][2]
+            if resting.remaining <= 0:
+                heapq.heappop(opposite)
+                continue
+            if not crosses(resting):
+                break
+            quantity = min(order.remaining, resting.remaining)
+            order.remaining = round(order.remaining - quantity, QUANTITY_DECIMALS)
+            resting.remaining = round(resting.remaining - quantity, QUANTITY_DECIMALS)
+            if resting.remaining <= 0:
+                heapq.heappop(opposite)
+                del self._orders[resting.id]
+
+            buy, sell = (order, resting) if order.side == BUY else (resting, order)
+            fills.append(Fill(buy.id, sell.id, resting.price, quantity, order.seq))
+        return fills
+
+    def _best(self, heap: list, sign: int) -> float | None:
+        while heap and heap[0][2].remaining <= 0:
+            heapq.heappop(heap)
+        return heap[0][0] * sign if heap else None
+
+
+class SharedOrderBook:
+    """One worker's replica of a book whose event sequence lives in Mongo"""
+
+    def __init__(self, book_id: str, collection=order_book_events_collection, batch_size: int = ORDER_BATCH_SIZE):
+        self.book = OrderBook(book_id)
+        self._collection = collection
+        self._batch_size = batch_size
+        self._pending: list[tuple[dict, asyncio.Future]] = []
+        self._lock = asyncio.Lock()
+        # Set while other workers may have stored events this replica lacks
+        self._behind = True
+
+    async def submit(self, side: str, price: float, quantity: float, owner: str, order_id: str | None = None) -> list[Fill]:
+        """Store the order as the book's next event and match it; returns its fills"""
+        error = order_error(side, price, quantity)
+        if error:
+            raise ValueError(error)
+        return await self._sequence({
+            "type": "order", "order_id": order_id or str(uuid.uuid4()), "side": side,
+            "price": price, "quantity": quantity, "owner": owner,
+        })
+
+    async def cancel(self, order_id: str) -> bool:
+        """Store a cancel as the book's next event; False if nothing of the order was resting"""
+        return await self._sequence({"type": "cancel", "order_id": order_id})
+
+    async def sync(self) -> OrderBook:
+        """The book with every event stored so far applied"""
+        async with self._lock:
+            await self._catch_up()
+        return self.book
+
+    async def _sequence(self, event: dict):
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((event, future))
+        async with self._lock:
+            # Another caller may have written this event with its own batch
+            if not future.done():
+                # Let orders submitted in the same loop iteration join the batch
+                await asyncio.sleep(0)
+                await self._flush()
+        return await future
+
+    async def _flush(self):
+        while self._pending:
+            if self._behind:
+                try:
+                    await self._catch_up()
+                except Exception as e:
+                    batch, self._pending = self._pending, []
+                    self._fail(batch, e)
+                    return
+            batch, self._pending = self._pending[:self._batch_size], self._pending[self._batch_size:]
+            now = datetime.utcnow()
+            docs = [
+                {**event, "book_id": self.book.book_id, "seq": self.book.seq + 1 + i, "created_at": now}
+                for i, (event, _) in enumerate(batch)
+            ]
+            written = len(docs)
+            try:
+                await self._collection.insert_many([dict(doc) for doc in docs], ordered=True)
+            except BulkWriteError as e:
+                # An ordered insert stops at its first error: everything before it is stored
+                first_error = e.details["writeErrors"][0]
+                written = first_error["index"]
+                if first_error["code"] == DUPLICATE_KEY:
+                    # Another worker took this seq: catch up, the rest wait for the next round
+                    self._behind = True
+                    self._pending[:0] = batch[written:]
+                else:
+                    self._fail(batch[written:], e)
+            except Exception as e:
+                # Whatever of the batch got stored is applied by the next catch-up like any other event
+                self._fail(batch, e)
+                continue
+            for doc, (_, future) in zip(docs[:written], batch):
+                future.set_result(self.book.apply(doc))
+
+    async def _catch_up(self):
+        cursor = self._collection.find({"book_id": self.book.book_id, "seq": {"$gt": self.book.seq}}, {"_id": 0})
+        async for event in cursor.sort("seq", 1):
+            self.book.apply(event)
+        self._behind = False
+
+    def _fail(self, batch: list[tuple[dict, asyncio.Future]], error: Exception):
+        logger.error(f"Failed to store {len(batch)} events of order book {self.book.book_id}: {error}")
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(error)
+
+
+class OrderBooks:
+    """This worker's replicas, created on first use and caught up from Mongo"""
+
+    def __init__(self, collection=order_book_events_collection):
+        self._collection = collection
+        self._books: dict[str, SharedOrderBook] = {}
+
+    def get(self, book_id: str) -> SharedOrderBook:
+        book = self._books.get(book_id)
+        if book is None:
+            book = self._books[book_id] = SharedOrderBook(book_id, self._collection)
+        return book
+
+
+order_books = OrderBooks()
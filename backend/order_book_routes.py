@@ -0,0 +1,80 @@
+"""
+Order book routes: continuous trading of grain by tonnage.
+
+Each book_id is its own market, for example one grain type and delivery
+basis. Orders and cancels are sequenced through Mongo by SharedOrderBook,
+so every worker matches against the same book (see backend/order_book.py).
+"""
+
+import logging
+import uuid
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from backend.auction_models import FillResponse, OrderBookDepth, OrderCreate, OrderResponse
+from backend.auth import get_approved_buyer
+from backend.order_book import BUY, QUANTITY_DECIMALS, SELL, order_books, order_error
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/order-books", tags=["order-books"])
+
+
+@router.post("/{book_id}/orders", response_model=OrderResponse)
+async def submit_order(
+    book_id: str,
+    order_data: OrderCreate,
+    current_user: dict = Depends(get_approved_buyer)
+):
+    """Place a limit order (Approved buyers only); what does not fill at once rests"""
+    error = order_error(order_data.side, order_data.price, order_data.quantity)
+    if error:
+        raise HTTPException(status_code=400, detail=error)
+
+    order_id = str(uuid.uuid4())
+    fills = await order_books.get(book_id).submit(
+        order_data.side, order_data.price, order_data.quantity, current_user["sub"], order_id
+    )
+    # From the fills, not the book: later orders may already have traded against it
+    remaining = round(order_data.quantity - sum(fill.quantity for fill in fills), QUANTITY_DECIMALS)
+    logger.info(f"Order {order_id} on book {book_id} by {current_user['sub']}: {len(fills)} fills")
+
+    return OrderResponse(
+        id=order_id,
+        book_id=book_id,
+        remaining=remaining,
+        fills=[
+            FillResponse(buy_order_id=fill.buy_order_id, sell_order_id=fill.sell_order_id, price=fill.price, quantity=fill.quantity)
+            for fill in fills
+        ]
+    )
+
+
+@router.delete("/{book_id}/orders/{order_id}")
+async def cancel_order(
+    book_id: str,
+    order_id: str,
+    current_user: dict = Depends(get_approved_buyer)
+):
+    """Withdraw what is left of one of your resting orders"""
+    shared = order_books.get(book_id)
+    order = (await shared.sync()).order(order_id)
+    if not order or order.owner != current_user["sub"]:
+        raise HTTPException(status_code=404, detail="Order not found")
+    # It may have filled since the sync above
+    if not await shared.cancel(order_id):
+        raise HTTPException(status_code=409, detail="Order has already filled")
+    return {"message": "Order cancelled"}
+
+
+@router.get("/{book_id}", response_model=OrderBookDepth)
+async def get_order_book(book_id: str, levels: int = Query(10, ge=1, le=100)):
+    """Best prices and resting tonnage per price level"""
+    book = await order_books.get(book_id).sync()
+    return OrderBookDepth(
+        book_id=book_id,
+        seq=book.seq,
+        best_bid=book.best_bid(),
+        best_ask=book.best_ask(),
+        bids=[list(level) for level in book.depth(BUY, levels)],
+        asks=[list(level) for level in book.depth(SELL, levels)],
+    )
@@ -0,0 +1,71 @@
+"""
+Keyset (cursor) pagination.
+
+A page is sorted on a unique key such as (created_at, id) and the opaque
+cursor carries the sort values of the last row. The next page asks for rows
+strictly after those values, so with a matching index every page is a single
+index range scan no matter how deep the client pages.
+"""
+
+import base64
+import json
+from datetime import datetime
+
+from fastapi import HTTPException
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+# Response header carrying the cursor of the next page (absent on the last page)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(values: list) -> str:
+    payload = [{"$date": v.isoformat()} if isinstance(v, datetime) else v for v in values]
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(",", ":")).encode()).decode()
+
+
+def decode_cursor(cursor: str, size: int) -> list:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        values = [
+            datetime.fromisoformat(v["$date"]) if isinstance(v, dict) else v
+            for v in payload
+        ]
+    except (ValueError, TypeError, KeyError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if len(values) != size:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+
+def keyset_filter(sort: list[tuple[str, int]], values: list) -> dict:
+    """Rows strictly after `values` in `sort` order, e.g. for [(a, -1), (id, -1)]:
+    {"$or": [{a: {"$lt": va}}, {a: va, id: {"$lt": vid}}]}"""
+    clauses = []
+    for i, (field, direction) in enumerate(sort):
+        clause = {prev_field: values[j] for j, (prev_field, _) in enumerate(sort[:i])}
+        clause[field] = {"$lt" if direction < 0 else "$gt": values[i]}
+        clauses.append(clause)
+    return {"$or": clauses}
+
+
+async def fetch_page(
+    collection,
+    query: dict,
+    sort: list[tuple[str, int]],
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: str | None = None,
+    projection: dict | None = None,
+) -> tuple[list[dict], str | None]:
+    """Return one page of documents and the cursor of the next page (None at the end)"""
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    if cursor:
+        query = {"$and": [query, keyset_filter(sort, decode_cursor(cursor, len(sort)))]}
+
+    # One extra row tells us whether there is a next page
+    docs = await collection.find(query, projection or {"_id": 0}).sort(sort).limit(limit + 1).to_list(limit + 1)
+    if len(docs) <= limit:
+        return docs, None
+    docs = docs[:limit]
+    return docs, encode_cursor([docs[-1][field] for field, _ in sort])
@@ -0,0 +1,92 @@
+"""
+Bounded worker pool for bcrypt hashing and verification.
+
+bcrypt takes 100-300 ms of CPU per call; run inline in an async handler it
+stalls every request on the worker, bids included. The pool runs it on a
+few dedicated threads (bcrypt releases the GIL) and sheds load with a 503
+once PASSWORD_QUEUE_LIMIT calls are already waiting.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi import HTTPException, status
+
+from backend.auth import hash_password, verify_password
+
+logger = logging.getLogger(__name__)
+
+PASSWORD_POOL_SIZE = int(os.environ.get("PASSWORD_POOL_SIZE", min(4, os.cpu_count() or 1)))
+PASSWORD_QUEUE_LIMIT = int(os.environ.get("PASSWORD_QUEUE_LIMIT", 64))
+
+
+class PasswordPool:
+    def __init__(self, size: int = PASSWORD_POOL_SIZE, queue_limit: int = PASSWORD_QUEUE_LIMIT):
+        self.size = size
+        self.queue_limit = queue_limit
+        self._executor = self._new_executor()
+        self._in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.busy_seconds = 0.0
+        self.wait_seconds = 0.0
+
+    async def hash(self, password: str) -> str:
+        return await self._run(hash_password, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(verify_password, plain_password, hashed_password)
+
+    def stats(self) -> dict:
+        return {
+            "size": self.size,
+            "queue_limit": self.queue_limit,
+            "in_flight": self._in_flight,
+            "queued": max(0, self._in_flight - self.size),
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avg_busy_ms": round(self.busy_seconds / self.completed * 1000, 2) if self.completed else 0.0,
+            "avg_wait_ms": round(self.wait_seconds / self.completed * 1000, 2) if self.completed else 0.0,
+        }
+
+    def shutdown(self):
+        # Replaced, not just shut down, so a lifespan started again in this process can still hash
+        executor, self._executor = self._executor, self._new_executor()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _new_executor(self) -> ThreadPoolExecutor:
+        # Threads are only started on the first call
+        return ThreadPoolExecutor(max_workers=self.size, thread_name_prefix="bcrypt")
+
+    async def _run(self, fn, *args):
+        if self._in_flight >= self.size + self.queue_limit:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server is busy, try again shortly",
+                headers={"Retry-After": "1"},
+            )
+
+        self._in_flight += 1
+        submitted = time.perf_counter()
+
+        def timed():
+            started = time.perf_counter()
+            return started, fn(*args), time.perf_counter() - started
+
+        try:
+            loop = asyncio.get_running_loop()
+            started, result, busy = await loop.run_in_executor(self._executor, timed)
+        finally:
+            self._in_flight -= 1
+
+        self.completed += 1
+        self.busy_seconds += busy
+        self.wait_seconds += started - submitted
+        return result
+
+
+password_pool = PasswordPool()
@@ -0,0 +1,196 @@
+"""
+Opt-in request profiling for chasing latency spikes in production.
+
+With PROFILING_ENABLED=1 the middleware profiles requests and keeps a
+profile when the request took at least PROFILE_SLOW_MS, or when it was
+picked by PROFILE_SAMPLE_RATE. Kept profiles go into a ring of the last
+PROFILE_RING_SIZE, which admins list and download under /api/admin/profiles.
+When profiling is off the middleware is not installed at all.
+
+pyinstrument (pip install pyinstrument) is used when available: it samples
+rather than traces, follows each request across awaits, and lets
+concurrent requests be profiled independently. Without it cProfile is
+used instead. It profiles one request at a time, and its output includes
+whatever else ran on the event loop meanwhile.
+"""
+
+import cProfile
+import io
+import logging
+import os
+import pstats
+import random
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Response
+
+from backend.auth import get_current_admin
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/admin/profiles", tags=["profiling"])
+
+PROFILING_ENABLED = os.environ.get("PROFILING_ENABLED", "").lower() in ("1", "true", "yes")
+PROFILE_SLOW_MS = float(os.environ.get("PROFILE_SLOW_MS", 500))  # 0 disables the threshold
+PROFILE_SAMPLE_RATE = float(os.environ.get("PROFILE_SAMPLE_RATE", 0))
+PROFILE_RING_SIZE = int(os.environ.get("PROFILE_RING_SIZE", 50))
+PROFILE_INTERVAL_SECONDS = float(os.environ.get("PROFILE_INTERVAL_SECONDS", 0.001))
+# Long-lived streams and the profile downloads themselves are never profiled
+PROFILE_EXCLUDE = tuple(
+    os.environ.get("PROFILE_EXCLUDE", "/api/auctions/events,/api/admin/").split(",")
+)
+
+Profiler = None
+if PROFILING_ENABLED:
+    # Imported only when needed, to keep it off the startup path
+    try:
+        from pyinstrument import Profiler
+        from pyinstrument.renderers import HTMLRenderer
+    except ImportError:
+        pass
+
+
+class PyinstrumentProfile:
+    media_type = "text/html"
+    extension = "html"
+
+    def __init__(self):
+        self._profiler = Profiler(interval=PROFILE_INTERVAL_SECONDS, async_mode="enabled")
+        self._profiler.start()
+        self._session = None
+
+    def stop(self):
+        self._session = self._profiler.stop()
+
+    def render(self) -> str:
+        return HTMLRenderer().render(self._session)
+
+
+class CProfileProfile:
+    media_type = "text/plain"
+    extension = "txt"
+    # cProfile hooks the whole thread, so only one can run at a time
+    active = False
+
+    def __init__(self):
+        CProfileProfile.active = True
+        self._profiler = cProfile.Profile()
+        self._profiler.enable()
+
+    def stop(self):
+        self._profiler.disable()
+        CProfileProfile.active = False
+
+    def render(self) -> str:
+        stream = io.StringIO()
+        pstats.Stats(self._profiler, stream=stream).sort_stats("cumulative").print_stats(60)
+        return stream.getvalue()
+
+
+def start_profile():
+    """A running profile, or None if one cannot be started right now"""
+    if Profiler is not None:
+        return PyinstrumentProfile()
+    if CProfileProfile.active:
+        return None
+    return CProfileProfile()
+
+
+@dataclass
+class ProfileRecord:
+    method: str
+    path: str
+    status: int
+    duration_ms: float
+    reason: str  # slow or sampled
+    profile: PyinstrumentProfile | CProfileProfile
+    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    created_at: datetime = field(default_factory=datetime.utcnow)
+
+    def summary(self) -> dict:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "status": self.status,
+            "duration_ms": self.duration_ms,
+            "reason": self.reason,
+            "created_at": self.created_at,
+        }
+
+
+profile_ring: deque[ProfileRecord] = deque(maxlen=PROFILE_RING_SIZE)
+
+
+class ProfilingMiddleware:
+    def __init__(self, app, slow_ms: float = PROFILE_SLOW_MS, sample_rate: float = PROFILE_SAMPLE_RATE):
+        self.app = app
+        self.slow_ms = slow_ms
+        self.sample_rate = sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].startswith(PROFILE_EXCLUDE):
+            await self.app(scope, receive, send)
+            return
+
+        sampled = random.random() < self.sample_rate
+        profile = start_profile() if sampled or self.slow_ms > 0 else None
+        if profile is None:
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            duration_ms = (time.perf_counter() - started) * 1000
+            profile.stop()
+            slow = self.slow_ms > 0 and duration_ms >= self.slow_ms
+            if slow or sampled:
+                profile_ring.append(ProfileRecord(
+                    method=scope["method"],
+                    path=scope["path"],
+                    status=status,
+                    duration_ms=round(duration_ms, 1),
+                    reason="slow" if slow else "sampled",
+                    profile=profile,
+                ))
+                if slow:
+                    logger.warning(f"Slow request profiled: {scope['method']} {scope['path']} took {duration_ms:.0f} ms")
+
+
+@router.get("")
+async def list_profiles(current_user: dict = Depends(get_current_admin)):
+    """Profiling settings and the kept profiles, newest first (Admin only)"""
+    return {
+        "enabled": PROFILING_ENABLED,
+        "profiler": "pyinstrument" if Profiler is not None else "cProfile",
+        "slow_ms": PROFILE_SLOW_MS,
+        "sample_rate": PROFILE_SAMPLE_RATE,
+        "profiles": [record.summary() for record in reversed(profile_ring)],
+    }
+
+
+@router.get("/{profile_id}")
+async def download_profile(profile_id: str, current_user: dict = Depends(get_current_admin)):
+    """Download one profile: HTML from pyinstrument, text from cProfile (Admin only)"""
+    record = next((record for record in profile_ring if record.id == profile_id), None)
+    if not record:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    profile = record.profile
+    return Response(
+        content=profile.render(),
+        media_type=profile.media_type,
+        headers={"Content-Disposition": f'attachment; filename="profile-{record.id}.{profile.extension}"'}
+    )
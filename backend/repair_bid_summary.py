@@ -0,0 +1,71 @@
+"""
+Backfill / repair the denormalized bid summary on auction documents.
+
+Recomputes highest_bid_amount, highest_bid_id and bid_count from the bids
+collection. Sealed auctions only get bid_count: their high bid stays hidden
+until close, when the engine's settle() records it with the clearing
+price. Run once after deploying the bid-summary fields, or whenever an
+auction's summary is suspected to be out of sync:
+
+    python -m backend.repair_bid_summary               # every auction
+    python -m backend.repair_bid_summary <auction_id>  # selected auctions
+"""
+
+import asyncio
+import logging
+import sys
+
+from pymongo import UpdateOne
+
+from backend.auction_engines import engine_named
+from backend.database import auctions_collection, bids_collection
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 1000
+
+
+async def repair_bid_summaries(auction_ids: list[str] | None = None) -> int:
+    """Rewrite the bid summary of the given auctions (all when None); returns auctions updated"""
+    match = {"auction_id": {"$in": auction_ids}} if auction_ids else {}
+    pipeline = [
+        {"$match": match},
+        # Highest amount first; the earliest bid wins a tie, as it did the 1% check
+        {"$sort": {"auction_id": 1, "bid_amount": -1, "created_at": 1}},
+        {"$group": {
+            "_id": "$auction_id",
+            "highest_bid_amount": {"$first": "$bid_amount"},
+            "highest_bid_id": {"$first": "$id"},
+            "bid_count": {"$sum": 1},
+        }},
+    ]
+    summaries = {}
+    async for row in bids_collection.aggregate(pipeline, allowDiskUse=True):
+        summaries[row["_id"]] = row
+
+    auction_filter = {"id": {"$in": auction_ids}} if auction_ids else {}
+    updated = 0
+    ops = []
+    async for auction in auctions_collection.find(auction_filter, {"_id": 0, "id": 1, "auction_type": 1}):
+        summary = summaries.get(auction["id"], {})
+        update = {"bid_count": summary.get("bid_count", 0)}
+        if not engine_named(auction.get("auction_type")).sealed:
+            update["highest_bid_amount"] = summary.get("highest_bid_amount")
+            update["highest_bid_id"] = summary.get("highest_bid_id")
+        ops.append(UpdateOne({"id": auction["id"]}, {"$set": update}))
+        if len(ops) >= BATCH_SIZE:
+            result = await auctions_collection.bulk_write(ops, ordered=False)
+            updated += result.modified_count
+            ops = []
+    if ops:
+        result = await auctions_collection.bulk_write(ops, ordered=False)
+        updated += result.modified_count
+
+    logger.info(f"Bid summary repaired on {updated} auctions")
+    return updated
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    updated = asyncio.run(repair_bid_summaries(sys.argv[1:] or None))
+    print(f"✅ Bid summary updated on {updated} auctions")
@@ -0,0 +1,28 @@
+"""
+Fast response path for list-heavy endpoints.
+
+Returning a pydantic model from a handler costs two validations per row:
+once when the handler builds the model from the Mongo dict, and again when
+FastAPI checks it against response_model before serializing. Handlers on
+hot paths instead fetch only the response fields from Mongo and return
+validated_response(), which validates the raw dicts once (in pydantic-core)
+and renders them with orjson. FastAPI skips its own response_model pass
+for Response objects, so response_model is kept for the OpenAPI schema only.
+"""
+
+from typing import Any
+
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, TypeAdapter
+
+
+def projection_for(model: type[BaseModel], *extra: str) -> dict:
+    """Mongo projection that returns only the fields `model` serializes (plus `extra`)"""
+    fields = {name: 1 for name in model.model_fields}
+    fields.update({name: 1 for name in extra})
+    return {"_id": 0, **fields}
+
+
+def validated_response(adapter: TypeAdapter, data: Any, headers: dict | None = None) -> ORJSONResponse:
+    """Validate `data` once against `adapter` and serialize it with orjson"""
+    return ORJSONResponse(adapter.dump_python(adapter.validate_python(data)), headers=headers)
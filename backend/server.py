@@ -1,8 +1,11 @@
-from fastapi import FastAPI, APIRouter, HTTPException
+from fastapi import FastAPI, APIRouter, Depends, HTTPException, Header, Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
+import asyncio
 import os
 import logging
+from contextlib import asynccontextmanager
 from pathlib import Path
 from typing import List
 from fastapi import FastAPI
@@ -12,18 +15,51 @@ from backend.models import (
     Order, OrderCreate, OrderResponse,
     Contact, ContactCreate, ContactResponse
 )
-from backend.database import grains_collection, orders_collection, contacts_collection, users_collection, auctions_collection, bids_collection
-from backend.seed_data import INITIAL_GRAINS
+from backend.database import database, db, pool_stats, orders_collection, contacts_collection
+from backend.auth import get_current_admin
 from backend.auth_routes import router as auth_router
 from backend.auction_routes import router as auction_router
-from backend.auth import hash_password
+from backend.export_routes import router as export_router
+from backend.order_book_routes import router as order_book_router
+from backend.auction_scheduler import scheduler
+from backend.shared_state import shared_state
+from backend.migrations import migrations_applied, run_migrations
+from backend.catalog_cache import catalog_cache
+from backend.pagination import NEXT_CURSOR_HEADER
+from backend.password_pool import password_pool
+from backend.email_outbox import dispatcher as email_dispatcher
+from backend.metrics import MetricsMiddleware, loop_lag_monitor, register_stats
+from backend.profiling import PROFILING_ENABLED, ProfilingMiddleware, router as profiling_router
 
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
+STARTUP_RETRY_MAX_SECONDS = 30
+READY_PING_TIMEOUT_SECONDS = 2
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Serve immediately; everything that talks to Mongo happens in the background
+    # and /health/ready reports when it is done
+    database.open()
+    app.state.startup = asyncio.create_task(start_up(), name="startup")
+    app.state.migrations_applied = False
+    try:
+        yield
+    finally:
+        app.state.startup.cancel()
+        try:
+            await app.state.startup
+        except (asyncio.CancelledError, Exception):
+            pass
+        await stop_background_tasks()
+        database.close()
+
+
 # Create the main app without a prefix
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -31,10 +67,14 @@ app.add_middleware(
     allow_origins=["*"],
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
+if PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
+app.add_middleware(MetricsMiddleware)
+register_stats("password_pool", password_pool.stats)
 
-mongo_url = os.environ["MONGO_URL"]
-db_name = os.environ.get("DB_NAME", "grain_app")
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN")
 
 # Create a router with the /api prefix
 api_router = APIRouter(prefix="/api")
@@ -50,33 +90,65 @@ async def root():
     return {"status": "ok", "db": "connected"}
 
 
-# Seed database on startup
-@app.on_event("startup")
-async def seed_database():
-    # Seed grains only if empty
-    count = await grains_collection.count_documents({})
-    if count == 0:
-        logger.info("Seeding grains database...")
-        await grains_collection.insert_many(INITIAL_GRAINS)
-        logger.info(f"Seeded {len(INITIAL_GRAINS)} grains")
-    
-    # Create default admin user if not exists
-    admin_exists = await users_collection.find_one({"email": "admin@graincompany.ua"})
-    if not admin_exists:
-        logger.info("Creating default admin user...")
-        from backend.auth_models import User 
-        admin = User(
-            email="admin@graincompany.ua",
-            hashed_password=get_password_hash("admin123"),
-            full_name="Administrator",
-            company_name="GrainCompany",
-            edrpou="00000000",
-            phone="+380441234567",
-            role="admin",
-            accreditation_status="approved"
-        )
-        await users_collection.insert_one(admin.dict())
-        logger.info("Admin user created: admin@graincompany.ua / admin123")
+@app.get("/health/live", include_in_schema=False)
+async def live():
+    """Liveness: the process is serving requests"""
+    return {"status": "ok"}
+
+
+@app.get("/health/ready", include_in_schema=False)
+async def ready():
+    """Readiness: background services started, Mongo reachable and migrations applied"""
+    startup = app.state.startup
+    if not startup.done() or startup.cancelled() or startup.exception():
+        raise HTTPException(status_code=503, detail="Starting up")
+    try:
+        await asyncio.wait_for(db.command("ping"), READY_PING_TIMEOUT_SECONDS)
+        if not app.state.migrations_applied:
+            app.state.migrations_applied = await migrations_applied()
+    except Exception as e:
+        raise HTTPException(status_code=503, detail=f"Database unavailable: {e}")
+    if not app.state.migrations_applied:
+        raise HTTPException(status_code=503, detail="Migrations pending")
+    return {"status": "ready"}
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics(authorization: str | None = Header(None)):
+    """Prometheus scrape endpoint; requires METRICS_TOKEN as a bearer token when set"""
+    if METRICS_TOKEN and authorization != f"Bearer {METRICS_TOKEN}":
+        raise HTTPException(status_code=401, detail="Invalid metrics token")
+    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
+async def start_up():
+    """Migrations, then the background services; retried until Mongo is reachable"""
+    delay = 1
+    while True:
+        try:
+            await run_migrations()
+            await start_background_tasks()
+            return
+        except Exception as e:
+            logger.error(f"Startup failed, retrying in {delay}s: {e}")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, STARTUP_RETRY_MAX_SECONDS)
+
+
+# Shared state fan-out, auction status transitions and email delivery run in the background
+async def start_background_tasks():
+    await shared_state.start()
+    await scheduler.start()
+    await email_dispatcher.start()
+    await loop_lag_monitor.start()
+
+
+async def stop_background_tasks():
+    await loop_lag_monitor.stop()
+    await email_dispatcher.stop()
+    await scheduler.stop()
+    await shared_state.stop()
+    password_pool.shutdown()
 
 
 # Routes
@@ -86,15 +158,31 @@ async def root():
 
 
 @api_router.get("/grains", response_model=List[GrainResponse])
-async def get_grains():
+async def get_grains(if_none_match: str | None = Header(None)):
     """Get all active grains"""
     try:
-        grains = await grains_collection.find({"active": True}).to_list(100)
-        return [GrainResponse(**grain) for grain in grains]
+        cached = await catalog_cache.get()
     except Exception as e:
         logger.error(f"Error fetching grains: {e}")
         raise HTTPException(status_code=500, detail="Failed to fetch grains")
 
+    # no-cache: browsers keep the body but revalidate, getting a 304 while unchanged
+    headers = {"ETag": cached.etag, "Cache-Control": "no-cache"}
+    if if_none_match and _etag_matches(if_none_match, cached.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=cached.body, media_type="application/json", headers=headers)
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+@api_router.get("/admin/db-pool")
+async def get_db_pool_stats(current_user: dict = Depends(get_current_admin)):
+    """MongoDB connection pool settings and usage (Admin only)"""
+    return {"connected": database.client is not None, **pool_stats.stats()}
+
 
 @api_router.post("/orders", response_model=OrderResponse)
 async def create_order(order_data: OrderCreate):
@@ -133,4 +221,7 @@ async def create_contact(contact_data: ContactCreate):
 app.include_router(api_router)
 app.include_router(auth_router, prefix="/api")
 app.include_router(auction_router, prefix="/api")
+app.include_router(export_router, prefix="/api")
+app.include_router(order_book_router, prefix="/api")
+app.include_router(profiling_router, prefix="/api")
 
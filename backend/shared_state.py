@@ -0,0 +1,157 @@
+"""
+State shared by every worker: pub/sub channels and windowed counters.
+
+Anything that must agree across uvicorn workers and nodes goes through
+shared_state instead of a module-level dict:
+
+- publish(channel, message) reaches the handlers subscribed to that
+  channel in every worker (auction events, cache invalidation)
+- incr(key, window_seconds) counts within a fixed time window shared by
+  all workers (rate limits); count(key, window_seconds) reads the total
+  without adding to it
+
+The backend is chosen with SHARED_STATE_BACKEND (EVENT_BUS_BACKEND is
+still honoured):
+
+- "memory" (default): a single process; messages and counts stay local
+- "mongo": messages are inserted into the shared_messages collection and
+  every worker tails it with a change stream (requires a replica set);
+  counters are upserted into shared_counters. Both collections expire
+  their documents through TTL indexes (see backend/indexes.py).
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import defaultdict
+from datetime import datetime
+
+from pymongo import ReturnDocument
+
+from backend.database import db
+
+logger = logging.getLogger(__name__)
+
+RESUME_DELAY_SECONDS = 1.0
+COUNTER_SWEEP_SIZE = 10000
+
+
+class InMemorySharedState:
+    """Channels and counters for a single process"""
+
+    def __init__(self):
+        self._handlers: defaultdict[str, list] = defaultdict(list)
+        self._counters: dict[str, tuple[float, int]] = {}
+
+    async def start(self):
+        pass
+
+    async def stop(self):
+        pass
+
+    def subscribe(self, channel: str, handler):
+        """Call handler(message) for every message on channel; handlers must not block"""
+        self._handlers[channel].append(handler)
+
+    async def publish(self, channel: str, message: dict):
+        self.deliver(channel, message)
+
+    def deliver(self, channel: str, message: dict):
+        for handler in self._handlers.get(channel, ()):
+            try:
+                handler(message)
+            except Exception as e:
+                logger.error(f"Handler for {channel} failed: {e}")
+
+    async def incr(self, key: str, window_seconds: int) -> int:
+        """Count one hit for key in the current window and return the window's total"""
+        window_start, window_end = _window(window_seconds)
+        now = time.time()
+        if len(self._counters) > COUNTER_SWEEP_SIZE:
+            self._counters = {k: v for k, v in self._counters.items() if v[0] > now}
+        bucket = f"{key}:{window_start}"
+        _, count = self._counters.get(bucket, (window_end, 0))
+        self._counters[bucket] = (window_end, count + 1)
+        return count + 1
+
+    async def count(self, key: str, window_seconds: int) -> int:
+        """The current window's total for key"""
+        window_start, _ = _window(window_seconds)
+        _, count = self._counters.get(f"{key}:{window_start}", (None, 0))
+        return count
+
+
+class MongoSharedState(InMemorySharedState):
+    """Channels through a change stream, counters as upserted documents"""
+
+    def __init__(self, messages=db.shared_messages, counters=db.shared_counters):
+        super().__init__()
+        self._messages = messages
+        self._counters_collection = counters
+        self._task: asyncio.Task | None = None
+
+    async def start(self):
+        self._task = asyncio.create_task(self._watch(), name="shared-state-watch")
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def publish(self, channel: str, message: dict):
+        # Delivered to this worker's handlers by _watch, like everyone else's messages
+        await self._messages.insert_one({"channel": channel, "message": message, "created_at": datetime.utcnow()})
+
+    async def incr(self, key: str, window_seconds: int) -> int:
+        window_start, window_end = _window(window_seconds)
+        counter = await self._counters_collection.find_one_and_update(
+            {"_id": f"{key}:{window_start}"},
+            {"$inc": {"count": 1}, "$setOnInsert": {"expires_at": datetime.utcfromtimestamp(window_end)}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        return counter["count"]
+
+    async def count(self, key: str, window_seconds: int) -> int:
+        window_start, _ = _window(window_seconds)
+        counter = await self._counters_collection.find_one({"_id": f"{key}:{window_start}"}, {"count": 1})
+        return counter["count"] if counter else 0
+
+    async def _watch(self):
+        resume_token = None
+        while True:
+            try:
+                async with self._messages.watch(
+                    [{"$match": {"operationType": "insert"}}],
+                    resume_after=resume_token
+                ) as stream:
+                    async for change in stream:
+                        resume_token = stream.resume_token
+                        document = change["fullDocument"]
+                        self.deliver(document["channel"], document["message"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Shared state change stream failed, resuming: {e}")
+                await asyncio.sleep(RESUME_DELAY_SECONDS)
+
+
+def _window(window_seconds: int) -> tuple[int, int]:
+    start = int(time.time() // window_seconds * window_seconds)
+    return start, start + window_seconds
+
+
+def _create_backend() -> InMemorySharedState:
+    backend = os.environ.get("SHARED_STATE_BACKEND", os.environ.get("EVENT_BUS_BACKEND", "memory"))
+    if backend == "mongo":
+        return MongoSharedState()
+    return InMemorySharedState()
+
+
+shared_state = _create_backend()
@@ -0,0 +1,67 @@
+"""
+Minimal local SMTP sink for testing the smtp email backend.
+
+Accepts every message and logs it; nothing is delivered. Run it and point
+the app at it:
+
+    python -m backend.smtp_stub            # listens on localhost:1025
+    EMAIL_BACKEND=smtp SMTP_PORT=1025 uvicorn backend.server:app
+"""
+
+import asyncio
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+HOST = os.environ.get("SMTP_STUB_HOST", "localhost")
+PORT = int(os.environ.get("SMTP_STUB_PORT", 1025))
+
+
+async def handle_session(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    async def reply(line: str):
+        writer.write(f"{line}\r\n".encode())
+        await writer.drain()
+
+    await reply("220 localhost SMTP stub ready")
+    mail_from, recipients = None, []
+    try:
+        while line := await reader.readline():
+            command = line.decode(errors="replace").strip()
+            verb = command[:4].upper()
+            if verb in ("HELO", "EHLO"):
+                await reply("250 localhost")
+            elif verb == "MAIL":
+                mail_from, recipients = command[10:], []
+                await reply("250 OK")
+            elif verb == "RCPT":
+                recipients.append(command[8:])
+                await reply("250 OK")
+            elif verb == "DATA":
+                await reply("354 End data with <CR><LF>.<CR><LF>")
+                lines = []
+                while (data := await reader.readline()) not in (b".\r\n", b".\n", b""):
+                    lines.append(data.decode(errors="replace"))
+                logger.info(f"Message from {mail_from} to {', '.join(recipients)}:\n{''.join(lines)}")
+                await reply("250 OK: queued")
+            elif verb in ("RSET", "NOOP"):
+                await reply("250 OK")
+            elif verb == "QUIT":
+                await reply("221 Bye")
+                break
+            else:
+                await reply("502 Command not implemented")
+    finally:
+        writer.close()
+
+
+async def main():
+    server = await asyncio.start_server(handle_session, HOST, PORT)
+    logger.info(f"SMTP stub listening on {HOST}:{PORT}")
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
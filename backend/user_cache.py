@@ -0,0 +1,46 @@
+import logging
+import os
+import time
+from collections import OrderedDict
+
+from backend.database import users_collection
+
+logger = logging.getLogger(__name__)
+
+USER_CACHE_TTL = float(os.environ.get("USER_CACHE_TTL", 30))
+USER_CACHE_SIZE = int(os.environ.get("USER_CACHE_SIZE", 10000))
+
+
+class UserCache:
+    """Short-lived LRU of user documents (without password hashes) keyed by id.
+
+    Anything that changes a user (accreditation, password reset) must call
+    invalidate() so the change is visible to the next request.
+    """
+
+    def __init__(self, ttl: float = USER_CACHE_TTL, max_size: int = USER_CACHE_SIZE):
+        self._ttl = ttl
+        self._max_size = max_size
+        self._entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+
+    async def get(self, user_id: str) -> dict | None:
+        entry = self._entries.get(user_id)
+        if entry is not None:
+            expires_at, user = entry
+            if time.monotonic() < expires_at:
+                self._entries.move_to_end(user_id)
+                return user
+            del self._entries[user_id]
+
+        user = await users_collection.find_one({"id": user_id}, {"_id": 0, "hashed_password": 0})
+        if user is not None:
+            self._entries[user_id] = (time.monotonic() + self._ttl, user)
+            if len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+        return user
+
+    def invalidate(self, user_id: str):
+        self._entries.pop(user_id, None)
+
+
+user_cache = UserCache()
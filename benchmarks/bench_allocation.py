@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark: splitting a 5,000 t lot across 1,000, 10,000 and 50,000 bids
+(1,000 and 5,000 on the mongomock stand-in).
+
+Bids ask for 50-500 t at prices on a 10 UAH grid, so many share a price
+and the last level filled is shared pro rata. Reports:
+
+- allocate: the in-memory pass over bids already sorted
+- allocate_lot: reading the sorted bids from Mongo, allocating and
+  writing the winners' allocated_quantity with one bulk_write
+  (record_allocations)
+
+    python -m benchmarks.bench_allocation
+    MONGO_URL=mongodb://localhost:27017 python -m benchmarks.bench_allocation
+"""
+
+import asyncio
+import os
+import random
+import uuid
+from datetime import datetime, timedelta
+
+from benchmarks.common import print_table, summarize, time_async, use_mongo_standin
+
+BENCH_DB_NAME = os.environ.get("BENCH_DB_NAME", "grain_app_bench")
+MONGOMOCK = use_mongo_standin()
+os.environ["DB_NAME"] = BENCH_DB_NAME
+
+from backend.allocation import ALLOCATION_SORT, allocate, allocate_lot, record_allocations  # noqa: E402
+from backend.database import client  # noqa: E402
+from backend.indexes import ensure_indexes  # noqa: E402
+
+# mongomock scans for unique keys on every insert, so stay small there
+SIZES = (1000, 10_000, 50_000) if not MONGOMOCK else (1000, 5000)
+LOT_QUANTITY = 5000.0
+REPEAT = 5
+
+
+def make_bids(auction_id: str, count: int) -> list[dict]:
+    now = datetime.utcnow()
+    return [
+        {
+            "id": str(uuid.uuid4()),
+            "auction_id": auction_id,
+            "user_id": f"buyer-{i}",
+            "bid_amount": 8000.0 + random.randint(0, 200) * 10,
+            "quantity": float(random.randint(50, 500)),
+            "payment_type": "cashless",
+            "delivery_location": "Odesa",
+            "user_name": "Bench Buyer",
+            "user_company": "Bench LLC",
+            "created_at": now + timedelta(milliseconds=i),
+        }
+        for i in range(count)
+    ]
+
+
+def sort_key(bid: dict):
+    return -bid["bid_amount"], bid["created_at"]
+
+
+async def main():
+    database = client[BENCH_DB_NAME]
+    await client.drop_database(BENCH_DB_NAME)
+    if not MONGOMOCK:
+        await ensure_indexes(database)
+
+    rows = []
+    for size in SIZES:
+        auction = {"id": str(uuid.uuid4()), "quantity": LOT_QUANTITY}
+        bids = make_bids(auction["id"], size)
+        await database.bids.insert_many([dict(bid) for bid in bids])
+        sorted_bids = sorted(bids, key=sort_key)
+
+        async def in_memory():
+            allocate(LOT_QUANTITY, sorted_bids)
+
+        async def from_mongo():
+            await record_allocations(await allocate_lot(auction, database.bids), database.bids)
+
+        allocations = allocate(LOT_QUANTITY, sorted_bids)
+        assert round(sum(a.allocated_quantity for a in allocations), 3) == LOT_QUANTITY
+        rows.append({"bids": size, "path": "allocate", "winners": len(allocations), **summarize(await time_async(in_memory, REPEAT))})
+        rows.append({"bids": size, "path": "allocate_lot", "winners": len(allocations), **summarize(await time_async(from_mongo, REPEAT))})
+
+    await client.drop_database(BENCH_DB_NAME)
+    print_table(f"Lot allocation, {LOT_QUANTITY:.0f} t ({'mongomock' if MONGOMOCK else 'mongod'}, sort {ALLOCATION_SORT})", rows)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
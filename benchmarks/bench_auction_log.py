@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Benchmark: auction event log replay.
+
+Builds one auction's hash-chained log of EVENTS (default 1,000,000)
+entries, mostly bid_accepted with an auction_extended every 500. Reports:
+
+- in memory: building the chain, folding all of it into a state, and
+  re-hashing all of it (what verify() does per entry)
+- stored: STORED_EVENTS entries (default EVENTS on a mongod, 20,000 on
+  the mongomock stand-in) with a snapshot every SNAPSHOT_EVERY; times
+  load_state() from the latest snapshot, a point-in-time load from
+  halfway, a full replay with no snapshots, and verify()
+
+    python -m benchmarks.bench_auction_log
+    MONGO_URL=mongodb://localhost:27017 python -m benchmarks.bench_auction_log
+"""
+
+import asyncio
+import os
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from benchmarks.common import print_table, use_mongo_standin
+
+BENCH_DB_NAME = os.environ.get("BENCH_DB_NAME", "grain_app_bench")
+MONGOMOCK = use_mongo_standin()
+os.environ["DB_NAME"] = BENCH_DB_NAME
+
+from backend.auction_log import (  # noqa: E402
+    GENESIS_HASH, SNAPSHOT_EVERY, AuctionLog, apply_event, chain_entry, entry_hash, initial_state,
+)
+from backend.database import client  # noqa: E402
+
+EVENTS = int(os.environ.get("EVENTS", 1_000_000))
+STORED_EVENTS = int(os.environ.get("STORED_EVENTS", 20_000 if MONGOMOCK else EVENTS))
+INSERT_BATCH = 10_000
+START = datetime(2025, 7, 1, 9, 0)
+
+
+def build_chain(auction_id: str, count: int) -> list[dict]:
+    entries = []
+    prev_hash = GENESIS_HASH
+    for seq in range(1, count + 1):
+        at = START + timedelta(milliseconds=seq * 10)
+        if seq == 1:
+            event_type, data = "created", {
+                "auction_type": "english", "status": "active", "grain_id": "1", "quantity": 500.0,
+                "starting_price": 8000.0, "start_date": START, "end_date": START + timedelta(days=1),
+                "auto_award": False,
+            }
+        elif seq % 500 == 0:
+            event_type, data = "auction_extended", {"end_date": at + timedelta(seconds=60), "bid_id": f"bid-{seq - 1}"}
+        else:
+            event_type, data = "bid_accepted", {
+                "bid_id": f"bid-{seq}", "bid_amount": 8000.0 + seq, "user_id": f"buyer-{seq % 300}",
+                "user_name": "Bench Buyer", "user_company": "Bench LLC", "created_at": at,
+            }
+        entry = chain_entry(auction_id, seq, event_type, data, at, prev_hash)
+        prev_hash = entry["hash"]
+        entries.append(entry)
+    return entries
+
+
+def timed(fn) -> float:
+    started = time.perf_counter()
+    fn()
+    return time.perf_counter() - started
+
+
+async def timed_async(coro) -> tuple[float, object]:
+    started = time.perf_counter()
+    result = await coro
+    return time.perf_counter() - started, result
+
+
+def row(name: str, events: int, seconds: float) -> dict:
+    return {
+        "run": name,
+        "events": events,
+        "seconds": round(seconds, 3),
+        "events_per_sec": round(events / seconds) if seconds else "-",
+    }
+
+
+async def store(log_collection, snapshots, entries: list[dict]):
+    state = initial_state(entries[0]["auction_id"])
+    for start in range(0, len(entries), INSERT_BATCH):
+        batch = entries[start:start + INSERT_BATCH]
+        await log_collection.insert_many([dict(entry) for entry in batch], ordered=False)
+        for entry in batch:
+            apply_event(state, entry)
+            if entry["seq"] % SNAPSHOT_EVERY == 0:
+                await snapshots.insert_one(dict(state))
+
+
+async def main():
+    auction_id = str(uuid.uuid4())
+    rows = []
+
+    started = time.perf_counter()
+    entries = build_chain(auction_id, EVENTS)
+    rows.append(row("in memory: build chain", EVENTS, time.perf_counter() - started))
+
+    def fold():
+        state = initial_state(auction_id)
+        for entry in entries:
+            apply_event(state, entry)
+
+    def rehash():
+        for entry in entries:
+            assert entry_hash(entry) == entry["hash"]
+
+    rows.append(row("in memory: fold into state", EVENTS, timed(fold)))
+    rows.append(row("in memory: re-hash", EVENTS, timed(rehash)))
+
+    await client.drop_database(BENCH_DB_NAME)
+    database = client[BENCH_DB_NAME]
+    if not MONGOMOCK:
+        # mongomock enforces unique indexes by scanning the collection
+        await database.auction_log.create_index([("auction_id", 1), ("seq", 1)], unique=True)
+        await database.auction_log_snapshots.create_index([("auction_id", 1), ("seq", 1)], unique=True)
+    stored = entries[:STORED_EVENTS]
+    seconds, _ = await timed_async(store(database.auction_log, database.auction_log_snapshots, stored))
+    rows.append(row("stored: insert", STORED_EVENTS, seconds))
+    # verify() also checks the log against the auction's own count of events
+    await database.auctions.insert_one({"id": auction_id, "log_seq": STORED_EVENTS})
+
+    log = AuctionLog(database.auction_log, database.auction_log_snapshots, database.auctions)
+    seconds, latest = await timed_async(log.load_state(auction_id))
+    rows.append(row(f"stored: load_state (snapshot every {SNAPSHOT_EVERY})", STORED_EVENTS, seconds))
+    halfway = stored[len(stored) // 2]["at"]
+    seconds, _ = await timed_async(log.load_state(auction_id, at=halfway))
+    rows.append(row("stored: load_state as of halfway", STORED_EVENTS // 2, seconds))
+    no_snapshots = AuctionLog(database.auction_log, database.auction_log_snapshots_missing, database.auctions)
+    seconds, replayed = await timed_async(no_snapshots.load_state(auction_id))
+    rows.append(row("stored: full replay, no snapshots", STORED_EVENTS, seconds))
+    seconds, verified = await timed_async(log.verify(auction_id))
+    rows.append(row("stored: verify", STORED_EVENTS, seconds))
+    await client.drop_database(BENCH_DB_NAME)
+
+    print_table(f"Auction log replay ({'mongomock' if MONGOMOCK else 'mongod'})", rows)
+    print(f"\nsnapshot + tail equals full replay: {latest == replayed}; chain valid: {verified['valid']}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
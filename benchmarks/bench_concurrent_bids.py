@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Load test: thousands of concurrent bids against a single auction.
+
+Fires BIDS bids (default 5000) at one active auction with CONCURRENCY
+(default 500) in flight, through the same accept_bid path place_bid uses,
+then checks that no rule was violated:
+
+- every accepted bid beats the previously accepted one by at least 1%
+- bid_count and highest_bid_* on the auction match the stored bids
+
+    MONGO_URL=mongodb://localhost:27017 python -m benchmarks.bench_concurrent_bids
+"""
+
+import asyncio
+import os
+import random
+import sys
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta
+
+from fastapi import HTTPException
+
+from backend.auction_models import Bid
+from backend.bidding import MIN_INCREMENT, accept_bid
+from backend.database import client
+from benchmarks.common import print_table, summarize
+
+BENCH_DB_NAME = os.environ.get("BENCH_DB_NAME", "grain_app_bench")
+BIDS = int(os.environ.get("BIDS", 5000))
+CONCURRENCY = int(os.environ.get("CONCURRENCY", 500))
+STARTING_PRICE = 8000.0
+
+
+async def seed_auction(db) -> str:
+    await db.auctions.drop()
+    await db.bids.drop()
+    now = datetime.utcnow()
+    auction_id = str(uuid.uuid4())
+    await db.auctions.create_index("id", unique=True)
+    await db.auctions.insert_one({
+        "id": auction_id,
+        "grain_id": "1",
+        "grain_type": "Wheat",
+        "category": "1",
+        "moisture": "12%",
+        "protein": "14%",
+        "gluten": "28%",
+        "nature": "780 г/л",
+        "quantity": 500.0,
+        "starting_price": STARTING_PRICE,
+        "start_date": now - timedelta(hours=1),
+        "end_date": now + timedelta(hours=1),
+        "status": "active",
+        "winner_id": None,
+        "created_by": "bench",
+        "created_at": now,
+        "highest_bid_amount": None,
+        "highest_bid_id": None,
+        "bid_count": 0,
+    })
+    return auction_id
+
+
+def make_bid(auction_id: str, step: int) -> Bid:
+    # Amounts climb roughly with submission order but overlap heavily,
+    # so many concurrent bids race for the same minimum increment
+    amount = STARTING_PRICE * (MIN_INCREMENT ** (step / 20)) * random.uniform(1.0, 1.05)
+    return Bid(
+        auction_id=auction_id,
+        bid_amount=round(amount, 2),
+        payment_type="cashless",
+        delivery_location="Odesa",
+        user_id=f"buyer-{step % 50}",
+        user_name="Bench Buyer",
+        user_company="Bench LLC",
+    )
+
+
+async def verify(db, auction_id: str, accepted: int) -> list[str]:
+    violations = []
+    auction = await db.auctions.find_one({"id": auction_id})
+    bids = await db.bids.find({"auction_id": auction_id}).sort("bid_amount", 1).to_list(None)
+
+    previous = STARTING_PRICE
+    for bid in bids:
+        if bid["bid_amount"] < previous * MIN_INCREMENT:
+            violations.append(f"bid {bid['id']} {bid['bid_amount']} < {previous} * {MIN_INCREMENT}")
+        previous = bid["bid_amount"]
+
+    if len(bids) != accepted:
+        violations.append(f"{len(bids)} bids stored, {accepted} accepted")
+    if auction["bid_count"] != accepted:
+        violations.append(f"bid_count {auction['bid_count']} != {accepted} accepted")
+    if bids and (auction["highest_bid_amount"], auction["highest_bid_id"]) != (bids[-1]["bid_amount"], bids[-1]["id"]):
+        violations.append("highest_bid_* does not match the highest stored bid")
+    return violations
+
+
+async def main() -> int:
+    db = client[BENCH_DB_NAME]
+    auction_id = await seed_auction(db)
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+    outcomes = Counter()
+    latencies = []
+
+    async def submit(step: int):
+        bid = make_bid(auction_id, step)
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                await accept_bid(bid, auctions=db.auctions, bids=db.bids)
+                outcomes["accepted"] += 1
+            except HTTPException as e:
+                outcomes[f"rejected_{e.status_code}"] += 1
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(submit(step) for step in range(BIDS)))
+    elapsed = time.perf_counter() - started
+
+    violations = await verify(db, auction_id, outcomes["accepted"])
+    await client.drop_database(BENCH_DB_NAME)
+
+    stats = summarize(latencies)
+    print_table("Concurrent bids on one auction", [{
+        "bids": BIDS,
+        "concurrency": CONCURRENCY,
+        **dict(outcomes),
+        "bids_per_sec": round(BIDS / elapsed),
+        "p50_ms": stats["p50_ms"],
+        "p99_ms": stats["p99_ms"],
+        "violations": len(violations),
+    }])
+    for violation in violations[:20]:
+        print(f"❌ {violation}")
+    return 1 if violations else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Benchmark: streaming bid export throughput and memory.
+
+Seeds ROWS bids (default 1,000,000) into a throwaway database, then streams
+the export in each format through the same generators the endpoint uses,
+discarding the bytes. Reports rows/s, output size and peak RSS; peak RSS
+should stay flat as ROWS grows.
+
+    MONGO_URL=mongodb://localhost:27017 python -m benchmarks.bench_export
+"""
+
+import asyncio
+import os
+import resource
+import time
+import uuid
+from datetime import datetime, timedelta
+
+import backend.export_routes as export_routes
+from backend.database import client
+from backend.export_routes import EXPORTS, ExportFormat, encode_bytes, encode_rows, export_cursor
+from benchmarks.common import print_table
+
+BENCH_DB_NAME = os.environ.get("BENCH_DB_NAME", "grain_app_bench")
+ROWS = int(os.environ.get("ROWS", 1_000_000))
+SEED_BATCH = 10_000
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is in kilobytes on Linux
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+async def seed(db):
+    await db.bids.drop()
+    await db.bids.create_index("created_at")
+    started = datetime.utcnow() - timedelta(days=30)
+    for offset in range(0, ROWS, SEED_BATCH):
+        await db.bids.insert_many([
+            {
+                "id": str(uuid.uuid4()),
+                "auction_id": f"auction-{i % 500}",
+                "bid_amount": 8000 + i % 1000,
+                "payment_type": "cashless",
+                "delivery_location": "Odesa",
+                "user_id": f"buyer-{i % 200}",
+                "user_name": "Bench Buyer",
+                "user_company": "Bench LLC",
+                "created_at": started + timedelta(seconds=i),
+            }
+            for i in range(offset, min(offset + SEED_BATCH, ROWS))
+        ], ordered=False)
+
+
+async def run_export(fmt: ExportFormat, gzip: bool) -> dict:
+    _, columns = EXPORTS["bids"]
+    size = 0
+    started = time.perf_counter()
+    async for chunk in encode_bytes(encode_rows(export_cursor("bids"), columns, fmt), gzip):
+        size += len(chunk)
+    elapsed = time.perf_counter() - started
+    return {
+        "format": fmt.value + (" + gzip" if gzip else ""),
+        "rows": ROWS,
+        "rows_per_sec": round(ROWS / elapsed),
+        "output_mb": round(size / 1024 / 1024, 1),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+async def main():
+    db = client[BENCH_DB_NAME]
+    await seed(db)
+    # Point the export at the benchmark database
+    EXPORTS["bids"] = (db.bids, EXPORTS["bids"][1])
+    print(f"Seeded {ROWS} bids, peak RSS {peak_rss_mb()} MB before exporting")
+
+    rows = []
+    for fmt in ExportFormat:
+        for gzip in (False, True):
+            rows.append(await run_export(fmt, gzip))
+
+    await client.drop_database(BENCH_DB_NAME)
+    print_table(f"Streaming bid export (chunk {export_routes.CHUNK_SIZE // 1024} KB)", rows)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
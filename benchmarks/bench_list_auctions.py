@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Benchmark: auction listing, per-auction N+1 loop vs the current listing
+(bid summary denormalized on the auction document).
+
+Seeds a throwaway database (BENCH_DB_NAME, default "grain_app_bench") with
+10, 100 and 10,000 auctions and a few bids each, then times both listing
+strategies over all auctions (the current one paging with cursors), plus
+the cost of a single page.
+
+    MONGO_URL=mongodb://localhost:27017 python -m benchmarks.bench_list_auctions
+"""
+
+import asyncio
+import os
+import random
+import uuid
+from datetime import datetime, timedelta
+
+from backend.database import client
+from backend.auction_listing import fetch_auction_listing
+from backend.indexes import ensure_indexes
+from benchmarks.common import print_table, summarize, time_async
+
+BENCH_DB_NAME = os.environ.get("BENCH_DB_NAME", "grain_app_bench")
+SIZES = (10, 100, 10_000)
+BIDS_PER_AUCTION = 5
+REPEAT = 5
+
+
+def make_auction(now: datetime) -> dict:
+    return {
+        "id": str(uuid.uuid4()),
+        "grain_id": "1",
+        "grain_type": "Wheat",
+        "category": "1",
+        "moisture": "12%",
+        "protein": "14%",
+        "gluten": "28%",
+        "nature": "780 г/л",
+        "quantity": 500.0,
+        "starting_price": 8000.0,
+        "start_date": now - timedelta(days=1),
+        "end_date": now + timedelta(days=1),
+        "status": "active",
+        "winner_id": None,
+        "created_by": "bench",
+        "created_at": now,
+    }
+
+
+def make_bids(auction: dict) -> list[dict]:
+    price = auction["starting_price"]
+    bids = []
+    for _ in range(BIDS_PER_AUCTION):
+        price = round(price * random.uniform(1.01, 1.05), 2)
+        bids.append({
+            "id": str(uuid.uuid4()),
+            "auction_id": auction["id"],
+            "bid_amount": price,
+            "payment_type": "cashless",
+            "delivery_location": "Odesa",
+            "user_id": "bench",
+            "user_name": "Bench Buyer",
+            "user_company": "Bench LLC",
+            "created_at": datetime.utcnow(),
+        })
+    return bids
+
+
+async def seed(db, size: int):
+    await db.auctions.drop()
+    await db.bids.drop()
+    await ensure_indexes(db)
+    now = datetime.utcnow()
+    auctions = [make_auction(now) for _ in range(size)]
+    bids = []
+    for auction in auctions:
+        auction_bids = make_bids(auction)
+        auction["highest_bid_amount"] = auction_bids[-1]["bid_amount"]
+        auction["highest_bid_id"] = auction_bids[-1]["id"]
+        auction["bid_count"] = len(auction_bids)
+        bids.extend(auction_bids)
+    await db.auctions.insert_many(auctions)
+    await db.bids.insert_many(bids)
+
+
+async def legacy_listing(db, limit: int):
+    """The old list_auctions loop: two bid queries per auction"""
+    auctions = await db.auctions.find().to_list(limit)
+    result = []
+    for auction in auctions:
+        highest_bid = await db.bids.find_one(
+            {"auction_id": auction["id"]},
+            sort=[("bid_amount", -1)]
+        )
+        total_bids = await db.bids.count_documents({"auction_id": auction["id"]})
+        auction["current_highest_bid"] = highest_bid["bid_amount"] if highest_bid else None
+        auction["total_bids"] = total_bids
+        result.append(auction)
+    return result
+
+
+async def paged_listing(db):
+    """The current listing, following cursors until every auction is read"""
+    auctions, cursor = await fetch_auction_listing(collection=db.auctions)
+    while cursor:
+        page, cursor = await fetch_auction_listing(cursor=cursor, collection=db.auctions)
+        auctions += page
+    return auctions
+
+
+async def first_page(db):
+    return await fetch_auction_listing(collection=db.auctions)
+
+
+async def main():
+    db = client[BENCH_DB_NAME]
+    rows = []
+    for size in SIZES:
+        await seed(db, size)
+        repeat = 1 if size >= 10_000 else REPEAT
+
+        legacy = summarize(await time_async(lambda: legacy_listing(db, size), repeat))
+        current = summarize(await time_async(lambda: paged_listing(db), repeat))
+        page = summarize(await time_async(lambda: first_page(db), REPEAT))
+        rows.append({
+            "auctions": size,
+            "legacy_p50_ms": legacy["p50_ms"],
+            "listing_p50_ms": current["p50_ms"],
+            "speedup": round(legacy["p50_ms"] / current["p50_ms"], 1) if current["p50_ms"] else "-",
+            "one_page_p50_ms": page["p50_ms"],
+        })
+
+    await client.drop_database(BENCH_DB_NAME)
+    print_table("GET /auctions/list backend latency", rows)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark: bid latency while logins are running.
+
+Keeps a steady stream of bids going through accept_bid for DURATION seconds
+(default 10) in three scenarios:
+
+- no logins
+- 50 logins/s verifying bcrypt inline on the event loop (the old login path)
+- 50 logins/s verifying through the bounded password pool
+
+    MONGO_URL=mongodb://localhost:27017 python -m benchmarks.bench_login_contention
+"""
+
+import asyncio
+import os
+import time
+
+from fastapi import HTTPException
+
+from backend.auth import hash_password, verify_password
+from backend.bidding import accept_bid
+from backend.database import client
+from backend.password_pool import password_pool
+from benchmarks.bench_concurrent_bids import BENCH_DB_NAME, make_bid, seed_auction
+from benchmarks.common import print_table, summarize
+
+DURATION = float(os.environ.get("DURATION", 10))
+LOGINS_PER_SECOND = int(os.environ.get("LOGINS_PER_SECOND", 50))
+BID_CONCURRENCY = int(os.environ.get("BID_CONCURRENCY", 20))
+PASSWORD = "correct horse battery staple"
+
+
+async def bid_worker(db, auction_id: str, deadline: float, latencies: list[float], counter: list[int]):
+    while time.perf_counter() < deadline:
+        counter[0] += 1
+        bid = make_bid(auction_id, counter[0])
+        started = time.perf_counter()
+        # Yield even when the driver answers without real I/O (mongomock),
+        # so time spent waiting for a blocked event loop is counted
+        await asyncio.sleep(0)
+        try:
+            await accept_bid(bid, auctions=db.auctions, bids=db.bids)
+        except HTTPException:
+            pass
+        latencies.append((time.perf_counter() - started) * 1000)
+
+
+async def login_driver(mode: str, hashed: str, deadline: float) -> int:
+    interval = 1 / LOGINS_PER_SECOND
+    tasks = []
+
+    async def login():
+        if mode == "inline":
+            verify_password(PASSWORD, hashed)
+        else:
+            await password_pool.verify(PASSWORD, hashed)
+
+    while time.perf_counter() < deadline:
+        tasks.append(asyncio.create_task(login()))
+        await asyncio.sleep(interval)
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    return sum(1 for result in results if isinstance(result, HTTPException))
+
+
+async def run_scenario(db, mode: str, hashed: str) -> dict:
+    auction_id = await seed_auction(db)
+    latencies: list[float] = []
+    counter = [0]
+    deadline = time.perf_counter() + DURATION
+
+    workers = [bid_worker(db, auction_id, deadline, latencies, counter) for _ in range(BID_CONCURRENCY)]
+    shed = 0
+    if mode == "none":
+        await asyncio.gather(*workers)
+    else:
+        _, shed = await asyncio.gather(asyncio.gather(*workers), login_driver(mode, hashed, deadline))
+
+    stats = summarize(latencies)
+    return {
+        "logins": mode if mode == "none" else f"{LOGINS_PER_SECOND}/s {mode}",
+        "bids": len(latencies),
+        "bid_p50_ms": stats["p50_ms"],
+        "bid_p99_ms": stats["p99_ms"],
+        "bid_max_ms": stats["max_ms"],
+        "logins_shed_503": shed,
+    }
+
+
+async def main():
+    db = client[BENCH_DB_NAME]
+    hashed = hash_password(PASSWORD)
+    rows = [await run_scenario(db, mode, hashed) for mode in ("none", "inline", "pool")]
+    await client.drop_database(BENCH_DB_NAME)
+    password_pool.shutdown()
+
+    print_table(f"Bid latency under login load ({DURATION:.0f}s per scenario)", rows)
+    print(f"Password pool: {password_pool.stats()}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
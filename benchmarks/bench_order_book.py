@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Benchmark: order book matching throughput.
+
+Submits ORDERS (default 200,000) random limit orders - buy or sell, prices
+within PRICE_LEVELS ticks of 8,000 UAH, 1-100 tonnes - with CANCEL_RATE of
+them cancelled again, and reports orders/sec and fills:
+
+- matching: the in-memory OrderBook alone
+- persisted: SharedOrderBook, each order and cancel stored in
+  order_book_events before it is matched. CLIENTS concurrent submitters
+  (default 1,000) keep batches of up to ORDER_BOOK_BATCH_SIZE in flight.
+- a second replica then catches up from the stored events and is
+  compared with the first
+
+    python -m benchmarks.bench_order_book
+    MONGO_URL=mongodb://localhost:27017 python -m benchmarks.bench_order_book
+"""
+
+import asyncio
+import os
+import random
+import time
+
+from benchmarks.common import print_table, use_mongo_standin
+
+BENCH_DB_NAME = os.environ.get("BENCH_DB_NAME", "grain_app_bench")
+MONGOMOCK = use_mongo_standin()
+os.environ["DB_NAME"] = BENCH_DB_NAME
+
+from backend.database import client  # noqa: E402
+from backend.indexes import ensure_indexes  # noqa: E402
+from backend.order_book import BUY, SELL, OrderBook, SharedOrderBook  # noqa: E402
+
+ORDERS = int(os.environ.get("ORDERS", 200_000))
+# mongomock inserts are orders of magnitude slower than a mongod
+PERSISTED_ORDERS = int(os.environ.get("PERSISTED_ORDERS", 20_000 if MONGOMOCK else ORDERS))
+CLIENTS = int(os.environ.get("CLIENTS", 1000))
+PRICE_LEVELS = 50
+TICK = 10.0
+CANCEL_RATE = 0.1
+SEED = 42
+
+
+def order_flow(count: int) -> list[tuple]:
+    """(side, price, quantity, owner, cancel) tuples, the same for every run"""
+    rng = random.Random(SEED)
+    flow = []
+    for i in range(count):
+        side = BUY if rng.random() < 0.5 else SELL
+        # Buyers lean low and sellers high, so part of the flow rests
+        skew = -2 if side == BUY else 2
+        price = 8000.0 + (rng.randint(-PRICE_LEVELS, PRICE_LEVELS) + skew) * TICK
+        quantity = float(rng.randint(1, 100))
+        flow.append((side, price, quantity, f"trader-{i % 500}", rng.random() < CANCEL_RATE))
+    return flow
+
+
+def run(book: OrderBook, flow: list[tuple]) -> tuple[float, int]:
+    fills = 0
+    started = time.perf_counter()
+    for i, (side, price, quantity, owner, cancel) in enumerate(flow):
+        fills += len(book.submit(side, price, quantity, owner, f"order-{i}"))
+        if cancel:
+            book.cancel(f"order-{i}")
+    return time.perf_counter() - started, fills
+
+
+async def run_persisted(book: SharedOrderBook, flow: list[tuple]) -> tuple[float, int]:
+    fills = 0
+
+    async def submitter(client_index: int):
+        nonlocal fills
+        for i in range(client_index, len(flow), CLIENTS):
+            side, price, quantity, owner, cancel = flow[i]
+            traded = await book.submit(side, price, quantity, owner, f"order-{i}")
+            fills += len(traded)
+            if cancel:
+                await book.cancel(f"order-{i}")
+
+    started = time.perf_counter()
+    await asyncio.gather(*(submitter(i) for i in range(CLIENTS)))
+    return time.perf_counter() - started, fills
+
+
+def row(name: str, orders: int, seconds: float, fills: int) -> dict:
+    return {
+        "run": name,
+        "orders": orders,
+        "seconds": round(seconds, 3),
+        "orders_per_sec": round(orders / seconds),
+        "us_per_order": round(seconds / orders * 1e6, 2),
+        "fills": fills,
+    }
+
+
+async def main():
+    flow = order_flow(ORDERS)
+    rows = []
+
+    seconds, fills = run(OrderBook("bench"), flow)
+    rows.append(row("matching", ORDERS, seconds, fills))
+
+    await client.drop_database(BENCH_DB_NAME)
+    database = client[BENCH_DB_NAME]
+    if not MONGOMOCK:
+        # mongomock enforces unique indexes by scanning the collection, and
+        # one replica never collides with itself
+        await ensure_indexes(database)
+    book = SharedOrderBook("bench", database.order_book_events)
+    seconds, fills = await run_persisted(book, flow[:PERSISTED_ORDERS])
+    rows.append(row(f"persisted ({CLIENTS} clients)", PERSISTED_ORDERS, seconds, fills))
+
+    replica = SharedOrderBook("bench", database.order_book_events)
+    started = time.perf_counter()
+    reloaded = await replica.sync()
+    reload_seconds = time.perf_counter() - started
+    await client.drop_database(BENCH_DB_NAME)
+
+    print_table(f"Order book ({'mongomock' if MONGOMOCK else 'mongod'})", rows)
+    same = all(reloaded.depth(side, 1000) == book.book.depth(side, 1000) for side in (BUY, SELL))
+    print(f"\nreplica caught up on {reloaded.seq} events in {reload_seconds * 1000:.0f} ms, "
+          f"book {'matches' if same else 'DIFFERS'}")
+    print(f"best bid {book.book.best_bid()}, best ask {book.book.best_ask()}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
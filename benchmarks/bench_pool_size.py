@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark: bid throughput against Motor connection pool size.
+
+For each maxPoolSize in POOL_SIZES (default 1,2,5,10,25,50,100) the client
+is reopened with that pool and BIDS bids (default 5000) are pushed through
+accept_bid with CONCURRENCY (default 200) in flight. The bids are spread
+over AUCTIONS auctions (default 50), so they contend for connections more
+than for documents. Reports bids/s, latency and pool usage; throughput
+should level off once the pool stops being the bottleneck.
+
+    MONGO_URL=mongodb://localhost:27017 python -m benchmarks.bench_pool_size
+"""
+
+import asyncio
+import os
+import time
+from collections import Counter
+
+from fastapi import HTTPException
+
+import backend.database as database_module
+from backend.bidding import accept_bid
+from backend.database import client, database, pool_stats
+from benchmarks.bench_concurrent_bids import BENCH_DB_NAME, make_bid, seed_auction
+from benchmarks.common import print_table, summarize
+
+POOL_SIZES = [int(size) for size in os.environ.get("POOL_SIZES", "1,2,5,10,25,50,100").split(",")]
+BIDS = int(os.environ.get("BIDS", 5000))
+CONCURRENCY = int(os.environ.get("CONCURRENCY", 200))
+AUCTIONS = int(os.environ.get("AUCTIONS", 50))
+
+
+async def seed_auctions(db) -> list[str]:
+    auction_id = await seed_auction(db)
+    template = await db.auctions.find_one({"id": auction_id}, {"_id": 0})
+    others = [{**template, "id": f"{auction_id}-{i}"} for i in range(1, AUCTIONS)]
+    if others:
+        await db.auctions.insert_many(others)
+    return [auction_id] + [auction["id"] for auction in others]
+
+
+async def run(pool_size: int) -> dict:
+    database_module.MONGO_MAX_POOL_SIZE = pool_size
+    database.close()
+    db = client[BENCH_DB_NAME]
+    auction_ids = await seed_auctions(db)
+    checkouts_before = pool_stats.checkouts
+
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+    outcomes = Counter()
+    latencies = []
+    peak_checked_out = 0
+
+    async def submit(step: int):
+        nonlocal peak_checked_out
+        bid = make_bid(auction_ids[step % len(auction_ids)], step // len(auction_ids))
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                await accept_bid(bid, auctions=db.auctions, bids=db.bids)
+                outcomes["accepted"] += 1
+            except HTTPException as e:
+                outcomes[f"rejected_{e.status_code}"] += 1
+            latencies.append((time.perf_counter() - started) * 1000)
+            peak_checked_out = max(peak_checked_out, pool_stats.checked_out)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(submit(step) for step in range(BIDS)))
+    elapsed = time.perf_counter() - started
+
+    stats = summarize(latencies)
+    return {
+        "max_pool_size": pool_size,
+        "bids_per_sec": round(BIDS / elapsed),
+        "p50_ms": stats["p50_ms"],
+        "p95_ms": stats["p95_ms"],
+        "p99_ms": stats["p99_ms"],
+        "accepted": outcomes["accepted"],
+        "connections": pool_stats.open,
+        "peak_checked_out": peak_checked_out,
+        "checkouts": pool_stats.checkouts - checkouts_before,
+    }
+
+
+async def main():
+    rows = [await run(pool_size) for pool_size in POOL_SIZES]
+    await client.drop_database(BENCH_DB_NAME)
+    database.close()
+    print_table(f"Bid throughput by pool size ({BIDS} bids, {CONCURRENCY} in flight, {AUCTIONS} auctions)", rows)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: response serialization, model-per-row vs validate-once + orjson.
+
+CPU only, no database. For lists of 100 and 1,000 auctions (and bids) it
+compares the previous handler path - build a model per Mongo dict, let
+FastAPI validate against response_model and render with json - with
+validated_response().
+
+    python -m benchmarks.bench_serialization
+"""
+
+import asyncio
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from backend.auction_models import AuctionResponse, BidResponse
+from backend.auction_routes import auction_list_adapter, bid_list_adapter
+from backend.serialization import validated_response
+from benchmarks.common import print_table, summarize
+
+SIZES = (100, 1000)
+REPEAT = 50
+
+
+def auction_doc(i: int) -> dict:
+    now = datetime(2025, 7, 1, 9, 0)
+    return {
+        "id": str(uuid.uuid4()), "grain_id": "1", "grain_type": "Wheat", "category": "1",
+        "moisture": "12%", "protein": "14%", "gluten": "28%", "nature": "780 г/л",
+        "quantity": 500.0, "starting_price": 8000.0,
+        "start_date": now, "end_date": now + timedelta(hours=8),
+        "status": "active", "winner_id": None, "created_by": "admin", "created_at": now,
+        "highest_bid_amount": 8100.0 + i, "highest_bid_id": str(uuid.uuid4()), "bid_count": i % 40,
+        "current_highest_bid": 8100.0 + i, "total_bids": i % 40,
+    }
+
+
+def bid_doc(i: int) -> dict:
+    return {
+        "id": str(uuid.uuid4()), "auction_id": "auction", "bid_amount": 8000.0 + i,
+        "user_name": "Bench Buyer", "user_company": "Bench LLC", "created_at": datetime(2025, 7, 1, 9, 0),
+    }
+
+
+async def legacy_path(model, field, docs: list[dict]) -> bytes:
+    content = [model(**doc) for doc in docs]
+    serialized = await serialize_response(field=field, response_content=content)
+    return JSONResponse(serialized).body
+
+
+async def fast_path(adapter, docs: list[dict]) -> bytes:
+    return validated_response(adapter, docs).body
+
+
+async def measure(fn) -> dict:
+    samples = []
+    for _ in range(REPEAT):
+        started = time.perf_counter()
+        await fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return summarize(samples)
+
+
+async def main():
+    cases = [
+        ("auctions", AuctionResponse, auction_list_adapter, auction_doc),
+        ("bids", BidResponse, bid_list_adapter, bid_doc),
+    ]
+    rows = []
+    for name, model, adapter, make_doc in cases:
+        field = create_response_field(name="response", type_=list[model])
+        for size in SIZES:
+            docs = [make_doc(i) for i in range(size)]
+            legacy = await measure(lambda: legacy_path(model, field, docs))
+            fast = await measure(lambda: fast_path(adapter, docs))
+            rows.append({
+                "payload": f"{size} {name}",
+                "legacy_p50_ms": legacy["p50_ms"],
+                "orjson_p50_ms": fast["p50_ms"],
+                "speedup": round(legacy["p50_ms"] / fast["p50_ms"], 1) if fast["p50_ms"] else "-",
+            })
+    print_table("Response serialization", rows)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
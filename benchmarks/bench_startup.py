@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Benchmark: worker cold start.
+
+- import: seconds to import backend.server in a fresh interpreter
+  (median of IMPORT_RUNS, default 5)
+- startup: for a first worker on an empty database (which applies the
+  migrations, bcrypt hash included) and for WORKERS later workers
+  (default 3), the time until the lifespan hands over and the app serves
+  /health/live, and the time until /health/ready answers 200
+
+    python -m benchmarks.bench_startup
+    MONGO_URL=mongodb://localhost:27017 python -m benchmarks.bench_startup
+"""
+
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks.common import print_table, use_mongo_standin
+
+BENCH_DB_NAME = os.environ.get("BENCH_DB_NAME", "grain_app_bench")
+MONGOMOCK = use_mongo_standin()
+os.environ["DB_NAME"] = BENCH_DB_NAME
+
+import httpx  # noqa: E402
+
+from backend.database import client  # noqa: E402
+from backend.server import app, lifespan  # noqa: E402
+
+IMPORT_RUNS = int(os.environ.get("IMPORT_RUNS", 5))
+WORKERS = int(os.environ.get("WORKERS", 3))
+READY_POLL_SECONDS = 0.005
+
+
+def import_seconds() -> float:
+    code = "import time; started = time.perf_counter(); import backend.server; print(time.perf_counter() - started)"
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True,
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+async def start_worker(name: str) -> dict:
+    started = time.perf_counter()
+    async with lifespan(app):
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://startup") as http:
+            assert (await http.get("/health/live")).status_code == 200
+            serving = time.perf_counter() - started
+            while (await http.get("/health/ready")).status_code != 200:
+                await asyncio.sleep(READY_POLL_SECONDS)
+            ready = time.perf_counter() - started
+    return {"worker": name, "serving_ms": round(serving * 1000, 1), "ready_ms": round(ready * 1000, 1)}
+
+
+async def main():
+    await client.drop_database(BENCH_DB_NAME)
+    rows = [await start_worker("first (applies migrations)")]
+    rows += [await start_worker(f"next #{i + 1}") for i in range(WORKERS)]
+    await client.drop_database(BENCH_DB_NAME)
+
+    imports = [import_seconds() for _ in range(IMPORT_RUNS)]
+    print_table(f"Worker startup ({'mongomock' if MONGOMOCK else 'mongod'})", rows)
+    print(f"\nimport backend.server: median {statistics.median(imports) * 1000:.0f} ms over {IMPORT_RUNS} runs")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
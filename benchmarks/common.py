@@ -0,0 +1,66 @@
+"""Shared helpers for the backend benchmark scripts"""
+
+import math
+import os
+import statistics
+import time
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of samples"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(samples_ms: list[float]) -> dict:
+    """Latency summary in milliseconds"""
+    return {
+        "runs": len(samples_ms),
+        "mean_ms": round(statistics.fmean(samples_ms), 3) if samples_ms else 0.0,
+        "p50_ms": round(percentile(samples_ms, 50), 3),
+        "p95_ms": round(percentile(samples_ms, 95), 3),
+        "p99_ms": round(percentile(samples_ms, 99), 3),
+        "max_ms": round(max(samples_ms), 3) if samples_ms else 0.0,
+    }
+
+
+async def time_async(fn, repeat: int) -> list[float]:
+    """Await fn() `repeat` times and return the latencies in milliseconds"""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def print_table(title: str, rows: list[dict]):
+    """Print benchmark rows as an aligned table"""
+    print(f"\n=== {title} ===")
+    if not rows:
+        return
+    columns = list(rows[0].keys())
+    widths = {c: max(len(c), *(len(str(r[c])) for r in rows)) for c in columns}
+    print("  ".join(c.ljust(widths[c]) for c in columns))
+    for row in rows:
+        print("  ".join(str(row[c]).ljust(widths[c]) for c in columns))
+
+
+def use_mongo_standin() -> bool:
+    """Swap Motor's client for mongomock-motor unless MONGO_URL points at a real mongod.
+
+    Must run before anything imports backend.database. Every client handed
+    out is the same in-memory one, so data survives the app reopening its
+    client. Returns True if the stand-in is in use.
+    """
+    if not os.environ.setdefault("MONGO_URL", "mongomock://").startswith("mongomock://"):
+        return False
+    import motor.motor_asyncio
+    from mongomock_motor import AsyncMongoMockClient
+
+    standin = AsyncMongoMockClient()
+    motor.motor_asyncio.AsyncIOMotorClient = lambda url, **kwargs: standin
+    return True
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Load test: the auction hot paths through the full HTTP stack.
+
+Seeds AUCTIONS active auctions (default 200) and BUYERS approved buyers
+(default 100) into a throwaway database, then drives the app in-process
+over ASGI (no sockets, no network) with CONCURRENCY clients (default 50)
+for DURATION seconds (default 10) per scenario:
+
+- list:  GET  /api/auctions/list?status=active
+- bid:   POST /api/auctions/bid on a random auction, 1-5% over the last
+         price the client saw, so concurrent clients contend realistically
+- login: POST /api/auth/login as a random buyer (bcrypt through the pool)
+
+Reports throughput and p50/p95/p99 latency per scenario and writes them,
+with the run configuration, to OUTPUT (default
+benchmarks/results/load-<timestamp>.json). Pass an earlier result file to
+print the change against it.
+
+Runs against mongomock-motor unless MONGO_URL points at a real mongod:
+
+    python -m benchmarks.load_test
+    MONGO_URL=mongodb://localhost:27017 python -m benchmarks.load_test benchmarks/results/load-20250701-090000.json
+"""
+
+import asyncio
+import json
+import os
+import platform
+import random
+import sys
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta
+
+from benchmarks.common import print_table, summarize, use_mongo_standin
+
+BENCH_DB_NAME = os.environ.get("BENCH_DB_NAME", "grain_app_bench")
+# backend.database binds the client class at import, so swap it first
+MONGOMOCK = use_mongo_standin()
+# The app's collections must point at the benchmark database, never a real one
+os.environ["DB_NAME"] = BENCH_DB_NAME
+
+import httpx  # noqa: E402
+
+from backend.auth import create_access_token, hash_password  # noqa: E402
+from backend.database import client, db  # noqa: E402
+from backend.indexes import ensure_indexes  # noqa: E402
+from backend.server import app  # noqa: E402
+
+AUCTIONS = int(os.environ.get("AUCTIONS", 200))
+BUYERS = int(os.environ.get("BUYERS", 100))
+CONCURRENCY = int(os.environ.get("CONCURRENCY", 50))
+DURATION = float(os.environ.get("DURATION", 10))
+SCENARIOS = os.environ.get("SCENARIOS", "list,bid,login").split(",")
+OUTPUT = os.environ.get("OUTPUT") or f"benchmarks/results/load-{datetime.utcnow():%Y%m%d-%H%M%S}.json"
+PASSWORD = "correct horse battery staple"
+STARTING_PRICE = 8000.0
+
+
+async def seed() -> tuple[list[dict], list[str]]:
+    """Fresh auctions and approved buyers; returns the buyers and auction ids"""
+    for name in ("auctions", "bids", "users"):
+        await db[name].drop()
+    await ensure_indexes(db)
+
+    now = datetime.utcnow()
+    auction_ids = [str(uuid.uuid4()) for _ in range(AUCTIONS)]
+    await db.auctions.insert_many([
+        {
+            "id": auction_id, "grain_id": "1", "grain_type": "Пшениця", "category": "2",
+            "moisture": "13%", "protein": "12.5%", "gluten": "23%", "nature": "760 г/л",
+            "quantity": 500.0, "starting_price": STARTING_PRICE,
+            "start_date": now - timedelta(hours=1), "end_date": now + timedelta(days=1),
+            "status": "active", "winner_id": None, "created_by": "load-test",
+            "created_at": now - timedelta(seconds=i), "bid_count": 0,
+        }
+        for i, auction_id in enumerate(auction_ids)
+    ])
+
+    # One bcrypt hash shared by every buyer keeps seeding fast
+    hashed = hash_password(PASSWORD)
+    buyers = [
+        {
+            "id": str(uuid.uuid4()), "email": f"buyer{i}@example.com", "hashed_password": hashed,
+            "full_name": f"Load Buyer {i}", "company_name": "Load LLC", "edrpou": "12345678",
+            "phone": "+380000000000", "role": "buyer", "accreditation_status": "approved",
+            "created_at": now, "updated_at": now,
+        }
+        for i in range(BUYERS)
+    ]
+    await db.users.insert_many([dict(buyer) for buyer in buyers])
+    for buyer in buyers:
+        buyer["token"] = create_access_token({
+            "sub": buyer["id"], "email": buyer["email"], "role": "buyer", "accreditation_status": "approved",
+        })
+    return buyers, auction_ids
+
+
+class Scenario:
+    """One request shape; request() returns the response status code"""
+
+    def __init__(self, http: httpx.AsyncClient, buyers: list[dict], auction_ids: list[str]):
+        self.http = http
+        self.buyers = buyers
+        self.auction_ids = auction_ids
+        # Last price each client has seen per auction, shared by all clients
+        self.prices = dict.fromkeys(auction_ids, STARTING_PRICE)
+
+    def headers(self) -> dict:
+        return {"Authorization": f"Bearer {random.choice(self.buyers)['token']}"}
+
+    async def list(self) -> int:
+        response = await self.http.get(
+            "/api/auctions/list", params={"status": "active", "limit": 50}, headers=self.headers()
+        )
+        return response.status_code
+
+    async def bid(self) -> int:
+        auction_id = random.choice(self.auction_ids)
+        amount = round(self.prices[auction_id] * random.uniform(1.01, 1.05), 2)
+        response = await self.http.post("/api/auctions/bid", headers=self.headers(), json={
+            "auction_id": auction_id, "bid_amount": amount,
+            "payment_type": "cashless", "delivery_location": "Одеса",
+        })
+        # Accepted or outbid, the price has moved at least this far
+        self.prices[auction_id] = max(self.prices[auction_id], amount)
+        return response.status_code
+
+    async def login(self) -> int:
+        response = await self.http.post(
+            "/api/auth/login", json={"email": random.choice(self.buyers)["email"], "password": PASSWORD}
+        )
+        return response.status_code
+
+
+async def run_scenario(name: str, scenario: Scenario) -> dict:
+    request = getattr(scenario, name)
+    latencies: list[float] = []
+    statuses: Counter = Counter()
+    deadline = time.perf_counter() + DURATION
+
+    async def client_loop():
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            statuses[await request()] += 1
+            latencies.append((time.perf_counter() - started) * 1000)
+            # mongomock answers without real I/O; let other clients run
+            await asyncio.sleep(0)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client_loop() for _ in range(CONCURRENCY)))
+    elapsed = time.perf_counter() - started
+
+    stats = summarize(latencies)
+    return {
+        "scenario": name,
+        "requests": stats["runs"],
+        "rps": round(stats["runs"] / elapsed, 1),
+        "p50_ms": stats["p50_ms"],
+        "p95_ms": stats["p95_ms"],
+        "p99_ms": stats["p99_ms"],
+        "max_ms": stats["max_ms"],
+        "statuses": dict(sorted(statuses.items())),
+    }
+
+
+def compare(results: list[dict], baseline_path: str):
+    with open(baseline_path) as f:
+        baseline = {row["scenario"]: row for row in json.load(f)["results"]}
+    rows = []
+    for row in results:
+        before = baseline.get(row["scenario"])
+        if not before:
+            continue
+        rows.append({
+            "scenario": row["scenario"],
+            **{
+                f"{key}_change": f"{(row[key] - before[key]) / before[key] * 100:+.1f}%" if before[key] else "-"
+                for key in ("rps", "p50_ms", "p95_ms", "p99_ms")
+            },
+        })
+    print_table(f"Change against {baseline_path}", rows)
+
+
+async def main():
+    buyers, auction_ids = await seed()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://load-test") as http:
+        scenario = Scenario(http, buyers, auction_ids)
+        results = [await run_scenario(name, scenario) for name in SCENARIOS]
+    await client.drop_database(BENCH_DB_NAME)
+
+    print_table(
+        f"Load test: {CONCURRENCY} clients x {DURATION:g}s, {AUCTIONS} auctions, {BUYERS} buyers",
+        [{k: v for k, v in row.items() if k != "statuses"} for row in results],
+    )
+    for row in results:
+        print(f"{row['scenario']}: {row['statuses']}")
+
+    os.makedirs(os.path.dirname(OUTPUT) or ".", exist_ok=True)
+    with open(OUTPUT, "w") as f:
+        json.dump({
+            "created_at": datetime.utcnow().isoformat(),
+            "config": {
+                "mongo": "mongomock" if MONGOMOCK else "mongod",
+                "auctions": AUCTIONS, "buyers": BUYERS,
+                "concurrency": CONCURRENCY, "duration_s": DURATION,
+                "python": platform.python_version(),
+            },
+            "results": results,
+        }, f, indent=2)
+    print(f"\nResults written to {OUTPUT}")
+
+    if len(sys.argv) > 1:
+        compare(results, sys.argv[1])
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,35 @@
+"""
+The tests run against the mongomock stand-in unless MONGO_URL points at a
+real mongod; the explain()-based index check needs the real one, and the
+multi-worker checks need a replica set:
+
+    python -m pytest -q tests
+    MONGO_URL=mongodb://localhost:27017 python -m pytest -q tests
+    MONGO_URL=mongodb://localhost:27017/?replicaSet=rs0 python -m pytest -q tests
+"""
+
+import os
+
+import pytest
+
+from benchmarks.common import use_mongo_standin
+
+TEST_DB_NAME = os.environ.get("TEST_DB_NAME", "grain_app_test")
+MONGOMOCK = use_mongo_standin()
+os.environ["DB_NAME"] = TEST_DB_NAME
+
+from backend.database import client  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def anyio_backend():
+    # One event loop for the whole session: Motor binds its client to the first loop it runs on
+    return "asyncio"
+
+
+@pytest.fixture
+async def database():
+    """The test database, emptied before and after each test"""
+    await client.drop_database(TEST_DB_NAME)
+    yield client[TEST_DB_NAME]
+    await client.drop_database(TEST_DB_NAME)
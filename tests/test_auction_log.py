@@ -0,0 +1,235 @@
+import asyncio
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException
+
+from backend import auction_routes
+from backend.auction_engines import log_bid, place_bid
+from backend.auction_log import AuctionLog, auction_log, chain_entry
+from backend.auction_events import event_bus
+from backend.auction_models import AuctionCreate, BidCreate, LostLogEntry
+from backend.auction_scheduler import AuctionScheduler
+from backend.bidding import MIN_INCREMENT
+from backend.indexes import ensure_indexes
+from backend.shared_state import InMemorySharedState
+from tests.test_auction_scheduler import drain
+from tests.test_auto_award import seed_buyer
+from tests.test_soft_close import STARTING_PRICE, at, make_bid
+
+pytestmark = pytest.mark.anyio
+
+ADMIN = {"sub": "admin", "email": "admin@example.com", "role": "admin"}
+
+
+SOFT_CLOSE = {"soft_close_seconds": 30, "soft_close_extension_seconds": 20, "soft_close_max_extension_seconds": 60}
+
+
+async def create_active_auction(database, **terms) -> str:
+    """An auction (by default english with soft close), created through the route and started by the scheduler"""
+    auction = await auction_routes.create_auction(
+        AuctionCreate(
+            grain_id="1", grain_type="Wheat", category="1", moisture="12%", protein="14%", gluten="28%",
+            nature="780 г/л", quantity=500.0, starting_price=STARTING_PRICE, start_date=at(-3600), end_date=at(60),
+            **(terms or SOFT_CLOSE)
+        ),
+        current_user=ADMIN
+    )
+    scheduler = AuctionScheduler(database.auctions, clock=lambda: at(0), state=InMemorySharedState())
+    assert await scheduler.run_due() == (1, 0)
+    return auction.id
+
+
+async def place_and_log(database, bid, second: float):
+    outcome = await place_bid(bid, now=at(second), auctions=database.auctions, bids=database.bids)
+    await log_bid(bid, outcome)
+    return outcome
+
+
+def as_logged(moment: datetime) -> datetime:
+    return moment.replace(tzinfo=timezone.utc)
+
+
+async def test_concurrent_bids_are_logged_in_acceptance_order(database):
+    auction_id = await create_active_auction(database)
+    bids = [make_bid(auction_id, STARTING_PRICE * random.uniform(1.01, 1.5)) for _ in range(30)]
+
+    async def attempt(bid, second):
+        try:
+            return await place_and_log(database, bid, second)
+        except HTTPException:
+            return None
+
+    outcomes = await asyncio.gather(*(attempt(bid, 45 + index % 10) for index, bid in enumerate(bids)))
+    accepted = sorted((outcome for outcome in outcomes if outcome), key=lambda outcome: outcome.auction["bid_count"])
+
+    entries = await auction_log.history(auction_id, limit=1000)
+    stored = await database.auctions.find_one({"id": auction_id}, {"_id": 0})
+    assert [entry["seq"] for entry in entries] == list(range(1, stored["log_seq"] + 1))
+    assert [entry["type"] for entry in entries[:2]] == ["created", "status_changed"]
+    logged_bids = [entry["data"]["bid_amount"] for entry in entries if entry["type"] == "bid_accepted"]
+    assert len(logged_bids) == len(accepted)
+    assert all(later >= earlier * MIN_INCREMENT for earlier, later in zip(logged_bids, logged_bids[1:]))
+    assert sum(entry["type"] == "auction_extended" for entry in entries) == sum(o.extended for o in accepted)
+
+    assert await auction_log.verify(auction_id) == {
+        "valid": True, "events": stored["log_seq"], "head": entries[-1]["hash"], "lost": []
+    }
+    state = await auction_log.load_state(auction_id)
+    assert state["status"] == "active"
+    assert state["bid_count"] == stored["bid_count"]
+    assert state["highest_bid_amount"] == stored["highest_bid_amount"]
+    assert datetime.fromisoformat(state["end_date"]) == as_logged(stored["end_date"])
+
+
+async def test_state_before_any_extension_has_the_created_terms(database):
+    auction_id = await create_active_auction(database)
+
+    state = await auction_log.load_state(auction_id)
+    assert (state["status"], state["starting_price"]) == ("active", STARTING_PRICE)
+    assert datetime.fromisoformat(state["end_date"]) == as_logged(at(60))
+
+
+async def test_an_event_whose_entry_was_never_written_is_reported(database):
+    auction_id = await create_active_auction(database)
+    await place_and_log(database, make_bid(auction_id, 8100.0), 10)
+    assert (await auction_log.verify(auction_id))["valid"]
+
+    # A bid accepted by a worker that died before logging it
+    await database.auctions.update_one({"id": auction_id}, {"$inc": {"log_seq": 1}})
+    assert await auction_log.verify(auction_id) == {"valid": False, "seq": 4, "error": "missing entry"}
+
+
+async def test_marking_a_dead_writers_seq_lost_lets_the_chain_resume(database, monkeypatch):
+    monkeypatch.setattr(auction_log, "_snapshot_every", 2)
+    await ensure_indexes(database)
+    auction_id = await create_active_auction(database)
+    await place_and_log(database, make_bid(auction_id, 8100.0), 10)
+    # The writer of seq 4 dies between its update and its append
+    await database.auctions.update_one({"id": auction_id}, {"$inc": {"log_seq": 1}})
+    for second, amount in ((20, 8200.0), (30, 8300.0)):
+        await place_and_log(database, make_bid(auction_id, amount), second)
+
+    unchained = [entry["seq"] async for entry in database.auction_log.find({"auction_id": auction_id, "hash": None})]
+    assert unchained == [5, 6]
+    assert await auction_log.verify(auction_id) == {"valid": False, "seq": 4, "error": "missing entry"}
+
+    for seq, detail in ((3, "Seq 3 is already logged"), (7, "Auction has no event with seq 7")):
+        with pytest.raises(HTTPException) as rejected:
+            await auction_routes.mark_auction_log_lost(auction_id, LostLogEntry(seq=seq, reason="test"), current_user=ADMIN)
+        assert (rejected.value.status_code, rejected.value.detail) == (409, detail)
+
+    verified = await auction_routes.mark_auction_log_lost(
+        auction_id, LostLogEntry(seq=4, reason="worker killed mid-bid"), current_user=ADMIN
+    )
+    assert (verified["valid"], verified["events"], verified["lost"]) == (True, 6, [4])
+    lost = await database.auction_log.find_one({"auction_id": auction_id, "seq": 4})
+    assert lost["data"] == {"marked_by": ADMIN["email"], "reason": "worker killed mid-bid"}
+    snapshots = [snapshot["seq"] async for snapshot in database.auction_log_snapshots.find({"auction_id": auction_id})]
+    assert sorted(snapshots) == [2, 4, 6]
+    state = await auction_log.load_state(auction_id)
+    assert (state["seq"], state["bid_count"], state["highest_bid_amount"]) == (6, 3, 8300.0)
+
+
+async def test_removed_or_modified_entries_are_reported(database):
+    auction_id = await create_active_auction(database)
+    for second, amount in ((10, 8100.0), (20, 8200.0), (30, 8300.0)):
+        await place_and_log(database, make_bid(auction_id, amount), second)
+
+    await database.auction_log.update_one({"auction_id": auction_id, "seq": 4}, {"$set": {"data.bid_amount": 9999.0}})
+    assert await auction_log.verify(auction_id) == {"valid": False, "seq": 4, "error": "entry was modified"}
+
+    await database.auction_log.delete_one({"auction_id": auction_id, "seq": 3})
+    assert await auction_log.verify(auction_id) == {"valid": False, "seq": 3, "error": "missing entry"}
+
+
+async def test_entries_written_out_of_order_are_chained_in_seq_order(database):
+    await database.auctions.insert_one({"id": "auction-id", "log_seq": 3})
+    await database.auction_log.create_index([("auction_id", 1), ("seq", 1)], unique=True)
+    log = AuctionLog(database.auction_log, database.auction_log_snapshots, database.auctions)
+    events = [(seq, "bid_accepted", {"bid_id": f"bid-{seq}", "bid_amount": 8000.0 + seq}) for seq in (1, 2, 3)]
+
+    # The workers that accepted bids 2 and 3 logged them before bid 1's did
+    for seq, event_type, data in (events[2], events[1], events[0]):
+        await log.append("auction-id", seq, event_type, data, at=at(seq))
+    # A retry of the same write is a no-op
+    await log.append("auction-id", *events[1], at=at(2))
+
+    prev_hash = "0" * 64
+    expected = []
+    for seq, event_type, data in events:
+        expected.append(chain_entry("auction-id", seq, event_type, data, at(seq), prev_hash)["hash"])
+        prev_hash = expected[-1]
+    assert [entry["hash"] for entry in await log.history("auction-id")] == expected
+    fresh = AuctionLog(database.auction_log, database.auction_log_snapshots, database.auctions)
+    assert await fresh.verify("auction-id") == {"valid": True, "events": 3, "head": expected[-1], "lost": []}
+
+
+async def test_snapshot_plus_tail_equals_a_full_replay(database):
+    log = AuctionLog(database.auction_log, database.auction_log_snapshots, database.auctions, snapshot_every=2)
+    for seq in range(1, 6):
+        await log.append("auction-id", seq, "bid_accepted", {"bid_id": f"bid-{seq}", "bid_amount": 8000.0 + seq}, at=at(seq))
+    assert await database.auction_log_snapshots.count_documents({}) == 2
+
+    replay = AuctionLog(database.auction_log, database.auction_log_snapshots_missing, database.auctions)
+    assert await log.load_state("auction-id") == await replay.load_state("auction-id")
+    halfway = await log.load_state("auction-id", at=at(3))
+    assert (halfway["seq"], halfway["bid_count"], halfway["highest_bid_id"]) == (3, 3, "bid-3")
+
+
+async def failing_append(*args, **kwargs):
+    raise ConnectionError("auction_log is unreachable")
+
+
+async def test_a_failed_append_does_not_skip_settling_or_awarding(database, monkeypatch):
+    auction_id = await create_active_auction(database, auction_type="sealed_second_price", auto_award=True)
+    bids = [make_bid(auction_id, amount) for amount in (8300.0, 8200.0)]
+    for second, bid in enumerate(bids, start=10):
+        await place_and_log(database, bid, second)
+    failing_log = AuctionLog(database.auction_log, database.auction_log_snapshots, database.auctions)
+    monkeypatch.setattr(failing_log, "append_many", failing_append)
+    scheduler = AuctionScheduler(database.auctions, clock=lambda: at(60), state=InMemorySharedState(), log=failing_log)
+    events = event_bus.subscribe()
+    try:
+        assert await scheduler.run_due() == (0, 1)
+    finally:
+        event_bus.unsubscribe(events)
+
+    settled = await database.auctions.find_one({"id": auction_id})
+    assert (settled["highest_bid_amount"], settled["clearing_price"]) == (8300.0, 8200.0)
+    assert (settled["status"], settled["winner_bid_id"]) == ("winner_selected", bids[0].id)
+    assert [event["status"] for event in drain(events) if event["type"] == "status_changed"] == [
+        "completed", "winner_selected"
+    ]
+    # Only the completion is missing from the log
+    assert await auction_log.verify(auction_id) == {"valid": False, "seq": 5, "error": "missing entry"}
+
+
+async def test_a_bid_whose_log_write_fails_is_still_accepted_and_awarded(database, monkeypatch):
+    # The route bids at the wall clock
+    now = datetime.utcnow()
+    auction = await auction_routes.create_auction(
+        AuctionCreate(
+            grain_id="1", grain_type="Wheat", category="1", moisture="12%", protein="14%", gluten="28%",
+            nature="780 г/л", quantity=500.0, starting_price=STARTING_PRICE, start_date=now - timedelta(minutes=10),
+            end_date=now + timedelta(hours=1), auction_type="dutch", price_decrement=100.0,
+            decrement_interval_seconds=60, auto_award=True,
+        ),
+        current_user=ADMIN
+    )
+    auction_id = auction.id
+    await AuctionScheduler(database.auctions, state=InMemorySharedState()).run_due()
+    buyer = await seed_buyer(database)
+    monkeypatch.setattr(auction_log, "append_many", failing_append)
+
+    bid = await auction_routes.place_bid(
+        BidCreate(auction_id=auction_id, bid_amount=STARTING_PRICE, payment_type="cashless", delivery_location="Odesa"),
+        current_user={"sub": buyer["id"]}
+    )
+
+    awarded = await database.auctions.find_one({"id": auction_id})
+    assert (awarded["status"], awarded["winner_bid_id"]) == ("winner_selected", bid.id)
+    assert await database.email_outbox.count_documents({"to": buyer["email"]}) == 1
+    monkeypatch.undo()
+    assert await auction_log.verify(auction_id) == {"valid": False, "seq": 3, "error": "missing entry"}
@@ -0,0 +1,85 @@
+import asyncio
+import inspect
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+from backend.auction_events import event_bus
+from backend.auction_scheduler import AuctionScheduler
+from backend.shared_state import InMemorySharedState
+
+pytestmark = pytest.mark.anyio
+
+NOW = datetime(2025, 7, 1, 12, 0, 0)
+
+
+class RoundTrips:
+    """A collection whose commands reach the server only after a network round trip"""
+
+    def __init__(self, collection):
+        self._collection = collection
+
+    def __getattr__(self, name):
+        attribute = getattr(self._collection, name)
+        if not callable(attribute):
+            return attribute
+
+        def call(*args, **kwargs):
+            result = attribute(*args, **kwargs)
+            return self._after_round_trip(result) if inspect.isawaitable(result) else result
+        return call
+
+    @staticmethod
+    async def _after_round_trip(result):
+        await asyncio.sleep(0.001)
+        return await result
+
+
+async def seed(database, status: str, count: int) -> list[str]:
+    auctions = [
+        {
+            "id": str(uuid.uuid4()), "status": status, "auction_type": "english", "starting_price": 8000.0,
+            "quantity": 500.0, "start_date": NOW - timedelta(hours=1), "end_date": NOW - timedelta(seconds=1),
+            "bid_count": 0,
+        }
+        for _ in range(count)
+    ]
+    await database.auctions.insert_many([dict(auction) for auction in auctions])
+    return [auction["id"] for auction in auctions]
+
+
+def drain(queue: asyncio.Queue) -> list[dict]:
+    return [queue.get_nowait() for _ in range(queue.qsize())]
+
+
+async def test_workers_waking_together_publish_each_transition_once(database):
+    auction_ids = await seed(database, "active", 5)
+    workers = [
+        AuctionScheduler(RoundTrips(database.auctions), clock=lambda: NOW, state=InMemorySharedState())
+        for _ in range(3)
+    ]
+    events = event_bus.subscribe()
+    try:
+        results = await asyncio.gather(*(worker.run_due() for worker in workers))
+    finally:
+        event_bus.unsubscribe(events)
+
+    assert sum(completed for _, completed in results) == len(auction_ids)
+    published = [event["auction_id"] for event in drain(events) if event.get("status") == "completed"]
+    assert sorted(published) == sorted(auction_ids)
+    assert await database.auctions.count_documents({"status": "completed"}) == len(auction_ids)
+
+
+async def test_run_due_only_touches_auctions_that_are_due(database):
+    [due] = await seed(database, "pending", 1)
+    await database.auctions.insert_one({
+        "id": "later", "status": "pending", "start_date": NOW + timedelta(minutes=5),
+        "end_date": NOW + timedelta(hours=1),
+    })
+    scheduler = AuctionScheduler(database.auctions, clock=lambda: NOW, state=InMemorySharedState())
+
+    # Its end_date has passed too, so it goes all the way to completed
+    assert await scheduler.run_due() == (1, 1)
+    assert (await database.auctions.find_one({"id": due}))["status"] == "completed"
+    assert (await database.auctions.find_one({"id": "later"}))["status"] == "pending"
@@ -0,0 +1,102 @@
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+from backend import auction_routes
+from backend.auction_models import BidCreate
+from backend.auction_engines import ENGINES
+from backend.auto_award import award_auctions
+from tests.test_winner_selection import seed_completed_auction
+
+pytestmark = pytest.mark.anyio
+
+
+async def seed_buyer(database) -> dict:
+    buyer = {
+        "id": str(uuid.uuid4()), "email": f"{uuid.uuid4().hex[:8]}@example.com", "full_name": "Test Buyer",
+        "company_name": "Test LLC", "role": "buyer", "accreditation_status": "approved",
+    }
+    await database.users.insert_one(dict(buyer))
+    return buyer
+
+
+async def test_dutch_lot_taken_by_a_bid_is_awarded_at_once(database):
+    now = datetime.utcnow()
+    auction = {
+        "id": str(uuid.uuid4()), "grain_id": "1", "grain_type": "Wheat", "category": "1",
+        "moisture": "12%", "protein": "14%", "gluten": "28%", "nature": "780 г/л",
+        "quantity": 500.0, "starting_price": 9000.0, "start_date": now - timedelta(minutes=10),
+        "end_date": now + timedelta(hours=1), "status": "active", "auction_type": "dutch",
+        "price_decrement": 100.0, "decrement_interval_seconds": 60, "reserve_price": 8000.0,
+        "auto_award": True, "winner_id": None, "created_by": "admin", "created_at": now, "bid_count": 0,
+    }
+    await database.auctions.insert_one(dict(auction))
+    buyer = await seed_buyer(database)
+
+    bid = await auction_routes.place_bid(
+        BidCreate(auction_id=auction["id"], bid_amount=9000.0, payment_type="cashless", delivery_location="Odesa"),
+        current_user={"sub": buyer["id"]}
+    )
+
+    awarded = await database.auctions.find_one({"id": auction["id"]})
+    assert (awarded["status"], awarded["winner_id"], awarded["winner_bid_id"]) == ("winner_selected", buyer["id"], bid.id)
+    assert await database.email_outbox.count_documents({"to": buyer["email"]}) == 1
+
+
+async def test_awarding_twice_awards_and_notifies_once(database):
+    auction, bids = await seed_completed_auction(database, (8300.0, 8200.0))
+    await database.auctions.update_one({"id": auction["id"]}, {"$set": {"auto_award": True}})
+
+    assert await award_auctions([auction["id"]]) == 1
+    assert await award_auctions([auction["id"]]) == 0
+    assert await award_auctions() == 0
+
+    awarded = await database.auctions.find_one({"id": auction["id"]})
+    assert (awarded["status"], awarded["winner_bid_id"]) == ("winner_selected", bids[0]["id"])
+    assert await database.email_outbox.count_documents({}) == 1
+
+
+async def seed_equal_bids(database) -> dict:
+    """A completed auction with two equal top bids; the later one has the larger id"""
+    auction, bids = await seed_completed_auction(database, (8200.0, 8200.0))
+    for bid, (bid_id, minutes) in zip(bids, (("z-later", 10), ("a-earlier", 20))):
+        await database.bids.update_one(
+            {"id": bid["id"]},
+            {"$set": {"id": bid_id, "created_at": bid["created_at"] - timedelta(minutes=minutes)}}
+        )
+    return auction
+
+
+async def test_equal_bids_are_awarded_to_the_earliest(database):
+    auction = await seed_equal_bids(database)
+    await database.auctions.update_one({"id": auction["id"]}, {"$set": {"auto_award": True}})
+
+    assert await award_auctions([auction["id"]]) == 1
+    assert (await database.auctions.find_one({"id": auction["id"]}))["winner_bid_id"] == "a-earlier"
+
+
+async def test_equal_sealed_bids_settle_on_the_earliest(database):
+    auction = await seed_equal_bids(database)
+
+    await ENGINES["sealed_first_price"].settle([auction["id"]], database.auctions, database.bids)
+    assert (await database.auctions.find_one({"id": auction["id"]}))["highest_bid_id"] == "a-earlier"
+
+
+async def test_lot_wanted_in_parts_is_split_across_the_winning_bids(database):
+    auction, bids = await seed_completed_auction(database, (8300.0, 8200.0, 8100.0))
+    await database.auctions.update_one({"id": auction["id"]}, {"$set": {"auto_award": True}})
+    for bid, quantity in zip(bids, (200.0, 400.0, None)):
+        await database.bids.update_one({"id": bid["id"]}, {"$set": {"quantity": quantity}})
+
+    assert await award_auctions([auction["id"]]) == 1
+    assert await award_auctions() == 0
+
+    awarded = await database.auctions.find_one({"id": auction["id"]})
+    assert (awarded["winner_bid_id"], awarded["allocated_quantity"]) == (bids[0]["id"], 500.0)
+    shares = {bid["id"]: bid.get("allocated_quantity") async for bid in database.bids.find({}, {"_id": 0})}
+    assert shares == {bids[0]["id"]: 200.0, bids[1]["id"]: 300.0, bids[2]["id"]: None}
+    emails = [email["body"] async for email in database.email_outbox.find({}, {"_id": 0})]
+    assert len(emails) == 2
+    assert sum("Кількість: 200.0 тонн" in body for body in emails) == 1
+    assert sum("Кількість: 300.0 тонн" in body for body in emails) == 1
@@ -0,0 +1,31 @@
+import pytest
+
+from backend.indexes import QUERY_SHAPES, _plan_stages, ensure_indexes, find_collection_scans
+from tests.conftest import MONGOMOCK
+
+pytestmark = pytest.mark.anyio
+
+
+def test_plan_stages_walks_nested_and_or_plans():
+    plan = {
+        "stage": "SORT",
+        "inputStage": {
+            "stage": "OR",
+            "inputStages": [
+                {"stage": "FETCH", "inputStage": {"stage": "IXSCAN"}},
+                {"stage": "COLLSCAN"},
+            ],
+        },
+    }
+    assert _plan_stages(plan) == ["SORT", "OR", "FETCH", "IXSCAN", "COLLSCAN"]
+
+
+def test_plan_stages_reads_the_query_plan_of_sbe_explains():
+    plan = {"queryPlan": {"stage": "FETCH", "inputStage": {"stage": "IXSCAN"}}}
+    assert _plan_stages(plan) == [None, "FETCH", "IXSCAN"]
+
+
+@pytest.mark.skipif(MONGOMOCK, reason="explain() needs a real mongod (set MONGO_URL)")
+async def test_no_query_shape_falls_back_to_a_collection_scan(database):
+    assert await ensure_indexes(database)
+    assert await find_collection_scans(database) == [], f"of {len(QUERY_SHAPES)} query shapes"
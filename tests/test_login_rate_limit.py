@@ -0,0 +1,54 @@
+import uuid
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from backend import auth_routes
+from backend.auth import hash_password
+from backend.auth_models import User, UserLogin
+
+pytestmark = pytest.mark.anyio
+
+PASSWORD = "correct horse battery staple"
+LIMIT = 3
+
+
+@pytest.fixture(autouse=True)
+def small_limit(monkeypatch):
+    monkeypatch.setattr(auth_routes, "LOGIN_ATTEMPTS_LIMIT", LIMIT)
+
+
+async def seed_buyer(database) -> str:
+    user = User(
+        email=f"{uuid.uuid4().hex[:8]}@example.com", hashed_password=hash_password(PASSWORD),
+        full_name="Test Buyer", company_name="Test LLC", edrpou="12345678", phone="+380000000000",
+    )
+    await database.users.insert_one(user.dict())
+    return user.email
+
+
+def request_from(host: str) -> Request:
+    return Request({"type": "http", "method": "POST", "path": "/api/auth/login", "headers": [], "client": (host, 50000)})
+
+
+async def login(email: str, password: str, host: str = "10.0.0.1") -> int:
+    try:
+        await auth_routes.login(UserLogin(email=email, password=password), request_from(host))
+    except HTTPException as e:
+        return e.status_code
+    return 200
+
+
+async def test_successful_logins_are_not_limited(database):
+    email = await seed_buyer(database)
+    assert [await login(email, PASSWORD) for _ in range(LIMIT + 1)] == [200] * (LIMIT + 1)
+
+
+async def test_failed_logins_lock_out_only_the_client_that_failed(database):
+    email = await seed_buyer(database)
+    assert [await login(email, "wrong password", "10.0.0.66") for _ in range(LIMIT)] == [401] * LIMIT
+
+    # Even the right password is refused from that address, before bcrypt runs
+    assert await login(email, PASSWORD, "10.0.0.66") == 429
+    assert await login(email, PASSWORD, "10.0.0.1") == 200
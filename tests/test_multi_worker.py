@@ -0,0 +1,174 @@
+"""
+Shared state across several workers on one replica set.
+
+Starts WORKERS separate uvicorn processes with SHARED_STATE_BACKEND=mongo
+against the test database. Change streams need a replica set; a
+single-node one is enough:
+
+    mongod --replSet rs0 --dbpath /tmp/rs0 & mongosh --eval 'rs.initiate()'
+    MONGO_URL=mongodb://localhost:27017/?replicaSet=rs0 python -m pytest -q tests/test_multi_worker.py
+"""
+
+import asyncio
+import os
+import subprocess
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+
+from backend.auth import create_access_token, hash_password
+from tests.conftest import MONGOMOCK
+
+MONGO_URL = os.environ.get("MONGO_URL", "")
+REPLICA_SET = not MONGOMOCK and ("replicaSet=" in MONGO_URL or MONGO_URL.startswith("mongodb+srv://"))
+
+pytestmark = [
+    pytest.mark.anyio,
+    pytest.mark.skipif(not REPLICA_SET, reason="change streams need MONGO_URL to point at a replica set"),
+]
+
+WORKERS = int(os.environ.get("WORKERS", 3))
+BASE_PORT = int(os.environ.get("BASE_PORT", 8100))
+LOGIN_ATTEMPTS_LIMIT = 5
+READY_TIMEOUT_SECONDS = 30
+EVENT_TIMEOUT_SECONDS = 5
+PASSWORD = "correct horse battery staple"
+
+
+def worker_url(i: int) -> str:
+    return f"http://127.0.0.1:{BASE_PORT + i}"
+
+
+async def wait_ready(http: httpx.AsyncClient):
+    deadline = time.monotonic() + READY_TIMEOUT_SECONDS
+    for i in range(WORKERS):
+        while True:
+            try:
+                if (await http.get(f"{worker_url(i)}/health/ready")).status_code == 200:
+                    break
+            except httpx.TransportError:
+                pass
+            assert time.monotonic() < deadline, f"Worker {i} did not become ready"
+            await asyncio.sleep(0.2)
+
+
+@pytest.fixture
+async def http(database):
+    """A client for WORKERS uvicorn processes sharing the test database, ready to serve"""
+    env = {**os.environ, "SHARED_STATE_BACKEND": "mongo", "LOGIN_ATTEMPTS_LIMIT": str(LOGIN_ATTEMPTS_LIMIT)}
+    workers = [
+        subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "backend.server:app", "--port", str(BASE_PORT + i), "--log-level", "warning"],
+            env=env,
+        )
+        for i in range(WORKERS)
+    ]
+    try:
+        async with httpx.AsyncClient(timeout=30) as client:
+            await wait_ready(client)
+            yield client
+    finally:
+        for worker in workers:
+            worker.terminate()
+        for worker in workers:
+            worker.wait()
+
+
+@pytest.fixture
+async def seeded(database) -> dict:
+    now = datetime.utcnow()
+    hashed = hash_password(PASSWORD)
+
+    def user(status: str, role: str = "buyer") -> dict:
+        return {
+            "id": str(uuid.uuid4()), "email": f"{uuid.uuid4().hex[:8]}@example.com", "hashed_password": hashed,
+            "full_name": "Check User", "company_name": "Check LLC", "edrpou": "12345678",
+            "phone": "+380000000000", "role": role, "accreditation_status": status,
+            "created_at": now, "updated_at": now,
+        }
+
+    users = {"admin": user("approved", "admin"), "buyer": user("approved"), "pending": user("pending")}
+    await database.users.insert_many([dict(u) for u in users.values()])
+    auction_id = str(uuid.uuid4())
+    await database.auctions.insert_one({
+        "id": auction_id, "grain_id": "1", "grain_type": "Wheat", "category": "1",
+        "moisture": "12%", "protein": "14%", "gluten": "28%", "nature": "780 г/л",
+        "quantity": 500.0, "starting_price": 8000.0,
+        "start_date": now - timedelta(hours=1), "end_date": now + timedelta(hours=1),
+        "status": "active", "winner_id": None, "created_by": "check", "created_at": now, "bid_count": 0,
+    })
+    tokens = {
+        name: create_access_token({"sub": u["id"], "email": u["email"], "role": u["role"]})
+        for name, u in users.items()
+    }
+    return {"users": users, "tokens": tokens, "auction_id": auction_id}
+
+
+def bid_body(auction_id: str, amount: float) -> dict:
+    return {"auction_id": auction_id, "bid_amount": amount, "payment_type": "cashless", "delivery_location": "Odesa"}
+
+
+async def read_event(http: httpx.AsyncClient, worker: int, auction_id: str, token: str, subscribed: asyncio.Event) -> str:
+    url = f"{worker_url(worker)}/api/auctions/events"
+    async with http.stream("GET", url, params={"auction_id": auction_id, "token": token}) as response:
+        subscribed.set()
+        async for line in response.aiter_lines():
+            if line.startswith("event: "):
+                return line.removeprefix("event: ")
+    return ""
+
+
+async def test_a_bid_reaches_event_subscribers_on_every_worker(http, seeded):
+    auction_id, admin = seeded["auction_id"], seeded["tokens"]["admin"]
+    readers = []
+    for worker in range(WORKERS):
+        subscribed = asyncio.Event()
+        readers.append(asyncio.create_task(read_event(http, worker, auction_id, admin, subscribed)))
+        await subscribed.wait()
+    await asyncio.sleep(0.5)  # let every stream register its subscription
+
+    response = await http.post(
+        f"{worker_url(0)}/api/auctions/bid", json=bid_body(auction_id, 8100.0),
+        headers={"Authorization": f"Bearer {seeded['tokens']['buyer']}"},
+    )
+    assert response.status_code == 200, response.text
+
+    _, pending = await asyncio.wait(readers, timeout=EVENT_TIMEOUT_SECONDS)
+    for reader in pending:
+        reader.cancel()
+    assert [None if reader in pending else reader.result() for reader in readers] == ["bid_accepted"] * WORKERS
+
+
+async def test_an_approval_reaches_a_worker_that_cached_the_buyer_as_pending(http, seeded):
+    auction_id, pending = seeded["auction_id"], seeded["users"]["pending"]
+    headers = {"Authorization": f"Bearer {seeded['tokens']['pending']}"}
+    other = WORKERS - 1
+
+    # Caches the buyer as pending on the other worker
+    response = await http.post(f"{worker_url(other)}/api/auctions/bid", json=bid_body(auction_id, 9000.0), headers=headers)
+    assert response.status_code == 403
+
+    response = await http.post(
+        f"{worker_url(0)}/api/auth/update-accreditation", json={"user_id": pending["id"], "status": "approved"},
+        headers={"Authorization": f"Bearer {seeded['tokens']['admin']}"},
+    )
+    assert response.status_code == 200, response.text
+    await asyncio.sleep(0.5)  # change stream delivery
+
+    response = await http.post(f"{worker_url(other)}/api/auctions/bid", json=bid_body(auction_id, 9000.0), headers=headers)
+    assert response.status_code == 200, response.text
+
+
+async def test_failed_logins_are_limited_across_all_workers_together(http, seeded):
+    email = seeded["users"]["buyer"]["email"]
+    statuses = []
+    for attempt in range(LOGIN_ATTEMPTS_LIMIT + 1):
+        response = await http.post(
+            f"{worker_url(attempt % WORKERS)}/api/auth/login", json={"email": email, "password": "wrong password"}
+        )
+        statuses.append(response.status_code)
+    assert statuses == [401] * LOGIN_ATTEMPTS_LIMIT + [429]
@@ -0,0 +1,88 @@
+import asyncio
+import random
+import uuid
+
+import pytest
+from fastapi import HTTPException
+
+from backend import order_book_routes
+from backend.auction_models import OrderCreate
+from backend.indexes import ensure_indexes
+from backend.order_book import BUY, SELL, OrderBook, SharedOrderBook
+from tests.test_auction_scheduler import RoundTrips
+
+pytestmark = pytest.mark.anyio
+
+
+def test_orders_fill_by_price_then_time_at_the_resting_price():
+    book = OrderBook("wheat")
+    book.submit(SELL, 8100.0, 50.0, "seller-a", "ask-late-price")
+    book.submit(SELL, 8000.0, 30.0, "seller-b", "ask-early")
+    book.submit(SELL, 8000.0, 30.0, "seller-c", "ask-later")
+
+    fills = book.submit(BUY, 8100.0, 70.0, "buyer", "bid")
+
+    assert [(fill.sell_order_id, fill.price, fill.quantity) for fill in fills] == [
+        ("ask-early", 8000.0, 30.0), ("ask-later", 8000.0, 30.0), ("ask-late-price", 8100.0, 10.0)
+    ]
+    assert book.depth(SELL) == [(8100.0, 40.0)]
+    assert (book.best_bid(), book.best_ask()) == (None, 8100.0)
+
+
+def test_unfilled_remainders_rest_until_cancelled():
+    book = OrderBook("wheat")
+    book.submit(BUY, 7900.0, 20.0, "buyer", "bid")
+    assert book.submit(SELL, 7950.0, 5.0, "seller", "ask") == []
+
+    assert book.cancel("bid")
+    assert not book.cancel("bid")
+    assert (book.best_bid(), book.best_ask(), book.seq) == (None, 7950.0, 4)
+    with pytest.raises(ValueError):
+        book.submit(BUY, 7900.0, 0.0, "buyer")
+
+
+async def test_workers_sharing_a_book_match_the_same_orders(database):
+    await ensure_indexes(database)
+    events = RoundTrips(database.order_book_events)
+    workers = [SharedOrderBook("wheat", events, batch_size=8) for _ in range(3)]
+    rng = random.Random(7)
+    orders = [
+        (BUY if rng.random() < 0.5 else SELL, 8000.0 + rng.randint(-5, 5) * 10, float(rng.randint(1, 20)), f"order-{i}")
+        for i in range(120)
+    ]
+
+    results = await asyncio.gather(*(
+        workers[i % len(workers)].submit(side, price, quantity, "trader", order_id)
+        for i, (side, price, quantity, order_id) in enumerate(orders)
+    ))
+
+    assert [event["seq"] async for event in database.order_book_events.find().sort("seq", 1)] == list(range(1, 121))
+    fresh = await SharedOrderBook("wheat", database.order_book_events).sync()
+    books = [await worker.sync() for worker in workers] + [fresh]
+    for book in books:
+        assert book.seq == 120
+        assert (book.depth(BUY, 100), book.depth(SELL, 100)) == (fresh.depth(BUY, 100), fresh.depth(SELL, 100))
+    # Each worker returned exactly the fills the stored sequence produces
+    replay = OrderBook("wheat")
+    stored = [event async for event in database.order_book_events.find({}, {"_id": 0}).sort("seq", 1)]
+    replayed = {event["order_id"]: replay.apply(event) for event in stored}
+    assert {order[3]: fills for order, fills in zip(orders, results)} == replayed
+
+
+async def test_only_the_owner_can_cancel_a_resting_order(database):
+    book_id = f"wheat-{uuid.uuid4()}"
+    resting = await order_book_routes.submit_order(
+        book_id, OrderCreate(side=SELL, price=8000.0, quantity=50.0), current_user={"sub": "seller"}
+    )
+    traded = await order_book_routes.submit_order(
+        book_id, OrderCreate(side=BUY, price=8100.0, quantity=20.0), current_user={"sub": "buyer"}
+    )
+    assert (traded.remaining, [(fill.sell_order_id, fill.price) for fill in traded.fills]) == (0.0, [(resting.id, 8000.0)])
+
+    with pytest.raises(HTTPException) as rejected:
+        await order_book_routes.cancel_order(book_id, resting.id, current_user={"sub": "buyer"})
+    assert rejected.value.status_code == 404
+    await order_book_routes.cancel_order(book_id, resting.id, current_user={"sub": "seller"})
+
+    depth = await order_book_routes.get_order_book(book_id, levels=10)
+    assert (depth.seq, depth.best_ask, depth.asks) == (3, None, [])
@@ -0,0 +1,24 @@
+import pytest
+
+from backend.repair_bid_summary import repair_bid_summaries
+from tests.test_winner_selection import seed_completed_auction
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_repair_leaves_the_high_bid_of_sealed_auctions_hidden(database):
+    english, english_bids = await seed_completed_auction(database, (8300.0, 8100.0))
+    sealed, _ = await seed_completed_auction(database, (8300.0, 8100.0))
+    await database.auctions.update_many(
+        {"id": {"$in": [english["id"], sealed["id"]]}}, {"$set": {"status": "active", "bid_count": 0}}
+    )
+    await database.auctions.update_one({"id": sealed["id"]}, {"$set": {"auction_type": "sealed_first_price"}})
+
+    assert await repair_bid_summaries([english["id"], sealed["id"]]) == 2
+
+    repaired = await database.auctions.find_one({"id": english["id"]})
+    assert (repaired["highest_bid_amount"], repaired["highest_bid_id"], repaired["bid_count"]) == (
+        8300.0, english_bids[0]["id"], 2
+    )
+    repaired = await database.auctions.find_one({"id": sealed["id"]})
+    assert (repaired.get("highest_bid_amount"), repaired.get("highest_bid_id"), repaired["bid_count"]) == (None, None, 2)
@@ -0,0 +1,160 @@
+"""
+Soft close, with simulated clocks.
+
+Every bid and the scheduler run at explicit instants instead of the wall
+clock, so last-second races are replayed exactly. Auction: ends at
+T+60s, soft close window 30s, extension 20s, extensions capped at 60s in
+total (so never past T+120s).
+"""
+
+import asyncio
+import os
+import random
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+
+from backend.auction_engines import ENGINES, place_bid
+from backend.auction_models import AuctionCreate, Bid
+from backend.auction_scheduler import AuctionScheduler
+from backend.bidding import MIN_INCREMENT, soft_close_until
+from backend.shared_state import InMemorySharedState
+
+pytestmark = pytest.mark.anyio
+
+CONCURRENCY = int(os.environ.get("CONCURRENCY", 50))
+T = datetime(2025, 7, 1, 12, 0, 0)
+STARTING_PRICE = 8000.0
+
+
+def at(seconds: float) -> datetime:
+    return T + timedelta(seconds=seconds)
+
+
+async def seed_auction(auctions) -> dict:
+    terms = AuctionCreate(
+        grain_id="1", grain_type="Wheat", category="1", moisture="12%", protein="14%", gluten="28%",
+        nature="780 г/л", quantity=500.0, starting_price=STARTING_PRICE,
+        start_date=at(-3600), end_date=at(60),
+        soft_close_seconds=30, soft_close_extension_seconds=20, soft_close_max_extension_seconds=60,
+    )
+    auction = {
+        **terms.dict(), "id": str(uuid.uuid4()), "status": "active", "created_by": "test",
+        "created_at": at(-3600), "bid_count": 0, "soft_close_until": soft_close_until(terms),
+    }
+    await auctions.insert_one(dict(auction))
+    return auction
+
+
+def make_bid(auction_id: str, amount: float) -> Bid:
+    return Bid(
+        auction_id=auction_id, bid_amount=round(amount, 2), payment_type="cashless", delivery_location="Odesa",
+        user_id=str(uuid.uuid4()), user_name="Test Buyer", user_company="Test LLC",
+    )
+
+
+async def end_date(auctions, auction_id: str) -> datetime:
+    return (await auctions.find_one({"id": auction_id}, {"end_date": 1}))["end_date"]
+
+
+@pytest.mark.parametrize("seconds, expected, label", [
+    ([10], at(60), "outside the window"),
+    ([45], at(65), "15s before the end"),
+    ([45, 50, 55], at(75), "inside the window again"),
+    ([45, 50, 55, 70], at(90), "after the original end, within the extension"),
+    ([45, 50, 55, 70, 89], at(109), "one second before the end"),
+    ([45, 50, 55, 70, 89, 108], at(120), "capped at 60s of extensions"),
+    ([45, 50, 55, 70, 89, 108, 119], at(120), "at the cap"),
+])
+async def test_bids_extend_end_date_up_to_the_cap(database, seconds, expected, label):
+    auction = await seed_auction(database.auctions)
+    price = STARTING_PRICE
+    for second in seconds:
+        price *= 1.02
+        await place_bid(make_bid(auction["id"], price), now=at(second), auctions=database.auctions, bids=database.bids)
+    assert await end_date(database.auctions, auction["id"]) == expected, label
+
+
+async def test_bid_after_the_extended_end_is_rejected(database):
+    auction = await seed_auction(database.auctions)
+    await place_bid(make_bid(auction["id"], 8200.0), now=at(55), auctions=database.auctions, bids=database.bids)
+
+    with pytest.raises(HTTPException) as rejected:
+        await place_bid(make_bid(auction["id"], 8400.0), now=at(75.5), auctions=database.auctions, bids=database.bids)
+    assert rejected.value.detail == "Auction has ended"
+
+
+async def test_concurrent_last_second_bids_are_serialized(database):
+    """Every accepted bid beat the one accepted before it by 1%, and end_date moved exactly once"""
+    auction = await seed_auction(database.auctions)
+    now = at(59)
+    bids = [make_bid(auction["id"], STARTING_PRICE * random.uniform(1.01, 1.5)) for _ in range(CONCURRENCY)]
+
+    async def attempt(bid: Bid):
+        try:
+            return bid, await place_bid(bid, now=now, auctions=database.auctions, bids=database.bids), None
+        except HTTPException as e:
+            return bid, None, e
+
+    results = await asyncio.gather(*(attempt(bid) for bid in bids))
+    accepted = sorted(
+        ((bid, outcome) for bid, outcome, _ in results if outcome), key=lambda item: item[1].auction["bid_count"]
+    )
+    rejected = [error for _, _, error in results if error]
+
+    assert accepted
+    previous = None
+    for position, (bid, outcome) in enumerate(accepted):
+        assert outcome.auction["bid_count"] == position
+        assert outcome.auction.get("highest_bid_amount") == previous
+        assert bid.bid_amount >= (previous or STARTING_PRICE) * MIN_INCREMENT
+        previous = bid.bid_amount
+
+    stored = await database.auctions.find_one({"id": auction["id"]}, {"_id": 0})
+    assert stored["bid_count"] == len(accepted)
+    assert stored["highest_bid_amount"] == accepted[-1][0].bid_amount
+    assert stored["end_date"] == at(79)
+    assert sum(1 for _, outcome in accepted if outcome.extended) == 1
+    assert all(error.status_code in (400, 409) for error in rejected)
+
+
+async def test_scheduler_rearms_for_the_extended_end(database):
+    auction = await seed_auction(database.auctions)
+    clock = [at(0)]
+    scheduler = AuctionScheduler(database.auctions, clock=lambda: clock[0], state=InMemorySharedState())
+    scheduler.schedule(auction)
+
+    outcome = await place_bid(
+        make_bid(auction["id"], STARTING_PRICE * 1.05), now=at(50), auctions=database.auctions, bids=database.bids
+    )
+    await scheduler.extend(auction["id"], outcome.end_date)
+
+    clock[0] = at(60)
+    assert (await scheduler.run_due())[1] == 0, "completed at its original end"
+    assert scheduler.next_deadline() == at(70)
+    clock[0] = at(70)
+    assert (await scheduler.run_due())[1] == 1
+
+
+@pytest.mark.parametrize("max_extension, error", [
+    (None, "soft_close_max_extension_seconds must be positive"),
+    (0, "soft_close_max_extension_seconds must be positive"),
+    (60, None),
+])
+def test_soft_close_requires_a_cap(max_extension, error):
+    terms = AuctionCreate(
+        grain_id="1", grain_type="Wheat", category="1", moisture="12%", protein="14%", gluten="28%",
+        nature="780 г/л", quantity=500.0, starting_price=STARTING_PRICE, start_date=at(-3600), end_date=at(60),
+        soft_close_seconds=30, soft_close_extension_seconds=20, soft_close_max_extension_seconds=max_extension,
+    )
+    assert ENGINES["english"].validate(terms) == error
+
+
+async def test_auction_without_a_cap_is_never_extended(database):
+    auction = await seed_auction(database.auctions)
+    await database.auctions.update_one({"id": auction["id"]}, {"$set": {"soft_close_until": None}})
+
+    await place_bid(make_bid(auction["id"], 8200.0), now=at(55), auctions=database.auctions, bids=database.bids)
+    assert await end_date(database.auctions, auction["id"]) == at(60)
@@ -0,0 +1,74 @@
+import asyncio
+
+import httpx
+import pytest
+
+from backend import migrations, server
+from backend.server import app, lifespan
+
+pytestmark = pytest.mark.anyio
+
+READY_TIMEOUT_SECONDS = 10
+
+
+class MigrationCalls:
+    """Wraps each migration step to record which ones a worker ran"""
+
+    def __init__(self, monkeypatch):
+        self.steps = []
+        monkeypatch.setattr(migrations, "ensure_indexes", self._recording("indexes", migrations.ensure_indexes))
+        monkeypatch.setattr(migrations, "MIGRATIONS", [
+            (version, self._recording(migration.__name__, migration)) for version, migration in migrations.MIGRATIONS
+        ])
+
+    def _recording(self, name, step):
+        async def run(*args, **kwargs):
+            self.steps.append(name)
+            return await step(*args, **kwargs)
+        run.__name__ = name
+        return run
+
+
+async def wait_until_ready(http) -> httpx.Response:
+    async def poll():
+        while (response := await http.get("/health/ready")).status_code != 200:
+            await asyncio.sleep(0.01)
+        return response
+    return await asyncio.wait_for(poll(), READY_TIMEOUT_SECONDS)
+
+
+async def test_a_worker_serves_before_its_migrations_finish(database, monkeypatch):
+    calls = MigrationCalls(monkeypatch)
+    release = asyncio.Event()
+    run_migrations = server.run_migrations
+
+    async def slow_migrations():
+        await release.wait()
+        await run_migrations()
+    monkeypatch.setattr(server, "run_migrations", slow_migrations)
+
+    async with lifespan(app):
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://worker") as http:
+            assert (await http.get("/health/live")).status_code == 200
+            not_ready = await http.get("/health/ready")
+            assert (not_ready.status_code, not_ready.json()["detail"]) == (503, "Starting up")
+
+            release.set()
+            assert (await wait_until_ready(http)).json() == {"status": "ready"}
+    assert calls.steps == ["indexes", "seed_grains", "create_default_admin"]
+    assert await database.users.count_documents({"email": "admin@graincompany.ua"}) == 1
+
+
+async def test_a_second_worker_skips_the_applied_migrations(database, monkeypatch):
+    calls = MigrationCalls(monkeypatch)
+    for worker in ("first", "second"):
+        async with lifespan(app):
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url=f"http://{worker}") as http:
+                assert (await http.get("/health/live")).status_code == 200
+                await wait_until_ready(http)
+        if worker == "first":
+            assert calls.steps == ["indexes", "seed_grains", "create_default_admin"]
+            calls.steps.clear()
+
+    assert calls.steps == []
+    assert await database.users.count_documents({"email": "admin@graincompany.ua"}) == 1
@@ -0,0 +1,126 @@
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+
+from backend import auction_routes
+from backend.auction_events import event_bus
+from backend.auction_models import WinnerSelect
+
+pytestmark = pytest.mark.anyio
+
+ADMIN = {"sub": "admin", "email": "admin@example.com", "role": "admin"}
+
+
+async def seed_completed_auction(database, bid_amounts=(8100.0,)) -> tuple[dict, list[dict]]:
+    now = datetime.utcnow()
+    auction = {
+        "id": str(uuid.uuid4()), "grain_id": "1", "grain_type": "Wheat", "category": "1",
+        "moisture": "12%", "protein": "14%", "gluten": "28%", "nature": "780 г/л",
+        "quantity": 500.0, "starting_price": 8000.0, "start_date": now - timedelta(hours=2),
+        "end_date": now - timedelta(hours=1), "status": "completed", "winner_id": None, "created_by": "admin",
+        "created_at": now - timedelta(hours=3), "bid_count": len(bid_amounts),
+    }
+    bids = []
+    for amount in bid_amounts:
+        user = {"id": str(uuid.uuid4()), "email": f"{uuid.uuid4().hex[:8]}@example.com", "full_name": "Test Buyer"}
+        await database.users.insert_one(dict(user))
+        bids.append({
+            "id": str(uuid.uuid4()), "auction_id": auction["id"], "bid_amount": amount, "user_id": user["id"],
+            "payment_type": "cashless", "delivery_location": "Odesa", "user_name": "Test Buyer",
+            "user_company": "Test LLC", "created_at": now - timedelta(hours=1, minutes=30),
+        })
+    await database.auctions.insert_one(dict(auction))
+    await database.bids.insert_many([dict(bid) for bid in bids])
+    return auction, bids
+
+
+class AwardedJustBefore:
+    """The auctions collection, with another award landing right before the route's write"""
+
+    def __init__(self, collection, auction_id: str):
+        self._collection = collection
+        self._auction_id = auction_id
+
+    def __getattr__(self, name):
+        return getattr(self._collection, name)
+
+    async def _award_first(self):
+        await self._collection.update_one(
+            {"id": self._auction_id, "status": "completed"},
+            {"$set": {"status": "winner_selected", "winner_id": "someone-else", "award_run": "other"}}
+        )
+
+    async def bulk_write(self, *args, **kwargs):
+        await self._award_first()
+        return await self._collection.bulk_write(*args, **kwargs)
+
+    async def find_one_and_update(self, *args, **kwargs):
+        await self._award_first()
+        return await self._collection.find_one_and_update(*args, **kwargs)
+
+
+async def test_select_winner_does_not_overwrite_an_award_made_meanwhile(database, monkeypatch):
+    auction, bids = await seed_completed_auction(database)
+    monkeypatch.setattr(auction_routes, "auctions_collection", AwardedJustBefore(database.auctions, auction["id"]))
+
+    with pytest.raises(HTTPException) as rejected:
+        await auction_routes.select_winner(
+            WinnerSelect(auction_id=auction["id"], winner_bid_id=bids[0]["id"]), current_user=ADMIN
+        )
+
+    assert rejected.value.status_code == 409
+    assert (await database.auctions.find_one({"id": auction["id"]}))["winner_id"] == "someone-else"
+    assert await database.email_outbox.count_documents({}) == 0
+
+
+async def test_bulk_select_reports_auctions_awarded_meanwhile_as_failed(database, monkeypatch):
+    taken, taken_bids = await seed_completed_auction(database)
+    free, free_bids = await seed_completed_auction(database)
+    monkeypatch.setattr(auction_routes, "auctions_collection", AwardedJustBefore(database.auctions, taken["id"]))
+    events = event_bus.subscribe()
+    try:
+        result = await auction_routes.bulk_select_winners(
+            [
+                WinnerSelect(auction_id=taken["id"], winner_bid_id=taken_bids[0]["id"]),
+                WinnerSelect(auction_id=free["id"], winner_bid_id=free_bids[0]["id"]),
+            ],
+            current_user=ADMIN
+        )
+    finally:
+        event_bus.unsubscribe(events)
+
+    assert (result.succeeded, result.failed) == (1, 1)
+    assert result.results[0].error == "Auction was awarded meanwhile"
+    assert result.results[1].success
+    assert (await database.auctions.find_one({"id": taken["id"]}))["winner_id"] == "someone-else"
+    published = [events.get_nowait()["auction_id"] for _ in range(events.qsize())]
+    assert published == [free["id"]]
+    assert await database.email_outbox.count_documents({}) == 1
+
+
+async def test_allocation_that_loses_the_claim_leaves_the_bids_alone(database, monkeypatch):
+    auction, bids = await seed_completed_auction(database, (8200.0, 8100.0))
+    monkeypatch.setattr(auction_routes, "auctions_collection", AwardedJustBefore(database.auctions, auction["id"]))
+
+    with pytest.raises(HTTPException) as rejected:
+        await auction_routes.allocate_auction(auction["id"], current_user=ADMIN)
+
+    assert rejected.value.status_code == 409
+    assert await database.bids.count_documents({"allocated_quantity": {"$ne": None}}) == 0
+    assert await database.email_outbox.count_documents({}) == 0
+
+
+async def test_allocation_records_each_winning_share(database):
+    auction, bids = await seed_completed_auction(database, (8200.0, 8100.0))
+    await database.bids.update_many({}, {"$set": {"quantity": 300.0}})
+
+    result = await auction_routes.allocate_auction(auction["id"], current_user=ADMIN)
+
+    assert [(item.bid_id, item.allocated_quantity) for item in result.allocations] == [
+        (bids[0]["id"], 300.0), (bids[1]["id"], 200.0)
+    ]
+    stored = {bid["id"]: bid["allocated_quantity"] async for bid in database.bids.find({}, {"_id": 0})}
+    assert stored == {bids[0]["id"]: 300.0, bids[1]["id"]: 200.0}
+    assert (await database.auctions.find_one({"id": auction["id"]}))["status"] == "winner_selected"